@@ -1,7 +1,7 @@
 # pylint: disable=invalid-name
 
 """
-Decrypt an edq.util.crypto.Secret into cleartext.
+Decrypt an edq.util.crypto.Secret into cleartext (or decrypt a file).
 
 The standard configuration encryption key will be used.
 """
@@ -16,7 +16,21 @@ import edq.util.crypto
 def run_cli(args: argparse.Namespace) -> int:
     """ Run the CLI. """
 
-    secret = edq.util.crypto.Secret.parse(args.ciphertext, args._config_info.application_config.encryption_key)
+    key = args._config_info.application_config.encryption_key
+
+    if (args.input_path is not None):
+        if (args.output_path is None):
+            raise ValueError("An output path (--output-path) is required when decrypting a file.")
+
+        edq.util.crypto.decrypt_file(key, args.input_path, args.output_path)
+        print(f"Decrypted '{args.input_path}' into '{args.output_path}'.")
+
+        return 0
+
+    if (args.ciphertext is None):
+        raise ValueError("No text (or input path) to decrypt was provided.")
+
+    secret = edq.util.crypto.Secret.parse(args.ciphertext, key)
 
     print(secret.cleartext)
 
@@ -31,10 +45,20 @@ def _get_parser() -> argparse.ArgumentParser:
 
     parser = edq.core.argparser.get_default_parser(__doc__.strip())
 
-    parser.add_argument('ciphertext', metavar = 'TEXT',
-        action = 'store', type = str,
+    group = parser.add_mutually_exclusive_group()
+
+    group.add_argument('ciphertext', metavar = 'TEXT',
+        action = 'store', type = str, nargs = '?', default = None,
         help = 'The ciphertext to decrypt.')
 
+    group.add_argument('--input-path', dest = 'input_path',
+        action = 'store', type = str, default = None,
+        help = 'Decrypt this file (encrypted with encrypt-secret --input-path) into --output-path.')
+
+    parser.add_argument('--output-path', dest = 'output_path',
+        action = 'store', type = str, default = None,
+        help = 'Where to write the decrypted file (when using --input-path).')
+
     return parser
 
 if (__name__ == '__main__'):
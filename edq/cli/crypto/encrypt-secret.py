@@ -1,7 +1,7 @@
 # pylint: disable=invalid-name
 
 """
-Encrypt a cleartext string as an edq.util.crypto.Secret.
+Encrypt a cleartext string as an edq.util.crypto.Secret (or encrypt a file).
 
 The standard configuration encryption key will be used.
 """
@@ -16,8 +16,23 @@ import edq.util.crypto
 def run_cli(args: argparse.Namespace) -> int:
     """ Run the CLI. """
 
-    secret = edq.util.crypto.Secret(args.cleartext, iv_b64 = args.iv, salt_b64 = args.salt)
-    ciphertext = secret.encrypt(args._config_info.application_config.encryption_key)
+    key = args._config_info.application_config.encryption_key
+
+    if (args.input_path is not None):
+        if (args.output_path is None):
+            raise ValueError("An output path (--output-path) is required when encrypting a file.")
+
+        edq.util.crypto.encrypt_file(key, args.input_path, args.output_path)
+        print(f"Encrypted '{args.input_path}' into '{args.output_path}'.")
+
+        return 0
+
+    if (args.cleartext is None):
+        raise ValueError("No text (or input path) to encrypt was provided.")
+
+    secret = edq.util.crypto.Secret(args.cleartext, iv_b64 = args.iv, salt_b64 = args.salt,
+            encryption_method = edq.util.crypto.EncryptionMethod(args.encryption_method))
+    ciphertext = secret.encrypt(key)
 
     print(ciphertext)
 
@@ -32,10 +47,22 @@ def _get_parser() -> argparse.ArgumentParser:
 
     parser = edq.core.argparser.get_default_parser(__doc__.strip())
 
-    parser.add_argument('cleartext', metavar = 'TEXT',
-        action = 'store', type = str,
+    group = parser.add_mutually_exclusive_group()
+
+    group.add_argument('cleartext', metavar = 'TEXT',
+        action = 'store', type = str, nargs = '?', default = None,
         help = 'The text to encrypt.')
 
+    group.add_argument('--input-path', dest = 'input_path',
+        action = 'store', type = str, default = None,
+        help = ('Encrypt this file (instead of text) into --output-path.'
+                + ' Files are encrypted in chunks (with AES256-GCM), so any size of file can be encrypted.')
+    )
+
+    parser.add_argument('--output-path', dest = 'output_path',
+        action = 'store', type = str, default = None,
+        help = 'Where to write the encrypted file (when using --input-path).')
+
     parser.add_argument('--encryption-method', dest = 'encryption_method',
         action = 'store', type = str, default = edq.util.crypto.EncryptionMethod.AES256v1.value,
         choices = [choice.value for choice in edq.util.crypto.EncryptionMethod],
@@ -50,9 +77,10 @@ def _get_parser() -> argparse.ArgumentParser:
 
     parser.add_argument('--iv', dest = 'iv',
         action = 'store', type = str, default = None,
-        help = ('An optional initialization vector (IV) to provide (as a base64 encoded string).'
+        help = ('An optional initialization vector (IV) or nonce to provide (as a base64 encoded string).'
                 + ' Providing an IV is not recommended.'
-                + ' If no IV is provided, one will be generated randomly.')
+                + ' If no IV is provided, one will be generated randomly.'
+                + ' AEAD methods (e.g., AES256GCMv1) ignore this and always generate a new nonce.')
     )
 
     return parser
@@ -9,6 +9,7 @@ import os
 import sys
 
 import edq.core.argparser
+import edq.net.exchange
 import edq.net.exchangeserver
 
 def run_cli(args: argparse.Namespace) -> int:
@@ -32,7 +33,7 @@ def run_cli(args: argparse.Namespace) -> int:
         if (os.path.isfile(path)):
             server.load_exchange(path)
         else:
-            server.load_exchanges_dir(path)
+            server.load_exchanges_dir(path, extension = args.extension, watch = args.watch)
 
     server.start_and_wait()
 
@@ -59,6 +60,15 @@ def _get_parser() -> argparse.ArgumentParser:
         action = 'store', type = int, default = None,
         help = 'The port to run this test server on. If not set, a random open port will be chosen.')
 
+    group.add_argument('--extension', dest = 'extension',
+        action = 'store', type = str, default = edq.net.exchange.DEFAULT_HTTP_EXCHANGE_EXTENSION,
+        help = ('The extension of exchange files to look for in dirs (default: %(default)s).'
+                + f" Use '{edq.net.exchange.BINARY_HTTP_EXCHANGE_EXTENSION}' for binary exchanges."))
+
+    group.add_argument('--watch', dest = 'watch',
+        action = 'store_true', default = False,
+        help = 'Watch exchange dirs and reload any exchange files that are created, modified, or deleted.')
+
     group.add_argument('--ignore-param', dest = 'ignore_params',
         action = 'append', type = str, default = [],
         help = 'Ignore this parameter during exchange matching.')
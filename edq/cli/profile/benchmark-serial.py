@@ -0,0 +1,100 @@
+# pylint: disable=invalid-name
+
+"""
+Benchmark serialization (edq.util.serial, edq.util.json, and edq.util.msgpack).
+Reports throughput and memory use, and can compare against a saved baseline.
+"""
+
+import argparse
+import sys
+
+import edq.core.argparser
+import edq.procedure.benchmark_serial
+import edq.util.benchmark
+
+def run_cli(args: argparse.Namespace) -> int:
+    """ Run the CLI. """
+
+    if (args.list_workloads):
+        for name in edq.procedure.benchmark_serial.get_workloads():
+            print(name)
+
+        return 0
+
+    results = edq.procedure.benchmark_serial.run(args.workloads,
+            scale = args.scale,
+            min_time_secs = args.min_time,
+            min_iterations = args.min_iterations,
+            measure_allocations = (not args.skip_allocations))
+
+    comparisons = None
+    if (args.baseline_path is not None):
+        baseline = edq.util.benchmark.load_baseline(args.baseline_path)
+        comparisons = edq.util.benchmark.compare(results, baseline, threshold = args.threshold)
+
+    print(edq.util.benchmark.format_results(results, comparisons))
+
+    if (args.save_path is not None):
+        edq.util.benchmark.save_baseline(results, args.save_path)
+
+    if (args.fail_on_regression and (comparisons is not None)):
+        regressions = [comparison.name for comparison in comparisons if comparison.regression]
+        if (len(regressions) > 0):
+            print(f"Found {len(regressions)} regression(s): {', '.join(regressions)}.", file = sys.stderr)
+            return 1
+
+    return 0
+
+def main() -> int:
+    """ Get a parser, parse the args, and call run. """
+    return run_cli(_get_parser().parse_args())
+
+def _get_parser() -> argparse.ArgumentParser:
+    """ Get the parser. """
+
+    parser = edq.core.argparser.get_default_parser(__doc__.strip())
+
+    parser.add_argument('workloads', metavar = 'WORKLOAD',
+        action = 'store', type = str, nargs = '*',
+        help = 'The workloads to run (or a dotted prefix of workloads, e.g., "serial.flat"). Runs all workloads if none are given.')
+
+    parser.add_argument('--list', dest = 'list_workloads',
+        action = 'store_true', default = False,
+        help = 'List the available workloads and exit (default: %(default)s).')
+
+    parser.add_argument('--scale', dest = 'scale',
+        action = 'store', type = int, default = edq.procedure.benchmark_serial.DEFAULT_SCALE,
+        help = 'The size of each workload, e.g., the number of records (default: %(default)s).')
+
+    parser.add_argument('--min-time', dest = 'min_time',
+        action = 'store', type = float, default = edq.util.benchmark.DEFAULT_MIN_TIME_SECS,
+        help = 'The minimum number of seconds to run each workload (default: %(default)s).')
+
+    parser.add_argument('--min-iterations', dest = 'min_iterations',
+        action = 'store', type = int, default = edq.util.benchmark.DEFAULT_MIN_ITERATIONS,
+        help = 'The minimum number of times to run each workload (default: %(default)s).')
+
+    parser.add_argument('--skip-allocations', dest = 'skip_allocations',
+        action = 'store_true', default = False,
+        help = 'Do not measure allocations (default: %(default)s).')
+
+    parser.add_argument('--baseline', dest = 'baseline_path',
+        action = 'store', type = str, default = None,
+        help = 'Compare results against a baseline JSON file (written by `--save`).')
+
+    parser.add_argument('--save', dest = 'save_path',
+        action = 'store', type = str, default = None,
+        help = 'Save results to this JSON file (which can later be used as a baseline).')
+
+    parser.add_argument('--threshold', dest = 'threshold',
+        action = 'store', type = float, default = edq.util.benchmark.DEFAULT_REGRESSION_THRESHOLD,
+        help = 'The fraction that throughput can drop (compared to the baseline) before being considered a regression (default: %(default)s).')
+
+    parser.add_argument('--fail-on-regression', dest = 'fail_on_regression',
+        action = 'store_true', default = False,
+        help = 'Exit with a non-zero status if any regressions are found (default: %(default)s).')
+
+    return parser
+
+if (__name__ == '__main__'):
+    sys.exit(main())
@@ -115,7 +115,7 @@ class CLIPackage(CLIDirent):
 
         package = CLIPackage(path, qualified_name, init_module)
 
-        for dirent in sorted(os.listdir(path)):
+        for dirent in edq.util.dirent.list_dir(path):
             dirent_path = os.path.join(path, dirent)
 
             dirent_qualified_name = os.path.splitext(dirent)[0]
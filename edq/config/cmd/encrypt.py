@@ -27,7 +27,9 @@ def run(args: argparse.Namespace) -> int:
     config_class = type(config_info.application_config)
     serialization_context = edq.util.serial.SerializationContext(key = encryption_key)
 
-    count = 0
+    # [(path, {attr name: secret, ...}), ...]
+    file_secrets = []
+
     for path in sorted(paths):
         path = os.path.abspath(path)
         if (not os.path.exists(path)):
@@ -35,7 +37,7 @@ def run(args: argparse.Namespace) -> int:
 
         file_config = config_class.from_path(path, context = serialization_context)
 
-        to_write = {}
+        to_encrypt = {}
         for attr_name in dir(file_config):
             attr = getattr(file_config, attr_name, None)
             if (attr is None):
@@ -47,14 +49,25 @@ def run(args: argparse.Namespace) -> int:
             if (attr.is_encrypted()):
                 continue
 
-            to_write[attr_name] = attr.encrypt(encryption_key)
-            count += 1
+            to_encrypt[attr_name] = attr
+
+        if (len(to_encrypt) > 0):
+            file_secrets.append((path, to_encrypt))
+
+    # Encrypt all the secrets at once, so key derivation can be done in parallel.
+    all_secrets = [secret for (_, to_encrypt) in file_secrets for secret in to_encrypt.values()]
+    all_encrypted = iter(edq.util.crypto.encrypt_many(encryption_key, all_secrets))
+
+    count = 0
+    for (path, to_encrypt) in file_secrets:
+        to_write = {attr_name: next(all_encrypted) for attr_name in to_encrypt}
+        count += len(to_write)
 
-        if (len(to_write) > 0):
-            print(f"Found {len(to_write)} unencrypted secret(s) in '{path}': {sorted(to_write.keys())}.")
+        print(f"Found {len(to_write)} unencrypted secret(s) in '{path}': {sorted(to_write.keys())}.")
 
-        if ((len(to_write) > 0) and (not args.dry_run)):
-            edq.config.util.update_options_in_config_file(path, to_write)
+        if (not args.dry_run):
+            with edq.config.util.ConfigFileEditor(path, create = False) as editor:
+                editor.update(to_write)
 
     if (count > 0):
         print(f"Encrypted {count} secret(s).")
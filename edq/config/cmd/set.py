@@ -30,7 +30,9 @@ def run(args: argparse.Namespace) -> int:
         (key, value) = edq.config.util.parse_string_config_option(config_option)
         config_to_set[key] = value
 
-    edq.config.util.update_options_in_config_file(path, config_to_set)
+    with edq.config.util.ConfigFileEditor(path) as editor:
+        editor.update(config_to_set)
+
     print(f"Wrote {len(config_to_set)} config option(s) to: '{path}'.")
 
     return 0
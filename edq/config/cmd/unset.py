@@ -19,18 +19,33 @@ def run(args: argparse.Namespace) -> int:
         print(f"Specified config file does not exist: '{os.path.abspath(args.scope_file)}'.")
         return 1
 
+    # [(key, path), ...]
+    targets: typing.List[typing.Tuple[str, typing.Union[str, None]]] = []
+    # {path: [key, ...], ...}
+    keys_by_path: typing.Dict[str, typing.List[str]] = {}
+
     for key in args.config_to_unset:
         path = args.scope_file
         if (path is None):
             path = _get_path_from_source(key, args)
 
+        if (path is not None):
+            path = os.path.abspath(path)
+            keys_by_path.setdefault(path, []).append(key)
+
+        targets.append((key, path))
+
+    # Edit each file once (with all of its keys).
+    for (path, keys) in keys_by_path.items():
+        with edq.config.util.ConfigFileEditor(path, create = False) as editor:
+            for key in keys:
+                editor.unset(key)
+
+    for (key, path) in targets:
         if (path is None):
             print(f"Could not find a file where '{key}' was set.")
-            continue
-
-        path = os.path.abspath(path)
-        edq.config.util.remove_options_in_config_file(path, [key])
-        print(f"Unset config option ('{key}') from: '{path}'.")
+        else:
+            print(f"Unset config option ('{key}') from: '{path}'.")
 
     return 0
 
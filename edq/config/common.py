@@ -25,6 +25,9 @@ _env_prefix: str = _DEFAULT_ENV_PREFIX
 _DEFAULT_GLOBAL_DIR: str = platformdirs.user_config_dir()
 _global_dir: str = _DEFAULT_GLOBAL_DIR
 
+_DEFAULT_CONFIG_CACHE_PATH: typing.Union[str, None] = None
+_config_cache_path: typing.Union[str, None] = _DEFAULT_CONFIG_CACHE_PATH
+
 class InternalApplicationConfig(edq.util.serial.DictConverter):
     """
     An internal-only class for breaking dependency cycles.
@@ -1,5 +1,10 @@
 import argparse
+import collections
+import copy
+import hashlib
 import os
+import threading
+import time
 import typing
 
 import edq.config.app
@@ -7,10 +12,34 @@ import edq.config.constants
 import edq.config.settings
 import edq.config.source
 import edq.config.util
+import edq.util.crypto
 import edq.util.dirent
 import edq.util.json
+import edq.util.msgpack
+import edq.util.parse
 import edq.util.serial
 
+SNAPSHOT_CACHE_SIZE: int = 32
+""" The max number of resolved configs to keep in the in-process snapshot cache (see get_tiered_config()). """
+
+CONFIG_CACHE_VERSION: int = 1
+""" The version of the on-disk config file cache format. """
+
+_snapshot_cache: 'collections.OrderedDict[str, TieredConfigInfo]' = collections.OrderedDict()
+""" Recently resolved configs (in LRU order), keyed by a fingerprint of everything that went into resolving them. """
+
+_file_cache: typing.Dict[str, typing.Tuple[int, int, int, typing.Dict[str, typing.Any]]] = {}
+""" Parsed config files: {absolute path: (inode, mtime (ns), size, contents), ...}. """
+
+_env_index_key: typing.Union[typing.Tuple[int, int], None] = None  # pylint: disable=invalid-name
+""" The (identity, size) of os.environ when _env_index was built. """
+
+_env_index: typing.Dict[str, typing.Dict[str, str]] = {}
+""" Environmental variables grouped by prefix: {prefix: {name without prefix: value, ...}, ...}. """
+
+_config_cache_lock: threading.Lock = threading.Lock()
+""" A lock protecting _snapshot_cache, _file_cache, _env_index_key, and _env_index. """
+
 class ConfigLoadResult(edq.util.serial.DictConverter):
     """ An instance of a config value being loaded from some config source. """
 
@@ -48,8 +77,9 @@ class TieredConfigInfo(edq.util.serial.DictConverter):
         self.sources: typing.Dict[str, typing.List[ConfigLoadResult]] = sources
         """
         A representation of every source/value loaded for each config key.
-        As config values are loaded for a key, they are pushed (not appended) onto its dictionary value.
-        The *first* value in the list represents the final loaded value (and should match the corresponding entry in self.raw_config).
+        Each list is ordered from the most recently loaded value to the first loaded value,
+        so the *first* value in the list represents the final loaded value (and should match the corresponding entry in self.raw_config).
+        Will be empty if sources were not tracked (see get_tiered_config()).
         """
 
         if (application_config is None):
@@ -63,9 +93,34 @@ def get_tiered_config(
         cli_default_values: typing.Union[typing.Dict[str, typing.Any], None] = None,
         load_order: typing.Union[typing.List[edq.config.source.ConfigSourceSpec], None] = None,
         serialization_context: typing.Union[edq.util.serial.SerializationContext, None] = None,
+        lazy_secrets: bool = False,
+        use_cache: bool = False,
+        cache_path: typing.Union[str, None] = None,
+        track_sources: bool = True,
         ) -> TieredConfigInfo:
     """
     Load all configuration options from files and command-line arguments.
+
+    If `lazy_secrets` is true, then encrypted secrets in the application config will only be decrypted when first used
+    (see edq.util.crypto.Secret.parse()),
+    so errors (e.g., a wrong key) are only raised on first use and each lazy secret holds onto the key until then.
+    Otherwise, all secrets will be decrypted (in bulk) immediately.
+
+    If `track_sources` is false, then the provenance of each value will not be recorded
+    and the returned `sources` will be empty.
+    This is faster for callers that only need the final values.
+
+    If `use_cache` is true, then resolved configs are cached in-process (see SNAPSHOT_CACHE_SIZE)
+    until they are evicted or clear_config_cache() is called.
+    A cached config is only used when nothing that went into it has changed:
+    the config files (paths, inodes, mtimes, and sizes), the relevant environmental variables,
+    the CLI arguments, the config settings, and the application config class.
+    Each call gets its own copy of the config.
+    Files modified very recently (see edq.util.dirent.RACY_WINDOW_NS) are never cached.
+
+    If `use_cache` is true and `cache_path` (defaults to edq.config.settings.get_config_cache_path()) is set,
+    then parsed config files will also be cached on disk (as MessagePack) so that other processes can skip parsing them.
+    Since config files may hold secrets, the cache file is only readable by its owner (where supported).
     """
 
     if (cli_arguments is None):
@@ -77,14 +132,41 @@ def get_tiered_config(
     if (load_order is None):
         load_order = edq.config.settings.get_load_order()
 
-    raw_config: typing.Dict[str, edq.util.serial.PODType] = {}
-    sources: typing.Dict[str, typing.List[ConfigLoadResult]] = {}
+    if (cache_path is None):
+        cache_path = edq.config.settings.get_config_cache_path()
+
+    if (not use_cache):
+        cache_path = None
 
     # Ensure CLI arguments are always a dict,
     # even if provided as an argparse.Namespace.
     if (isinstance(cli_arguments, argparse.Namespace)):
         cli_arguments = vars(cli_arguments)
 
+    snapshot_key = None
+    if (use_cache):
+        snapshot_key = _get_snapshot_key(cli_arguments, cli_default_values, load_order, serialization_context, lazy_secrets, track_sources)
+
+    if (snapshot_key is not None):
+        with _config_cache_lock:
+            cached_info = _snapshot_cache.get(snapshot_key, None)
+            if (cached_info is not None):
+                _snapshot_cache.move_to_end(snapshot_key)
+
+        if (cached_info is not None):
+            return cached_info.copy()
+
+    file_cache_modified = False
+    if (cache_path is not None):
+        _load_file_cache(cache_path)
+
+    raw_config: typing.Dict[str, edq.util.serial.PODType] = {}
+
+    # Sources are appended as they are loaded (and reversed once loading is done).
+    sources: typing.Union[typing.Dict[str, typing.List[ConfigLoadResult]], None] = None
+    if (track_sources):
+        sources = {}
+
     # Load from each specified source.
     for spec in load_order:
         if (isinstance(spec, edq.config.source.CLIExplicitSpec)):
@@ -92,40 +174,32 @@ def get_tiered_config(
                 (key, value) = edq.config.util.parse_string_config_option(cli_config_option)
 
                 raw_config[key] = value
-
-                if (key not in sources):
-                    sources[key] = []
-
-                sources[key].insert(0, ConfigLoadResult(value, spec))
+                _add_source(sources, key, value, spec)
         elif (isinstance(spec, edq.config.source.CLIImplicitSpec)):
             for (key, value) in cli_arguments.items():
                 if (key in edq.config.constants.IGNORE_CLI_KEYS):
                     continue
 
                 # Don't override existing values with default values.
-                if ((key in sources) and (value == cli_default_values.get(key, None))):
+                if ((key in raw_config) and (value == cli_default_values.get(key, None))):
                     continue
 
                 raw_config[key] = value
-
-                if (key not in sources):
-                    sources[key] = []
-
-                sources[key].insert(0, ConfigLoadResult(value, spec))
+                _add_source(sources, key, value, spec)
         elif (isinstance(spec, edq.config.source.CLIFileSpec)):
             config_paths = cli_arguments.get(edq.config.constants.CONFIG_PATHS_KEY, [])
             for path in config_paths:
                 if (not os.path.exists(path)):
                     raise FileNotFoundError(f"Specified config file does not exist: '{path}'.")
 
-                _load_config_file(path, raw_config, sources, spec)
+                file_cache_modified |= _load_config_file(path, raw_config, sources, spec, use_cache)
         elif (isinstance(spec, edq.config.source.ENVSpec)):
             _load_env_variables(raw_config, sources, spec)
         elif (isinstance(spec, edq.config.source.GlobalSpec)):
             path = spec.resolve_path(override_path = cli_arguments.get(edq.config.constants.GLOBAL_CONFIG_KEY, None))
-            _load_config_file(path, raw_config, sources, spec)
+            file_cache_modified |= _load_config_file(path, raw_config, sources, spec, use_cache)
         elif (isinstance(spec, edq.config.source.AbstractPathSpec)):
-            _load_config_file(spec.resolve_path(), raw_config, sources, spec)
+            file_cache_modified |= _load_config_file(spec.resolve_path(), raw_config, sources, spec, use_cache)
         else:
             raise ValueError(f"Unknown config source spec: '{type(spec)}'.")
 
@@ -144,65 +218,417 @@ def get_tiered_config(
     raw_application_config[edq.config.constants.CONFIG_ENCRYPTION_KEY] = str(encryption_key)
     serialization_context.key = str(encryption_key)
 
-    application_config = edq.config.settings.get_application_config_class().from_dict(
+    config_class = edq.config.settings.get_application_config_class()
+    _parse_secrets(config_class, raw_application_config, str(encryption_key), lazy_secrets)
+
+    application_config = config_class.from_dict(
         raw_application_config,
         context = serialization_context,
     )
 
-    return TieredConfigInfo(
+    if (sources is None):
+        sources = {}
+    else:
+        for key_sources in sources.values():
+            key_sources.reverse()
+
+    config_info = TieredConfigInfo(
         raw_config,
         sources,
         application_config = application_config,
     )
 
+    if (snapshot_key is not None):
+        with _config_cache_lock:
+            _snapshot_cache[snapshot_key] = config_info.copy()
+
+            while (len(_snapshot_cache) > SNAPSHOT_CACHE_SIZE):
+                _snapshot_cache.popitem(last = False)
+
+    if ((cache_path is not None) and file_cache_modified):
+        _save_file_cache(cache_path)
+
+    return config_info
+
+def clear_config_cache() -> None:
+    """ Clear the in-process config caches (see get_tiered_config()). """
+
+    global _env_index_key  # pylint: disable=global-statement
+
+    with _config_cache_lock:
+        _snapshot_cache.clear()
+        _file_cache.clear()
+        _env_index_key = None
+        _env_index.clear()
+
+def _get_snapshot_key(
+        cli_arguments: typing.Dict[str, typing.Any],
+        cli_default_values: typing.Dict[str, typing.Any],
+        load_order: typing.List[edq.config.source.ConfigSourceSpec],
+        serialization_context: typing.Union[edq.util.serial.SerializationContext, None],
+        lazy_secrets: bool,
+        track_sources: bool,
+        ) -> typing.Union[str, None]:
+    """
+    Get a fingerprint of everything that goes into resolving a config (see get_tiered_config()).
+    Returns None if the config should not be cached (e.g., a config file was very recently modified).
+    """
+
+    config_class = edq.config.settings.get_application_config_class()
+    env_prefix = edq.config.settings.get_env_prefix()
+
+    parts: typing.List[typing.Any] = [
+        f"{config_class.__module__}.{config_class.__qualname__}",
+        edq.config.settings.get_default_encryption_key(),
+        env_prefix,
+        lazy_secrets,
+        track_sources,
+        sorted(cli_arguments.items(), key = lambda item: item[0]),
+        sorted(cli_default_values.items(), key = lambda item: item[0]),
+    ]
+
+    if (serialization_context is not None):
+        parts.append(sorted(vars(serialization_context).items()))
+
+    now_ns = time.time_ns()
+
+    for spec in load_order:
+        paths = []
+
+        try:
+            if (isinstance(spec, edq.config.source.CLIFileSpec)):
+                paths = list(cli_arguments.get(edq.config.constants.CONFIG_PATHS_KEY, []))
+            elif (isinstance(spec, edq.config.source.ENVSpec)):
+                parts.append(sorted(_get_env_variables(env_prefix).items()))
+            elif (isinstance(spec, edq.config.source.GlobalSpec)):
+                paths = [spec.resolve_path(override_path = cli_arguments.get(edq.config.constants.GLOBAL_CONFIG_KEY, None))]
+            elif (isinstance(spec, edq.config.source.AbstractPathSpec)):
+                paths = [spec.resolve_path()]
+        except ValueError:
+            # Let the full load raise any errors.
+            return None
+
+        parts.append((type(spec).__qualname__, sorted(vars(spec).items())))
+
+        for path in paths:
+            path = os.path.abspath(path)
+
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                parts.append((path, None))
+                continue
+
+            if ((now_ns - stat_result.st_mtime_ns) <= edq.util.dirent.RACY_WINDOW_NS):
+                return None
+
+            parts.append((path, stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size))
+
+    return hashlib.sha256(repr(parts).encode(edq.util.dirent.DEFAULT_ENCODING)).hexdigest()
+
+def _parse_secrets(
+        config_class: typing.Type[edq.config.app.BaseApplicationConfig],
+        config: typing.Dict[str, typing.Any],
+        key: str,
+        lazy: bool,
+        ) -> None:
+    """
+    Parse (in bulk) all the config values that will be deserialized as secrets, and replace them (in-place) with the parsed secrets.
+    Lazy secrets are only checked for their format,
+    other secrets are decrypted in parallel (see edq.util.crypto.decrypt_many()) instead of one at a time.
+    """
+
+    type_hints = _get_config_type_hints(config_class)
+
+    names = []
+    for (name, value) in config.items():
+        if (not isinstance(value, str)):
+            continue
+
+        type_hint = type_hints.get(name, None)
+        allowed_types = typing.get_args(type_hint) or (type_hint, )
+        if (edq.util.crypto.Secret not in allowed_types):
+            continue
+
+        names.append(name)
+
+    if (len(names) == 0):
+        return
+
+    if (lazy):
+        secrets = [edq.util.crypto.Secret.parse(config[name], key, lazy = True) for name in names]
+    else:
+        secrets = edq.util.crypto.decrypt_many(key, [config[name] for name in names])
+
+    for (name, secret) in zip(names, secrets):
+        config[name] = secret
+
 def _load_config_file(
         config_path: str,
         config: typing.Dict[str, typing.Any],
-        sources: typing.Dict[str, typing.List[ConfigLoadResult]],
+        sources: typing.Union[typing.Dict[str, typing.List[ConfigLoadResult]], None],
         spec: edq.config.source.ConfigSourceSpec,
-        ) -> None:
+        use_cache: bool = True,
+        ) -> bool:
     """
     Loads config variables and the source from the given config JSON file.
     If the given config JSON file doesn't exit loads nothing.
+    Returns true if the file cache was modified.
     """
 
     if (not edq.util.dirent.exists(config_path)):
-        return
+        return False
 
     if (os.path.isdir(config_path)):
         raise IsADirectoryError(f"Failed to read config file, expected a file but got a directory at '{config_path}'.")
 
     config_path = os.path.abspath(config_path)
-    for (key, value) in edq.util.json.load_path(config_path).items():
+    (data, cache_modified) = _read_config_file(config_path, use_cache)
+
+    for (key, value) in data.items():
         key = edq.config.util.validate_config_key(key, value)
 
         config[key] = value
+        _add_source(sources, key, value, spec, config_path)
 
-        if (key not in sources):
-            sources[key] = []
+    return cache_modified
 
-        sources[key].insert(0, ConfigLoadResult(value, spec, config_path))
+def _add_source(
+        sources: typing.Union[typing.Dict[str, typing.List[ConfigLoadResult]], None],
+        key: str,
+        value: edq.util.serial.PODType,
+        spec: edq.config.source.ConfigSourceSpec,
+        path: typing.Union[str, None] = None,
+        ) -> None:
+    """
+    Record (append) the source of a loaded config value.
+    Does nothing if sources are not being tracked (i.e., `sources` is None).
+    """
+
+    if (sources is None):
+        return
+
+    key_sources = sources.get(key, None)
+    if (key_sources is None):
+        key_sources = []
+        sources[key] = key_sources
+
+    key_sources.append(ConfigLoadResult(value, spec, path))
+
+def _read_config_file(path: str, use_cache: bool) -> typing.Tuple[typing.Dict[str, typing.Any], bool]:
+    """
+    Read a config file, using the file cache when the file has not changed (see get_tiered_config()).
+    Returns the file's contents (which the caller is free to modify) and if the file cache was modified.
+    """
+
+    if (not use_cache):
+        return edq.util.json.load_path(path), False
+
+    stat_result = os.stat(path)
+    signature = (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+    with _config_cache_lock:
+        entry = _file_cache.get(path, None)
+
+    if ((entry is not None) and (entry[0:3] == signature)):
+        return copy.deepcopy(entry[3]), False
+
+    data = edq.util.json.load_path(path)
+    if (not isinstance(data, dict)):
+        return data, False
+
+    if ((time.time_ns() - stat_result.st_mtime_ns) <= edq.util.dirent.RACY_WINDOW_NS):
+        return data, False
+
+    with _config_cache_lock:
+        _file_cache[path] = (signature[0], signature[1], signature[2], copy.deepcopy(data))
+
+    return data, True
+
+def _load_file_cache(path: str) -> None:
+    """ Load an on-disk config file cache into the in-memory cache (entries already in memory take precedence). """
+
+    if (not edq.util.dirent.exists(path)):
+        return
+
+    try:
+        data = edq.util.msgpack.load_path(path, gzipped = False)
+    except (ValueError, OSError):
+        # A bad cache is just ignored (it will be overwritten).
+        return
+
+    if ((not isinstance(data, dict)) or (data.get('version', None) != CONFIG_CACHE_VERSION) or (not isinstance(data.get('files', None), dict))):
+        return
+
+    with _config_cache_lock:
+        for (file_path, entry) in data['files'].items():
+            if ((file_path in _file_cache) or (not isinstance(entry, list)) or (len(entry) != 4) or (not isinstance(entry[3], dict))):
+                continue
+
+            _file_cache[file_path] = (int(entry[0]), int(entry[1]), int(entry[2]), entry[3])
+
+def _save_file_cache(path: str) -> None:
+    """ Save the in-memory config file cache to disk (only readable by the owner, where supported). """
+
+    with _config_cache_lock:
+        data = {
+            'version': CONFIG_CACHE_VERSION,
+            'files': {file_path: list(entry) for (file_path, entry) in _file_cache.items()},
+        }
+
+        payload = edq.util.msgpack.dumps(data)
+
+    edq.util.dirent.mkdir(os.path.dirname(os.path.abspath(path)))
+
+    with edq.util.dirent.open_atomic(path, 'wb') as file:
+        if (hasattr(os, 'fchmod')):
+            os.fchmod(file.fileno(), 0o600)
+
+        file.write(payload)
 
 def _load_env_variables(
         config: typing.Dict[str, typing.Any],
-        sources: typing.Dict[str, typing.List[ConfigLoadResult]],
-        spec: edq.config.source.ConfigSourceSpec,
+        sources: typing.Union[typing.Dict[str, typing.List[ConfigLoadResult]], None],
+        spec: edq.config.source.ENVSpec,
         ) -> None:
     """
     Load config from environmental variables.
     Any variable with a matching prefix will have the prefix removed and lower-cased.
+
+    If the spec has a nested separator, then names are split into a path of keys (e.g., "A__B" -> config['a']['b']).
+    Nested values are merged into any existing dict for the top-level key.
+    If the spec coerces types, then (non-nested) values are converted using the application config's type hints.
     """
 
-    prefix = edq.config.settings.get_env_prefix()
-    for (key, value) in os.environ.items():
-        if (not key.startswith(prefix)):
+    type_hints: typing.Dict[str, typing.Any] = {}
+    if (spec.coerce_types):
+        type_hints = _get_config_type_hints(edq.config.settings.get_application_config_class())
+
+    # Top-level values (in the order they were first set).
+    values: typing.Dict[str, typing.Any] = {}
+
+    for (name, value) in sorted(_get_env_variables(edq.config.settings.get_env_prefix()).items()):
+        # Split before lower-casing, so separators are matched exactly.
+        keys = [name]
+        if (spec.nested_separator is not None):
+            keys = name.split(spec.nested_separator)
+
+        keys = [key.lower() for key in keys]
+
+        # Skip names that do not map to a key (e.g., just the prefix, or an empty nested key).
+        if (any((len(key) == 0) for key in keys)):
             continue
 
-        key = key.removeprefix(prefix).lower()
+        if (len(keys) == 1):
+            key = keys[0]
+            if (key in type_hints):
+                values[key] = _coerce_env_value(key, value, type_hints[key])
+            else:
+                values[key] = value
+
+            continue
+
+        # Copy any existing dict, since it may be shared (e.g., with sources).
+        if (keys[0] not in values):
+            existing = config.get(keys[0], None)
+            values[keys[0]] = copy.deepcopy(existing) if isinstance(existing, dict) else {}
+
+        if (not isinstance(values[keys[0]], dict)):
+            values[keys[0]] = {}
+
+        target = values[keys[0]]
+        for key in keys[1:-1]:
+            if (not isinstance(target.get(key, None), dict)):
+                target[key] = {}
+
+            target = target[key]
 
+        target[keys[-1]] = value
+
+    for (key, value) in values.items():
         config[key] = value
+        _add_source(sources, key, value, spec)
+
+def _get_env_variables(prefix: str) -> typing.Dict[str, str]:
+    """
+    Get all the environmental variables that start with a prefix: {name without prefix: value, ...}.
+
+    Scanning (and decoding) a large environment on every load is slow,
+    so variables are indexed by prefix once and the index is reused until the environment changes.
+    The index is dropped whenever os.environ is replaced or changes size,
+    and an indexed prefix is re-scanned if any of its variables were changed or removed
+    (a lookup per matching variable, instead of a scan of the whole environment).
+    A matching variable that is added at the same time as a non-matching variable is removed will not be noticed,
+    call clear_config_cache() after such changes.
+    """
+
+    global _env_index_key  # pylint: disable=global-statement
+
+    key = (id(os.environ), len(os.environ))
+
+    with _config_cache_lock:
+        if (_env_index_key != key):
+            _env_index_key = key
+            _env_index.clear()
+
+        variables = _env_index.get(prefix, None)
+        if ((variables is not None) and any((os.environ.get(prefix + name, None) != value) for (name, value) in variables.items())):
+            variables = None
+
+        if (variables is None):
+            variables = {name.removeprefix(prefix): value for (name, value) in os.environ.items() if name.startswith(prefix)}
+            _env_index[prefix] = variables
+
+    return variables.copy()
+
+def _get_config_type_hints(config_class: typing.Type[edq.config.app.BaseApplicationConfig]) -> typing.Dict[str, typing.Any]:
+    """
+    Get the type hints for all the constructor arguments of an application config class,
+    including the ones handled by parent classes (which subclasses pass along through kwargs).
+    """
+
+    type_hints: typing.Dict[str, typing.Any] = {}
+    for cls in reversed(config_class.__mro__):
+        init = vars(cls).get('__init__', None)
+        if (init is not None):
+            type_hints.update(typing.get_type_hints(init))
+
+    type_hints.pop('return', None)
+    type_hints.pop('kwargs', None)
+
+    return type_hints
+
+def _coerce_env_value(key: str, value: str, type_hint: typing.Any) -> typing.Any:
+    """
+    Convert an environmental variable's value to the type the application config expects for it.
+    Only unambiguous bools, ints, floats, lists, and dicts (as JSON) are converted,
+    anything else is left as a string (for the application config to handle).
+    """
+
+    allowed_types = [type_hint]
+    if (typing.get_origin(type_hint) in edq.util.serial._UNION_TYPES):
+        allowed_types = [allowed_type for allowed_type in typing.get_args(type_hint) if (allowed_type not in (type(None), ))]
+
+    if (len(allowed_types) != 1):
+        return value
+
+    target_type = allowed_types[0]
+    base_type = typing.get_origin(target_type) or target_type
+
+    try:
+        if (target_type is bool):
+            return edq.util.parse.boolean(value)
+
+        if (target_type in (int, float)):
+            return target_type(value)
+
+        if (base_type in (list, dict)):
+            parsed_value = edq.util.json.loads(value)
+            if (not isinstance(parsed_value, base_type)):
+                raise ValueError(f"Expected a JSON {base_type.__name__}.")
 
-        if (key not in sources):
-            sources[key] = []
+            return parsed_value
+    except ValueError as ex:
+        raise ValueError(f"Could not convert the environmental variable for config option '{key}' to {target_type}: '{value}'.") from ex
 
-        sources[key].insert(0, ConfigLoadResult(value, spec))
+    return value
@@ -1,13 +1,17 @@
 import os
+import time
 import typing
 
 import edq.config.app
 import edq.config.constants
 import edq.config.load
 import edq.config.settings
+import edq.config.source
 import edq.config.testing
 import edq.testing.unittest
+import edq.util.crypto
 import edq.util.dirent
+import edq.util.json
 import edq.util.serial
 
 class TestLoadConfig(edq.testing.unittest.BaseTest):
@@ -366,3 +370,241 @@ class TestLoadConfig(edq.testing.unittest.BaseTest):
                     setattr(expected_config_info.application_config, normalize_key, None)
 
                 self.assertJSONEqual(expected_config_info, actual_config_info)
+
+    def test_get_tiered_config_secrets(self) -> None:
+        """ Test that secrets in the application config are decrypted (lazily or in bulk). """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = "edq-test-config-get-tiered-config-secrets-")
+        path = os.path.join(temp_dir, 'config.json')
+
+        key = edq.config.settings.get_default_encryption_key()
+        encrypted_token = edq.util.crypto.Secret('my-token').encrypt(key)
+        edq.util.json.dump_path({'token': encrypted_token, 'user': encrypted_token}, path)
+
+        edq.config.settings.set_application_config_class(edq.config.testing.TestApplicationConfig)
+
+        try:
+            for lazy_secrets in [True, False]:
+                with self.subTest(msg = f"Lazy: {lazy_secrets}:"):
+                    config_info = edq.config.load.get_tiered_config(
+                        cli_arguments = {edq.config.constants.CONFIG_PATHS_KEY: [path]},
+                        load_order = [edq.config.source.CLIFileSpec()],
+                        lazy_secrets = lazy_secrets,
+                    )
+
+                    application_config = typing.cast(edq.config.testing.TestApplicationConfig, config_info.application_config)
+
+                    # Only secret-typed fields are parsed.
+                    self.assertEqual(encrypted_token, application_config.user)
+                    self.assertEqual(encrypted_token, config_info.raw_config['token'])
+
+                    token = application_config.token
+                    self.assertIsNotNone(token)
+                    token = typing.cast(edq.util.crypto.Secret, token)
+
+                    self.assertEqual((not lazy_secrets), token.is_decrypted())
+                    self.assertEqual('my-token', token.cleartext)
+                    self.assertTrue(token.is_decrypted())
+
+            # Secrets are decrypted at load time by default.
+            config_info = edq.config.load.get_tiered_config(
+                cli_arguments = {edq.config.constants.CONFIG_PATHS_KEY: [path]},
+                load_order = [edq.config.source.CLIFileSpec()],
+            )
+
+            token = typing.cast(edq.config.testing.TestApplicationConfig, config_info.application_config).token
+            self.assertTrue(typing.cast(edq.util.crypto.Secret, token).is_decrypted())
+        finally:
+            edq.config.settings.set_application_config_class()
+
+    def test_get_tiered_config_cache(self) -> None:
+        """ Test that resolved configs (and parsed config files) are cached until something changes. """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = "edq-test-config-get-tiered-config-cache-")
+        path = os.path.join(temp_dir, 'config.json')
+        cache_path = os.path.join(temp_dir, 'cache', 'config-cache.msgpack')
+
+        # Move mtimes out of the racy window so files can be cached.
+        old_ns = time.time_ns() - (10 * edq.util.dirent.RACY_WINDOW_NS)
+
+        def write_config(data: typing.Dict[str, typing.Any], mtime_ns: int = old_ns) -> None:
+            edq.util.json.dump_path(data, path, atomic = False)
+            os.utime(path, ns = (mtime_ns, mtime_ns))
+
+        def load() -> edq.config.load.TieredConfigInfo:
+            return edq.config.load.get_tiered_config(
+                cli_arguments = {edq.config.constants.CONFIG_PATHS_KEY: [path]},
+                load_order = [edq.config.source.CLIFileSpec(), edq.config.source.ENVSpec()],
+                use_cache = True,
+                cache_path = cache_path,
+            )
+
+        edq.config.load.clear_config_cache()
+
+        try:
+            write_config({'user': 'aaa'})
+
+            # Nothing is cached by default.
+            edq.config.load.get_tiered_config(cli_arguments = {edq.config.constants.CONFIG_PATHS_KEY: [path]}, cache_path = cache_path)
+            self.assertEqual(0, len(edq.config.load._snapshot_cache))
+            self.assertFalse(os.path.exists(cache_path))
+
+            first = load()
+            self.assertEqual('aaa', first.raw_config['user'])
+            self.assertEqual(1, len(edq.config.load._snapshot_cache))
+            self.assertTrue(os.path.isfile(cache_path))
+
+            # Cached results are copies.
+            second = load()
+            self.assertIsNot(first, second)
+            self.assertJSONEqual(first, second)
+            second.raw_config['user'] = 'zzz'
+            self.assertEqual('aaa', load().raw_config['user'])
+
+            # A changed file.
+            write_config({'user': 'bbb'}, old_ns + 1)
+            self.assertEqual('bbb', load().raw_config['user'])
+
+            # A changed env.
+            os.environ[edq.config.settings.get_env_prefix() + 'NUMBER'] = '1'
+            self.assertEqual('1', load().raw_config['number'])
+            self.assertEqual(3, len(edq.config.load._snapshot_cache))
+
+            # A recently modified file is not cached.
+            edq.config.load.clear_config_cache()
+            write_config({'user': 'ccc'}, time.time_ns())
+            self.assertEqual('ccc', load().raw_config['user'])
+            self.assertEqual(0, len(edq.config.load._snapshot_cache))
+
+            # Parsed files are cached on disk.
+            # Rewrite the file in-place (same size, inode, and mtime) so only a cache hit will see the old value.
+            write_config({'user': 'ddd'})
+            load()
+            edq.config.load.clear_config_cache()
+            write_config({'user': 'eee'})
+
+            self.assertEqual('ddd', load().raw_config['user'])
+            self.assertEqual('eee', edq.config.load.get_tiered_config(
+                cli_arguments = {edq.config.constants.CONFIG_PATHS_KEY: [path]},
+                load_order = [edq.config.source.CLIFileSpec()],
+            ).raw_config['user'])
+        finally:
+            edq.config.load.clear_config_cache()
+
+    def test_get_tiered_config_track_sources(self) -> None:
+        """ Test that source tracking can be disabled without changing the resolved values. """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = "edq-test-config-get-tiered-config-track-sources-")
+        first_path = os.path.join(temp_dir, 'first.json')
+        second_path = os.path.join(temp_dir, 'second.json')
+
+        edq.util.json.dump_path({'user': 'first', 'number': 1}, first_path)
+        edq.util.json.dump_path({'user': 'second'}, second_path)
+
+        cli_arguments = {
+            edq.config.constants.CONFIG_PATHS_KEY: [first_path, second_path],
+            edq.config.constants.CONFIG_OPTIONS_KEY: ['user=cli'],
+        }
+
+        load_order = [edq.config.source.CLIFileSpec(), edq.config.source.CLIExplicitSpec()]
+
+        tracked = edq.config.load.get_tiered_config(cli_arguments = cli_arguments, load_order = load_order, use_cache = False)
+        untracked = edq.config.load.get_tiered_config(cli_arguments = cli_arguments, load_order = load_order,
+                use_cache = False, track_sources = False)
+
+        self.assertEqual(tracked.raw_config, untracked.raw_config)
+        self.assertEqual({}, untracked.sources)
+
+        # The most recently loaded value is first.
+        self.assertEqual(['cli', 'second', 'first'], [result.value for result in tracked.sources['user']])
+        self.assertEqual([None, second_path, first_path], [result.path for result in tracked.sources['user']])
+        self.assertEqual([1], [result.value for result in tracked.sources['number']])
+
+    def test_get_tiered_config_env(self) -> None:
+        """ Test loading nested and typed config from environmental variables. """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = "edq-test-config-get-tiered-config-env-")
+        path = os.path.join(temp_dir, 'config.json')
+        edq.util.json.dump_path({'server': {'host': 'file', 'port': 1}}, path)
+
+        prefix = edq.config.settings.get_env_prefix()
+        env_spec = edq.config.source.ENVSpec(nested_separator = '__', coerce_types = True)
+
+        def load() -> edq.config.load.TieredConfigInfo:
+            return edq.config.load.get_tiered_config(
+                cli_arguments = {edq.config.constants.CONFIG_PATHS_KEY: [path]},
+                load_order = [edq.config.source.CLIFileSpec(), env_spec],
+            )
+
+        edq.config.settings.set_application_config_class(edq.config.testing.TestApplicationConfig)
+
+        try:
+            os.environ.update({
+                prefix + 'NUMBER': '12',
+                prefix + 'DEBUG': 'true',
+                prefix + 'USER': 'env',
+                prefix + 'SERVER__HOST': 'env',
+                prefix + 'SERVER__AUTH__TOKEN': 'abc',
+            })
+
+            config_info = load()
+
+            expected = {
+                'number': 12,
+                'debug': True,
+                'user': 'env',
+                'server': {'host': 'env', 'port': 1, 'auth': {'token': 'abc'}},
+            }
+            self.assertJSONDictEqual(expected, config_info.raw_config)
+            application_config = typing.cast(edq.config.testing.TestApplicationConfig, config_info.application_config)
+            self.assertEqual(12, application_config.number)
+
+            # Nested values are merged into a copy of the file's value.
+            self.assertEqual([expected['server'], {'host': 'file', 'port': 1}], [result.value for result in config_info.sources['server']])
+
+            # A changed value (of the same size) is picked up.
+            os.environ[prefix + 'NUMBER'] = '34'
+            self.assertEqual(34, load().raw_config['number'])
+
+            # Without options, names and values are left as-is.
+            config_info = edq.config.load.get_tiered_config(load_order = [edq.config.source.ENVSpec()])
+            self.assertEqual('34', config_info.raw_config['number'])
+            self.assertEqual('env', config_info.raw_config['server__host'])
+
+            # Names without a key are ignored.
+            os.environ[prefix] = 'empty'
+            os.environ[prefix + 'SERVER____HOST'] = 'empty'
+            self.assertJSONDictEqual(expected | {'number': 34}, load().raw_config)
+
+            del os.environ[prefix]
+            del os.environ[prefix + 'SERVER____HOST']
+
+            # Separators are matched exactly (before names are lower-cased).
+            os.environ[prefix + 'AXB'] = 'nested'
+            config_info = edq.config.load.get_tiered_config(load_order = [edq.config.source.ENVSpec(nested_separator = 'X')])
+            self.assertEqual({'b': 'nested'}, config_info.raw_config['a'])
+            self.assertNotIn('a', edq.config.load.get_tiered_config(load_order = [edq.config.source.ENVSpec(nested_separator = 'x')]).raw_config)
+
+            # A removed variable is dropped, even if another variable is added at the same time.
+            del os.environ[prefix + 'AXB']
+            os.environ[prefix + 'NEW'] = 'new'
+            config_info = edq.config.load.get_tiered_config(load_order = [edq.config.source.ENVSpec()])
+            self.assertNotIn('axb', config_info.raw_config)
+            self.assertEqual('new', config_info.raw_config['new'])
+
+            # [(env variables, error substring), ...]
+            test_cases = [
+                ({prefix + 'NUMBER': 'abc'}, "Could not convert the environmental variable for config option 'number'"),
+                ({prefix + 'DEBUG': 'maybe'}, "Could not convert the environmental variable for config option 'debug'"),
+            ]
+
+            for (i, (env_variables, error_substring)) in enumerate(test_cases):
+                with self.subTest(msg = f"Case {i}"):
+                    edq.config.testing.clear_env()
+                    os.environ.update(env_variables)
+
+                    with self.assertRaisesRegex(ValueError, error_substring):
+                        load()
+        finally:
+            edq.config.settings.set_application_config_class()
+            edq.config.load.clear_config_cache()
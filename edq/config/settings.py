@@ -71,6 +71,19 @@ def set_global_dir(global_dir: typing.Union[str, None] = None) -> None:
 
     edq.config.common._global_dir = global_dir
 
+def get_config_cache_path() -> typing.Union[str, None]:
+    """ Get the path to the on-disk config file cache (see edq.config.load.get_tiered_config()), or None if disabled. """
+
+    return edq.config.common._config_cache_path
+
+def set_config_cache_path(path: typing.Union[str, None] = None) -> None:
+    """ Set the path to the on-disk config file cache (None disables the on-disk cache). """
+
+    if (path is None):
+        path = edq.config.common._DEFAULT_CONFIG_CACHE_PATH
+
+    edq.config.common._config_cache_path = path
+
 def get_load_order() -> typing.List[edq.config.source.ConfigSourceSpec]:
     """ Get the order to load config sources. """
 
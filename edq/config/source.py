@@ -62,14 +62,44 @@ class ENVSpec(ConfigSourceSpec):
 
     label: str = 'environmental variable'
 
+    def __init__(self,
+            nested_separator: typing.Union[str, None] = None,
+            coerce_types: bool = False,
+            **kwargs: typing.Any) -> None:
+        super().__init__(**kwargs)
+
+        if ((nested_separator is not None) and (len(nested_separator) == 0)):
+            raise ValueError("Nested separator for environmental variables cannot be empty.")
+
+        self.nested_separator: typing.Union[str, None] = nested_separator
+        """
+        If set, split variable names (after the prefix is removed) on this separator to set nested keys,
+        e.g., with a separator of '__', 'EDQ__A__B' will set config['a']['b'].
+        """
+
+        self.coerce_types: bool = coerce_types
+        """
+        Whether to convert (non-nested) values using the type hints of the application config
+        (see edq.config.settings.get_application_config_class()).
+        Otherwise, all values are strings.
+        """
+
     def get_help_lines(self) -> typing.List[str]:
-        return [
+        lines = [
             'Environmental Variables',
             'Load configuration values specified in environmental variables.',
             f"Variable names must start with the prefix: '{edq.config.common._env_prefix}'.",
             'Variable names will be stripped of the above prefix and turned to lower case.',
         ]
 
+        if (self.nested_separator is not None):
+            lines.append(f"Variable names will be split on '{self.nested_separator}' into nested keys.")
+
+        if (self.coerce_types):
+            lines.append('Values will be converted to the type expected by the application (e.g., booleans and numbers).')
+
+        return lines
+
 class AbstractPathSpec(ConfigSourceSpec):
     """
     An abstract source spec that includes a target directory and filename.
@@ -1,36 +1,147 @@
+import contextlib
 import os
 import typing
 
 import edq.util.dirent
 import edq.util.json
 
+class ConfigFileEditor:
+    """
+    A transactional editor for a single JSON config file.
+
+    Used as a context manager, the file is locked (see edq.util.dirent.lock_path()) and read once on entry,
+    any number of set()/unset() operations are applied in memory,
+    and the file is atomically written once on a successful exit (only if something was actually changed).
+    If the context exits with an exception, the file is left untouched.
+
+    The lock leaves an empty hidden lock file next to the config file (e.g., ".config.json.lock").
+    """
+
+    def __init__(self,
+            path: str,
+            create: bool = True,
+            lock_timeout_secs: typing.Union[float, None] = None,
+            ) -> None:
+        self.path: str = os.path.abspath(path)
+        """ The config file being edited. """
+
+        self.create: bool = create
+        """
+        Whether to create the file (and its parent dirs) if it does not exist.
+        If false, then a missing file will raise an error on entry.
+        """
+
+        self.lock_timeout_secs: typing.Union[float, None] = lock_timeout_secs
+        """ The maximum time to wait for other writers (see edq.util.dirent.lock_path()). """
+
+        self.config: typing.Dict[str, typing.Any] = {}
+        """ The current (possibly modified) contents of the file. """
+
+        self.modified: bool = False
+        """ Whether the config has been changed since it was read. """
+
+        self._lock_stack: typing.Union[contextlib.ExitStack, None] = None
+        """ Holds the file lock (while inside the context). """
+
+    def __enter__(self) -> 'ConfigFileEditor':
+        if (self.create):
+            edq.util.dirent.mkdir(os.path.dirname(self.path))
+
+        self._lock_stack = contextlib.ExitStack()
+        self._lock_stack.enter_context(edq.util.dirent.lock_path(self.path, timeout_secs = self.lock_timeout_secs))
+
+        try:
+            self.config = {}
+            if ((not self.create) or edq.util.dirent.exists(self.path)):
+                self.config = edq.util.json.load_path(self.path)
+
+            self.modified = False
+        except BaseException:
+            self._release()
+            raise
+
+        return self
+
+    def __exit__(self, exc_type: typing.Any, exc_value: typing.Any, traceback: typing.Any) -> None:
+        try:
+            if (exc_type is None):
+                self.commit()
+        finally:
+            self._release()
+
+    def get(self, key: str, default: typing.Any = None) -> typing.Any:
+        """ Get the current value of a config option. """
+
+        return self.config.get(key, default)
+
+    def set(self, key: str, value: typing.Any) -> None:
+        """ Set a config option (overwriting any existing value). """
+
+        if ((key in self.config) and (self.config[key] == value)):
+            return
+
+        self.config[key] = value
+        self.modified = True
+
+    def unset(self, key: str) -> bool:
+        """ Remove a config option, and return true if it was present. """
+
+        if (key not in self.config):
+            return False
+
+        self.config.pop(key)
+        self.modified = True
+
+        return True
+
+    def update(self, config_to_write: typing.Dict[str, typing.Any]) -> None:
+        """ Set many config options. """
+
+        for (key, value) in config_to_write.items():
+            self.set(key, value)
+
+    def commit(self) -> None:
+        """ Atomically write the config (if it was modified). Must be called inside the context. """
+
+        if (self._lock_stack is None):
+            raise ValueError("Config file edits can only be committed while the file is open (inside a `with` block).")
+
+        if (not self.modified):
+            return
+
+        edq.util.json.dump_path(self.config, self.path, indent = 4, atomic = True, fsync_dir = True)
+        self.modified = False
+
+    def _release(self) -> None:
+        """ Release the file lock. """
+
+        lock_stack = self._lock_stack
+        self._lock_stack = None
+
+        if (lock_stack is not None):
+            lock_stack.close()
+
 def update_options_in_config_file(path: str, config_to_write: typing.Dict[str, str]) -> None:
     """
     Write configs to the specified path.
     Create the path if it does not exist.
     Existing keys in the file will be overwritten with the new values.
+    To make many edits at once, use ConfigFileEditor directly.
     """
 
-    config = {}
-    if (edq.util.dirent.exists(path)):
-        config = edq.util.json.load_path(path)
-
-    config.update(config_to_write)
-
-    edq.util.dirent.mkdir(os.path.dirname(path))
-    edq.util.json.dump_path(config, path, indent = 4)
+    with ConfigFileEditor(path) as editor:
+        editor.update(config_to_write)
 
 def remove_options_in_config_file(path: str, config_to_remove: typing.List[str]) -> None:
     """
     Remove configs from the specified path.
     Raises an exception if the given path doesn't exist.
+    To make many edits at once, use ConfigFileEditor directly.
     """
 
-    config = edq.util.json.load_path(path)
-    for config_option in config_to_remove:
-        config.pop(config_option, None)
-
-    edq.util.json.dump_path(config, path, indent = 4)
+    with ConfigFileEditor(path, create = False) as editor:
+        for config_option in config_to_remove:
+            editor.unset(config_option)
 
 def parse_string_config_option(config_option: str) -> typing.Tuple[str, str]:
     """
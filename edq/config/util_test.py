@@ -1,4 +1,5 @@
 import os
+import threading
 import typing
 
 import edq.config.constants
@@ -6,6 +7,7 @@ import edq.config.settings
 import edq.config.testing
 import edq.config.util
 import edq.testing.unittest
+import edq.util.dirent
 import edq.util.json
 
 class TestConfigUtils(edq.testing.unittest.BaseTest):
@@ -269,3 +271,74 @@ class TestConfigUtils(edq.testing.unittest.BaseTest):
 
                 actual = edq.util.json.load_path(path)
                 self.assertJSONDictEqual(expected, actual)
+
+    def test_config_file_editor(self) -> None:
+        """ Test batching edits to a config file. """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = "edq-test_config_file_editor")
+        path = os.path.join(temp_dir, 'nested', 'config.json')
+
+        with edq.config.util.ConfigFileEditor(path) as editor:
+            editor.set('user', 'user@test.edulinq.org')
+            editor.set('pass', 'password1234')
+            editor.update({'server': 'https://test.edulinq.org', 'user': 'alice@test.edulinq.org'})
+            self.assertTrue(editor.unset('server'))
+            self.assertFalse(editor.unset('missing'))
+            self.assertEqual('alice@test.edulinq.org', editor.get('user'))
+
+            # Nothing is written until the edit completes.
+            self.assertFalse(os.path.exists(path))
+
+        expected = {
+            'user': 'alice@test.edulinq.org',
+            'pass': 'password1234',
+        }
+        self.assertJSONDictEqual(expected, edq.util.json.load_path(path))
+
+        # A failed edit leaves the file untouched.
+        try:
+            with edq.config.util.ConfigFileEditor(path) as editor:
+                editor.set('user', 'bob@test.edulinq.org')
+                raise RuntimeError('Failed edit.')
+        except RuntimeError:
+            pass
+
+        self.assertJSONDictEqual(expected, edq.util.json.load_path(path))
+
+        # Unchanged files are not rewritten.
+        mtime_ns = os.stat(path).st_mtime_ns
+        with edq.config.util.ConfigFileEditor(path) as editor:
+            editor.set('user', 'alice@test.edulinq.org')
+            self.assertFalse(editor.modified)
+
+        self.assertEqual(mtime_ns, os.stat(path).st_mtime_ns)
+
+        with self.assertRaisesRegex(FileNotFoundError, 'File does not exist'):
+            with edq.config.util.ConfigFileEditor(os.path.join(temp_dir, 'missing.json'), create = False):
+                pass
+
+    def test_config_file_editor_concurrent(self) -> None:
+        """ Test that concurrent editors do not lose each other's edits. """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = "edq-test_config_file_editor_concurrent")
+        path = os.path.join(temp_dir, 'config.json')
+
+        num_workers = 8
+        num_increments = 5
+
+        def _increment(worker: int) -> None:
+            for _ in range(num_increments):
+                with edq.config.util.ConfigFileEditor(path) as editor:
+                    editor.set('count', editor.get('count', 0) + 1)
+                    editor.set(f"worker-{worker}", True)
+
+        threads = [threading.Thread(target = _increment, args = (i, )) for i in range(num_workers)]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        config = edq.util.json.load_path(path)
+        self.assertEqual(num_workers * num_increments, config['count'])
+        self.assertEqual(num_workers + 1, len(config))
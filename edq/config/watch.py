@@ -0,0 +1,273 @@
+import logging
+import os
+import threading
+import typing
+
+import edq.config.app
+import edq.config.constants
+import edq.config.load
+import edq.config.settings
+import edq.config.source
+import edq.util.dirent
+import edq.util.serial
+
+_logger = logging.getLogger(__name__)
+
+ConfigSubscriber = typing.Callable[[edq.config.load.TieredConfigInfo], None]
+""" A function that receives the new config info whenever a ConfigWatcher reloads a changed config. """
+
+class ConfigWatcher:
+    """
+    Keep a tiered config (see edq.config.load.get_tiered_config()) up-to-date for long-running processes.
+
+    The config files referenced by the load order are watched (see edq.util.dirent.DirWatcher),
+    and the config is only re-resolved when one of them changes.
+    Config dirs that do not exist yet are checked every `poll_interval_secs` and watched once they are created.
+    When the resolved config actually changes, the new config info is swapped in (as a whole)
+    and then passed to each subscriber on the thread that called reload()
+    (a background watcher thread, for changes to config files).
+    A config that fails to load (e.g., a file that is being edited) is logged and the previous config is kept.
+
+    Environmental variables and CLI arguments cannot be watched,
+    call reload() to pick up changes to them.
+    """
+
+    def __init__(self,
+            cli_arguments: typing.Union[typing.Dict[str, typing.Any], None] = None,
+            cli_default_values: typing.Union[typing.Dict[str, typing.Any], None] = None,
+            load_order: typing.Union[typing.List[edq.config.source.ConfigSourceSpec], None] = None,
+            serialization_context: typing.Union[edq.util.serial.SerializationContext, None] = None,
+            debounce_secs: float = edq.util.dirent.DEFAULT_WATCH_DEBOUNCE_SECS,
+            poll_interval_secs: float = edq.util.dirent.DEFAULT_WATCH_POLL_INTERVAL_SECS,
+            force_polling: bool = False,
+            ) -> None:
+        if (cli_arguments is None):
+            cli_arguments = {}
+
+        self.cli_arguments: typing.Dict[str, typing.Any] = cli_arguments
+        """ The CLI arguments to resolve the config with. """
+
+        self.cli_default_values: typing.Union[typing.Dict[str, typing.Any], None] = cli_default_values
+        """ The CLI default values to resolve the config with. """
+
+        if (load_order is None):
+            load_order = edq.config.settings.get_load_order()
+
+        self.load_order: typing.List[edq.config.source.ConfigSourceSpec] = list(load_order)
+        """ The load order to resolve the config with. """
+
+        self.serialization_context: typing.Union[edq.util.serial.SerializationContext, None] = serialization_context
+        """ The serialization context to resolve the config with. """
+
+        self.debounce_secs: float = debounce_secs
+        """ The time config dirs must be quiet before a reload (see edq.util.dirent.DirWatcher). """
+
+        self.poll_interval_secs: float = poll_interval_secs
+        """ The time between scans when polling (see edq.util.dirent.DirWatcher). """
+
+        self.force_polling: bool = force_polling
+        """ Poll even when inotify is available (see edq.util.dirent.DirWatcher). """
+
+        self._config_info: typing.Union[edq.config.load.TieredConfigInfo, None] = None
+        """ The current config info, only ever replaced (never modified). """
+
+        self._subscribers: typing.List[ConfigSubscriber] = []
+        """ The functions to call when the config changes. """
+
+        self._watch_paths: typing.Set[str] = set()
+        """ The (absolute) config file paths that trigger a reload. """
+
+        self._watchers: typing.Dict[str, edq.util.dirent.DirWatcher] = {}
+        """ The watcher for each dir that holds a watched config file. """
+
+        self._missing_dirs: typing.Set[str] = set()
+        """ Dirs that would hold a watched config file, but do not exist yet. """
+
+        self._watching: bool = False
+        """ Whether config files are being watched (between start() and stop()). """
+
+        self._poll_thread: typing.Union[threading.Thread, None] = None
+        """ The thread checking for missing dirs to be created (while there are any). """
+
+        self._stop_event: threading.Event = threading.Event()
+        """ Set when this watcher should stop. """
+
+        self._lock: threading.RLock = threading.RLock()
+        """ A lock serializing reloads and protecting the watch state. """
+
+    def start(self) -> None:
+        """ Resolve the config and start watching its files. """
+
+        with self._lock:
+            if (self._config_info is not None):
+                raise ValueError("Config watcher has already been started.")
+
+            self._config_info = self._load()
+            self._watching = True
+            self._update_watches()
+
+    def stop(self) -> None:
+        """ Stop watching config files (the current config stays available). """
+
+        with self._lock:
+            self._watching = False
+            self._stop_event.set()
+
+            watchers = list(self._watchers.values())
+            self._watchers.clear()
+            self._watch_paths.clear()
+            self._missing_dirs.clear()
+
+            poll_thread = self._poll_thread
+            self._poll_thread = None
+
+        for watcher in watchers:
+            watcher.stop()
+
+        if (poll_thread is not None):
+            poll_thread.join()
+
+    def get_config_info(self) -> edq.config.load.TieredConfigInfo:
+        """ Get the current config info. """
+
+        config_info = self._config_info
+        if (config_info is None):
+            raise ValueError("Config watcher has not been started.")
+
+        return config_info
+
+    @property
+    def application_config(self) -> edq.config.app.BaseApplicationConfig:
+        """ The current application config. """
+
+        return self.get_config_info().application_config
+
+    def subscribe(self, subscriber: ConfigSubscriber) -> None:
+        """ Call the subscriber (with the new config info) every time the config changes. """
+
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: ConfigSubscriber) -> None:
+        """ Stop calling a subscriber. Does nothing if the subscriber was not subscribed. """
+
+        with self._lock:
+            if (subscriber in self._subscribers):
+                self._subscribers.remove(subscriber)
+
+    def reload(self) -> bool:
+        """
+        Re-resolve the config, and swap it in (notifying subscribers) if it changed.
+        Returns true if the config changed.
+        """
+
+        with self._lock:
+            old_config_info = self.get_config_info()
+
+            try:
+                new_config_info = self._load()
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                _logger.warning("Failed to reload config, keeping the previous config.", exc_info = ex)
+                return False
+
+            if (self._watching):
+                self._update_watches()
+
+            if (new_config_info.raw_config == old_config_info.raw_config):
+                return False
+
+            self._config_info = new_config_info
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            try:
+                subscriber(new_config_info)
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                _logger.error("Config subscriber failed.", exc_info = ex)
+
+        return True
+
+    def _load(self) -> edq.config.load.TieredConfigInfo:
+        """ Resolve the config. """
+
+        return edq.config.load.get_tiered_config(
+            cli_arguments = self.cli_arguments,
+            cli_default_values = self.cli_default_values,
+            load_order = self.load_order,
+            serialization_context = self.serialization_context,
+        )
+
+    def _get_config_paths(self) -> typing.Set[str]:
+        """ Get the (absolute) paths of all the config files the load order may read. """
+
+        paths = set()
+
+        for spec in self.load_order:
+            if (isinstance(spec, edq.config.source.CLIFileSpec)):
+                paths |= set(self.cli_arguments.get(edq.config.constants.CONFIG_PATHS_KEY, []))
+            elif (isinstance(spec, edq.config.source.GlobalSpec)):
+                paths.add(spec.resolve_path(override_path = self.cli_arguments.get(edq.config.constants.GLOBAL_CONFIG_KEY, None)))
+            elif (isinstance(spec, edq.config.source.AbstractPathSpec)):
+                paths.add(spec.resolve_path())
+
+        return {os.path.abspath(path) for path in paths}
+
+    def _update_watches(self) -> None:
+        """
+        Watch the dirs of any config files that are not already being watched.
+        Watchers are never stopped here (since this may be called from a watcher's thread),
+        changes in dirs that are no longer relevant are just ignored.
+        Dirs that do not exist yet are polled for (see _poll_missing_dirs()).
+        """
+
+        self._watch_paths = self._get_config_paths()
+        self._missing_dirs = set()
+
+        for dirpath in sorted({os.path.dirname(path) for path in self._watch_paths}):
+            if (dirpath in self._watchers):
+                continue
+
+            if (not os.path.isdir(dirpath)):
+                self._missing_dirs.add(dirpath)
+                continue
+
+            watcher = edq.util.dirent.DirWatcher(dirpath, self._handle_changes,
+                    debounce_secs = self.debounce_secs,
+                    poll_interval_secs = self.poll_interval_secs,
+                    force_polling = self.force_polling,
+                    recursive = False)
+            watcher.start()
+
+            self._watchers[dirpath] = watcher
+
+        if ((len(self._missing_dirs) > 0) and (self._poll_thread is None)):
+            self._poll_thread = threading.Thread(target = self._poll_missing_dirs, daemon = True)
+            self._poll_thread.start()
+
+    def _poll_missing_dirs(self) -> None:
+        """
+        Reload the config (which will also watch any new dirs) whenever a missing config dir is created.
+        Runs (on its own thread) until there are no more missing dirs or this watcher is stopped.
+        """
+
+        while (not self._stop_event.wait(self.poll_interval_secs)):
+            with self._lock:
+                if (len(self._missing_dirs) == 0):
+                    self._poll_thread = None
+                    return
+
+                created = any(os.path.isdir(dirpath) for dirpath in self._missing_dirs)
+
+            if (created):
+                self.reload()
+
+    def _handle_changes(self, changes: typing.List[typing.Tuple[str, str]]) -> None:
+        """ Reload the config if any of the changes are to a config file. """
+
+        with self._lock:
+            watch_paths = self._watch_paths
+
+        if (not any((path in watch_paths) for (path, _) in changes)):
+            return
+
+        self.reload()
@@ -0,0 +1,113 @@
+import os
+import queue
+
+import edq.config.constants
+import edq.config.load
+import edq.config.source
+import edq.config.watch
+import edq.testing.unittest
+import edq.util.dirent
+import edq.util.json
+
+WAIT_SECS: float = 5.0
+""" The maximum time to wait for a config change to be reported. """
+
+class TestConfigWatcher(edq.testing.unittest.BaseTest):
+    """ Test watching configs for changes. """
+
+    def test_config_watcher_base(self) -> None:
+        """ Test that changes to config files are reloaded and reported (with inotify (when available) and polling). """
+
+        for force_polling in [False, True]:
+            with self.subTest(msg = f"Polling: {force_polling}:"):
+                temp_dir = edq.util.dirent.get_temp_dir(prefix = "edq-test-config-watcher-")
+                path = os.path.join(temp_dir, 'config.json')
+                other_path = os.path.join(temp_dir, 'other.json')
+
+                edq.util.json.dump_path({'user': 'aaa'}, path)
+
+                watcher = edq.config.watch.ConfigWatcher(
+                    cli_arguments = {edq.config.constants.CONFIG_PATHS_KEY: [path]},
+                    load_order = [edq.config.source.CLIFileSpec()],
+                    debounce_secs = 0.05,
+                    poll_interval_secs = 0.05,
+                    force_polling = force_polling,
+                )
+
+                reported: queue.Queue = queue.Queue()
+                watcher.subscribe(reported.put)
+                watcher.start()
+
+                try:
+                    self.assertEqual('aaa', watcher.get_config_info().raw_config['user'])
+
+                    # Unrelated files are ignored.
+                    edq.util.json.dump_path({'user': 'zzz'}, other_path)
+
+                    # A broken file keeps the old config.
+                    edq.util.dirent.write_file(path, '{')
+                    edq.util.json.dump_path({'user': 'bbb'}, path)
+
+                    config_info = reported.get(timeout = WAIT_SECS)
+                    self.assertEqual('bbb', config_info.raw_config['user'])
+                    self.assertIs(config_info, watcher.get_config_info())
+
+                    # A reload without any changes is not reported.
+                    self.assertFalse(watcher.reload())
+                finally:
+                    watcher.stop()
+
+                self.assertTrue(reported.empty())
+
+    def test_config_watcher_missing_dir(self) -> None:
+        """ Test that config files in dirs that do not exist yet are picked up once they are created. """
+
+        for force_polling in [False, True]:
+            with self.subTest(msg = f"Polling: {force_polling}:"):
+                temp_dir = edq.util.dirent.get_temp_dir(prefix = "edq-test-config-watcher-missing-")
+                path = os.path.join(temp_dir, 'missing', 'nested', 'config.json')
+
+                watcher = edq.config.watch.ConfigWatcher(
+                    cli_arguments = {edq.config.constants.GLOBAL_CONFIG_KEY: path},
+                    load_order = [edq.config.source.GlobalSpec()],
+                    debounce_secs = 0.05,
+                    poll_interval_secs = 0.05,
+                    force_polling = force_polling,
+                )
+
+                reported: queue.Queue = queue.Queue()
+                watcher.subscribe(reported.put)
+                watcher.start()
+
+                try:
+                    self.assertNotIn('user', watcher.get_config_info().raw_config)
+
+                    edq.util.dirent.mkdir(os.path.dirname(path))
+                    edq.util.json.dump_path({'user': 'aaa'}, path)
+
+                    config_info = reported.get(timeout = WAIT_SECS)
+                    self.assertEqual('aaa', config_info.raw_config['user'])
+
+                    # Once the dir exists, later changes are seen by the dir watcher.
+                    edq.util.json.dump_path({'user': 'bbb'}, path)
+
+                    config_info = reported.get(timeout = WAIT_SECS)
+                    self.assertEqual('bbb', config_info.raw_config['user'])
+                finally:
+                    watcher.stop()
+
+    def test_config_watcher_errors(self) -> None:
+        """ Test using a config watcher incorrectly. """
+
+        watcher = edq.config.watch.ConfigWatcher(load_order = [])
+
+        with self.assertRaisesRegex(ValueError, 'has not been started'):
+            watcher.get_config_info()
+
+        watcher.start()
+
+        try:
+            with self.assertRaisesRegex(ValueError, 'has already been started'):
+                watcher.start()
+        finally:
+            watcher.stop()
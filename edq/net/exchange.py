@@ -13,12 +13,19 @@ import edq.util.dirent
 import edq.util.encoding
 import edq.util.hash
 import edq.util.json
+import edq.util.msgpack
 import edq.util.parse
 import edq.util.pyimport
 import edq.util.serial
 
 DEFAULT_HTTP_EXCHANGE_EXTENSION: str= '.httpex.json'
 
+BINARY_HTTP_EXCHANGE_EXTENSION: str = '.httpex' + edq.util.msgpack.MSGPACK_EXTENSION
+"""
+An alternate extension for exchanges stored in a binary format (MessagePack, see edq.util.msgpack).
+Binary exchanges are smaller and faster to load, and can store binary file contents without base64 encoding.
+"""
+
 QUERY_CLIP_LENGTH: int = 100
 """ If the filename of an HTTPExhange being saved is longer than this, then clip it. """
 
@@ -79,7 +86,8 @@ class FileInfo(edq.util.serial.DictConverter):
     def hash_content(self) -> str:
         """
         Compute a hash for the content present.
-        If no content is provided, use the path.
+        If no content is provided, then a resolved (absolute) path will have its file hashed (streamed, see edq.util.dirent.hash_file()).
+        Otherwise, use the path.
         """
 
         hash_content = self.content
@@ -88,6 +96,9 @@ class FileInfo(edq.util.serial.DictConverter):
             hash_content = edq.util.encoding.from_base64(hash_content)
 
         if (hash_content is None):
+            if ((self.path is not None) and os.path.isabs(self.path) and os.path.isfile(self.path)):
+                return edq.util.dirent.hash_file(self.path)
+
             hash_content = self.path
 
         return edq.util.hash.sha256_hex(hash_content)
@@ -98,7 +109,9 @@ class FileInfo(edq.util.serial.DictConverter):
         data = vars(self).copy()
 
         # JSON does not support raw bytes, so we will need to base64 encode any binary content.
-        if (isinstance(self.content, bytes)):
+        # Some formats (e.g., MessagePack) can handle bytes natively (see SerializationContext.allow_bytes).
+        allow_bytes = ((context is not None) and context.allow_bytes)
+        if (isinstance(self.content, bytes) and (not allow_bytes)):
             data['content'] = edq.util.encoding.to_base64(self.content)
             data['b64_encoded'] = True
 
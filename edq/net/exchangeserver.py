@@ -1,4 +1,3 @@
-import glob
 import http.server
 import logging
 import os
@@ -64,6 +63,15 @@ class HTTPExchangeServer():
         Exchanges are stored as: {url_path: {anchor: {method: [exchange, ...]}, ...}, ...}.
         """
 
+        self._exchange_sources: typing.Dict[str, typing.List[edq.net.exchange.HTTPExchange]] = {}
+        """ The exchanges loaded from each file (keyed by absolute path), so they can be unloaded when the file changes. """
+
+        self._exchanges_lock: threading.RLock = threading.RLock()
+        """ A lock protecting the loaded exchanges (which may be modified by watchers while the server is running). """
+
+        self._watchers: typing.List[edq.util.dirent.DirWatcher] = []
+        """ Watchers for any dirs that should be hot-reloaded. """
+
         if (match_options is None):
             match_options = {}
 
@@ -84,10 +92,11 @@ class HTTPExchangeServer():
 
         exchanges = []
 
-        for url_exchanges in self._exchanges.values():
-            for anchor_exchanges in url_exchanges.values():
-                for method_exchanges in anchor_exchanges.values():
-                    exchanges += method_exchanges
+        with self._exchanges_lock:
+            for url_exchanges in self._exchanges.values():
+                for anchor_exchanges in url_exchanges.values():
+                    for method_exchanges in anchor_exchanges.values():
+                        exchanges += method_exchanges
 
         return exchanges
 
@@ -155,7 +164,9 @@ class HTTPExchangeServer():
         self.wait_for_completion()
 
     def stop(self) -> None:
-        """ Stop this server. """
+        """ Stop this server (and any dir watchers). """
+
+        self.stop_watching()
 
         self.port = None
 
@@ -201,6 +212,15 @@ class HTTPExchangeServer():
         (e.g., the URL was matched, but the method was not).
         """
 
+        with self._exchanges_lock:
+            return self._lookup_exchange(query, match_options)
+
+    def _lookup_exchange(self,
+            query: edq.net.exchange.HTTPExchange,
+            match_options: typing.Union[typing.Dict[str, typing.Any], None] = None,
+            ) -> typing.Tuple[typing.Union[edq.net.exchange.HTTPExchange, None], typing.Union[str, None]]:
+        """ Lookup an exchange (see lookup_exchange()) while holding the exchanges lock. """
+
         if (match_options is None):
             match_options = {}
 
@@ -266,20 +286,21 @@ class HTTPExchangeServer():
         if (exchange is None):
             raise ValueError("Cannot load a None exchange.")
 
-        target: typing.Any = self._exchanges
-        if (exchange.url_path not in target):
-            target[exchange.url_path] = {}
+        with self._exchanges_lock:
+            target: typing.Any = self._exchanges
+            if (exchange.url_path not in target):
+                target[exchange.url_path] = {}
 
-        target = target[exchange.url_path]
-        if (exchange.url_anchor not in target):
-            target[exchange.url_anchor] = {}
+            target = target[exchange.url_path]
+            if (exchange.url_anchor not in target):
+                target[exchange.url_anchor] = {}
 
-        target = target[exchange.url_anchor]
-        if (exchange.method not in target):
-            target[exchange.method] = []
+            target = target[exchange.url_anchor]
+            if (exchange.method not in target):
+                target[exchange.method] = []
 
-        target = target[exchange.method]
-        target.append(exchange)
+            target = target[exchange.method]
+            target.append(exchange)
 
     def load_exchange_file(self,
             path: str,
@@ -289,27 +310,124 @@ class HTTPExchangeServer():
         """
         Load an exchange from a file.
         This will also handle setting the exchanges source path and resolving the exchange's paths.
+        Any exchanges previously loaded from the same file are replaced (so loading a file is idempotent).
         """
 
-        exchange = edq.net.exchange.HTTPExchange.from_path(path, context = context)
+        exchange = self._read_exchange_file(path, context = context, finalize_func = finalize_func)
+        self._load_file_exchange(path, exchange)
 
-        if (finalize_func is not None):
-            exchange = finalize_func(exchange)
+    def unload_exchange_file(self, path: str) -> None:
+        """ Unload all the exchanges that were loaded from a file (see load_exchange_file()). """
+
+        with self._exchanges_lock:
+            for exchange in self._exchange_sources.pop(os.path.abspath(path), []):
+                url_exchanges = self._exchanges.get(exchange.url_path, {})
+                anchor_exchanges = url_exchanges.get(exchange.url_anchor, {})
+                method_exchanges = anchor_exchanges.get(exchange.method, [])
+
+                # Remove by identity (equal exchanges may have been loaded from other files).
+                for (i, method_exchange) in enumerate(method_exchanges):
+                    if (method_exchange is exchange):
+                        method_exchanges.pop(i)
+                        break
 
-        self.load_exchange(exchange)
+                # Prune any empty layers, so lookup hints stay accurate.
+                if (len(method_exchanges) == 0):
+                    anchor_exchanges.pop(exchange.method, None)
+
+                if (len(anchor_exchanges) == 0):
+                    url_exchanges.pop(exchange.url_anchor, None)
+
+                if (len(url_exchanges) == 0):
+                    self._exchanges.pop(exchange.url_path, None)
 
     def load_exchanges_dir(self,
             base_dir: str,
             extension: str = edq.net.exchange.DEFAULT_HTTP_EXCHANGE_EXTENSION,
             context: typing.Union[edq.util.serial.SerializationContext, None] = None,
             finalize_func: typing.Union[edq.net.exchange.HTTPExchangeFinalizeFunc, None] = None,
+            watch: bool = False,
             ) -> None:
-        """ Load all exchanges found (recursively) within a directory. """
+        """
+        Load all exchanges found (recursively) within a directory.
 
-        paths = list(sorted(glob.glob(os.path.join(base_dir, "**", f"*{extension}"), recursive = True)))
-        for path in paths:
+        If `watch` is true, then the dir will be watched (see edq.util.dirent.DirWatcher)
+        and any exchange files that are created, modified, or deleted will be (re/un)loaded
+        (until stop() or stop_watching() is called).
+        """
+
+        if (watch):
+            # Start watching before loading, so no changes are missed.
+            # A file may then be loaded both by the walk below and by the watcher,
+            # which is safe since loading a file replaces anything previously loaded from it.
+            def _callback(events: typing.List[typing.Tuple[str, str]]) -> None:
+                self._reload_exchange_files(events, extension, context, finalize_func)
+
+            watcher = edq.util.dirent.DirWatcher(base_dir, _callback)
+            watcher.start()
+            self._watchers.append(watcher)
+
+        for path in edq.util.dirent.walk_files(base_dir, extensions = extension):
             self.load_exchange_file(path, context = context, finalize_func = finalize_func)
 
+    def stop_watching(self) -> None:
+        """ Stop watching any exchange dirs (see load_exchanges_dir()). """
+
+        for watcher in self._watchers:
+            watcher.stop()
+
+        self._watchers = []
+
+    def _read_exchange_file(self,
+            path: str,
+            context: typing.Union[edq.util.serial.SerializationContext, None] = None,
+            finalize_func: typing.Union[edq.net.exchange.HTTPExchangeFinalizeFunc, None] = None,
+            ) -> edq.net.exchange.HTTPExchange:
+        """ Read (and finalize) an exchange from a file. """
+
+        exchange = edq.net.exchange.HTTPExchange.from_path(path, context = context)
+
+        if (finalize_func is not None):
+            exchange = finalize_func(exchange)
+
+        return exchange
+
+    def _load_file_exchange(self, path: str, exchange: edq.net.exchange.HTTPExchange) -> None:
+        """ Load an exchange (replacing any exchanges already loaded from the same file) and remember which file it came from. """
+
+        with self._exchanges_lock:
+            self.unload_exchange_file(path)
+            self.load_exchange(exchange)
+            self._exchange_sources.setdefault(os.path.abspath(path), []).append(exchange)
+
+    def _reload_exchange_files(self,
+            events: typing.List[typing.Tuple[str, str]],
+            extension: str,
+            context: typing.Union[edq.util.serial.SerializationContext, None] = None,
+            finalize_func: typing.Union[edq.net.exchange.HTTPExchangeFinalizeFunc, None] = None,
+            ) -> None:
+        """ Reload any changed exchange files reported by a dir watcher. """
+
+        for (path, event) in events:
+            if (not path.endswith(extension)):
+                continue
+
+            exchange = None
+            if (event != edq.util.dirent.WATCH_EVENT_DELETED):
+                # Parse the file outside of the lock, so requests are not blocked.
+                try:
+                    exchange = self._read_exchange_file(path, context = context, finalize_func = finalize_func)
+                except Exception as ex:  # pylint: disable=broad-exception-caught
+                    _logger.warning("Failed to reload exchange file '%s'.", path, exc_info = ex)
+
+            if (exchange is None):
+                self.unload_exchange_file(path)
+            else:
+                self._load_file_exchange(path, exchange)
+
+            if (self.verbose):
+                _logger.info("Reloaded exchange file (%s): '%s'.", event, path)
+
 @typing.runtime_checkable
 class MissingRequestFunction(typing.Protocol):
     """
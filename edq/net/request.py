@@ -15,7 +15,9 @@ import edq.net.settings
 import edq.util.dirent
 import edq.util.encoding
 import edq.util.json
+import edq.util.msgpack
 import edq.util.pyimport
+import edq.util.serial
 
 _logger = logging.getLogger(__name__)
 
@@ -153,31 +155,47 @@ def make_request(method: str, url: str,
         )
 
         if (output_dir is not None):
-            _write_exchange(exchange, output_dir, http_exchange_extension)
+            exchanges = [exchange]
 
             # Also write any redirects.
             for redirect_response in response.history:
-                redirect_exchange = edq.net.exchange.HTTPExchange.from_response(
+                exchanges.append(edq.net.exchange.HTTPExchange.from_response(
                     redirect_response,
                     headers_to_skip = headers_to_skip,
                     params_to_skip = params_to_skip,
                     allow_redirects = options.get('allow_redirects', True),
-                )
-                _write_exchange(redirect_exchange, output_dir, http_exchange_extension)
+                ))
+
+            _write_exchanges(exchanges, output_dir, http_exchange_extension)
 
         if (request_complete_callback is not None):
             request_complete_callback(exchange)
 
     return response, body
 
-def _write_exchange(exchange: edq.net.exchange.HTTPExchange, output_dir: str, http_exchange_extension: str) -> None:
-    """ Write an exchange to disk in the computed path. """
-
-    relpath = exchange.compute_relpath(http_exchange_extension = http_exchange_extension)
-    path = os.path.abspath(os.path.join(output_dir, relpath))
-
-    edq.util.dirent.mkdir(os.path.dirname(path))
-    edq.util.json.dump_path(exchange, path, indent = 4, sort_keys = False)
+def _write_exchanges(
+        exchanges: typing.List[edq.net.exchange.HTTPExchange],
+        output_dir: str,
+        http_exchange_extension: str,
+        ) -> None:
+    """ Write exchanges to disk in their computed paths (in bulk). """
+
+    contents: typing.Dict[str, typing.Union[str, bytes]] = {}
+
+    for exchange in exchanges:
+        relpath = exchange.compute_relpath(http_exchange_extension = http_exchange_extension)
+        path = os.path.abspath(os.path.join(output_dir, relpath))
+
+        if (edq.util.msgpack.is_msgpack_path(path)):
+            context = edq.util.serial.SerializationContext(source_path = path, base_dir = os.path.dirname(path), allow_bytes = True)
+            data = edq.util.serial.generic_to_pod(exchange.to_dict(context), context)
+            contents[path] = edq.util.msgpack.dumps(data)
+        else:
+            contents[path] = edq.util.json.dumps(exchange, indent = 4, sort_keys = False)
+
+    errors = edq.util.dirent.write_files(contents, strip = False, newline = False, make_dirs = True)
+    if (len(errors) > 0):
+        raise ValueError(f"Failed to write HTTP exchange(s): {list(errors.values())}.")
 
 def make_with_exchange(
         exchange: edq.net.exchange.HTTPExchange,
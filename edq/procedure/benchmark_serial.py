@@ -0,0 +1,267 @@
+"""
+Benchmark serialization (edq.util.serial, edq.util.json, and edq.util.msgpack) using synthetic workloads.
+"""
+
+import typing
+
+import edq.net.exchange
+import edq.util.benchmark
+import edq.util.json
+import edq.util.msgpack
+import edq.util.serial
+
+DEFAULT_SCALE: int = 100
+""" The default size of each workload (e.g., the number of records or exchanges). """
+
+NESTED_DEPTH: int = 4
+""" The depth of the synthetic nested records. """
+
+NESTED_WIDTH: int = 3
+""" The number of children each synthetic nested record has. """
+
+LARGE_FIELD_SIZE: int = 2 ** 20
+""" The size (in bytes/characters) of large synthetic fields. """
+
+Workload = typing.Callable[[], typing.Any]
+""" A function to benchmark. """
+
+WorkloadFactory = typing.Callable[[], Workload]
+""" A function that builds a workload's data (which is not measured) and returns the workload. """
+
+class _FlatRecord(edq.util.serial.DictConverter):
+    """ A synthetic record with only simple fields. """
+
+    def __init__(self,
+            index: int = 0,
+            name: str = '',
+            score: float = 0.0,
+            active: bool = False,
+            tags: typing.Union[typing.List[str], None] = None,
+            attributes: typing.Union[typing.Dict[str, str], None] = None,
+            **kwargs: typing.Any) -> None:
+        if (tags is None):
+            tags = []
+
+        if (attributes is None):
+            attributes = {}
+
+        self.index: int = index
+        """ The position of this record in its workload. """
+
+        self.name: str = name
+        """ A unique name for this record. """
+
+        self.score: float = score
+        """ A float field. """
+
+        self.active: bool = active
+        """ A bool field. """
+
+        self.tags: typing.List[str] = tags
+        """ A list field (of varying length). """
+
+        self.attributes: typing.Dict[str, str] = attributes
+        """ A dict field. """
+
+class _NestedRecord(edq.util.serial.DictConverter):
+    """ A synthetic record that nests other records. """
+
+    def __init__(self,
+            record: typing.Union[_FlatRecord, None] = None,
+            children: typing.Union[typing.List['_NestedRecord'], None] = None,
+            **kwargs: typing.Any) -> None:
+        if (children is None):
+            children = []
+
+        self.record: typing.Union[_FlatRecord, None] = record
+        """ The data at this level of the tree. """
+
+        self.children: typing.List[_NestedRecord] = children
+        """ The next level of the tree. """
+
+def get_workloads(scale: int = DEFAULT_SCALE) -> typing.Dict[str, WorkloadFactory]:
+    """
+    Get all the available workloads (keyed by name).
+    Each workload is returned as a factory, so no data is built until a workload is actually going to be run
+    (and then only the data for that workload).
+    All data is built before the factory returns, so only the (de)serialization itself is measured.
+    """
+
+    # {name: (data builder, operation on the data), ...}
+    workloads: typing.Dict[str, typing.Tuple[typing.Callable[[int], typing.Any], typing.Callable[[typing.Any], typing.Any]]] = {
+        'serial.flat.to_dict': (_build_flat_records, lambda records: [record.to_dict() for record in records]),
+        'serial.flat.from_dict': (_build_flat_dicts, lambda dicts: [_FlatRecord.from_dict(data) for data in dicts]),
+        'serial.flat.from_pods': (_build_flat_dicts, lambda dicts: edq.util.serial.from_pods(dicts, _FlatRecord)),
+        'serial.flat.copy': (_build_flat_records, lambda records: [record.copy() for record in records]),
+        'serial.flat.sort': (_build_flat_records, lambda records: sorted(records, reverse = True)),
+        'serial.flat.hash': (_build_flat_records, lambda records: {record: True for record in records}),
+
+        'serial.nested.to_dict': (_build_nested_record, lambda record: record.to_dict()),
+        'serial.nested.from_dict': (_build_nested_dict, _NestedRecord.from_dict),
+        'serial.nested.copy': (_build_nested_record, lambda record: record.copy()),
+        'serial.nested.eq': (_build_nested_record_and_dict, lambda data: data[0] == _NestedRecord.from_dict(data[1])),
+
+        'serial.large_text.to_dict': (_build_large_text_file, lambda file_info: file_info.to_dict()),
+        'serial.large_bytes.to_dict': (_build_large_bytes_file, lambda file_info: file_info.to_dict()),
+        'serial.large_bytes.from_dict': (_build_large_bytes_dict, edq.net.exchange.FileInfo.from_dict),
+
+        'exchange.to_dict': (_build_exchanges, lambda exchanges: [exchange.to_dict() for exchange in exchanges]),
+        'exchange.from_dict': (_build_exchange_dicts, lambda dicts: [edq.net.exchange.HTTPExchange.from_dict(data) for data in dicts]),
+        'exchange.copy': (_build_exchanges, lambda exchanges: [exchange.copy() for exchange in exchanges]),
+        'exchange.dedup': (_build_exchanges, set),
+
+        'json.dumps': (_build_exchange_dicts, edq.util.json.dumps),
+        'json.loads.strict': (_build_exchanges_json, lambda text: edq.util.json.loads(text, strict = True)),
+        'json.loads.json5': (_build_exchanges_json, edq.util.json.loads),
+
+        'msgpack.dumps': (_build_exchange_dicts, edq.util.msgpack.dumps),
+        'msgpack.loads': (_build_exchanges_msgpack, edq.util.msgpack.loads),
+    }
+
+    return {name: _make_factory(builder, operation, scale) for (name, (builder, operation)) in workloads.items()}
+
+def run(
+        names: typing.Union[typing.List[str], None] = None,
+        scale: int = DEFAULT_SCALE,
+        min_time_secs: float = edq.util.benchmark.DEFAULT_MIN_TIME_SECS,
+        min_iterations: int = edq.util.benchmark.DEFAULT_MIN_ITERATIONS,
+        measure_allocations: bool = True,
+        ) -> typing.List[edq.util.benchmark.BenchmarkResult]:
+    """
+    Run the named workloads (or all workloads if no names are given).
+    A name matches a workload if it is the workload's name or a dotted prefix of it (e.g., "serial.flat").
+    Each workload's data is built just before it is run (and released after).
+    """
+
+    workloads = get_workloads(scale)
+
+    if ((names is None) or (len(names) == 0)):
+        selected = list(workloads.keys())
+    else:
+        selected = [workload_name for workload_name in workloads if any(_name_matches(name, workload_name) for name in names)]
+
+        unmatched = [name for name in names if (not any(_name_matches(name, workload_name) for workload_name in workloads))]
+        if (len(unmatched) > 0):
+            raise ValueError(f"Unknown benchmark workload(s): {unmatched}.")
+
+    results = []
+    for name in selected:
+        workload = workloads[name]()
+        results.append(edq.util.benchmark.run_benchmark(name, workload,
+                min_time_secs = min_time_secs, min_iterations = min_iterations, measure_allocations = measure_allocations))
+
+    return results
+
+def _make_factory(
+        builder: typing.Callable[[int], typing.Any],
+        operation: typing.Callable[[typing.Any], typing.Any],
+        scale: int,
+        ) -> WorkloadFactory:
+    """ Make a factory that builds a workload's data and binds it to the workload's operation. """
+
+    def factory() -> Workload:
+        data = builder(scale)
+        return lambda: operation(data)
+
+    return factory
+
+def _build_flat_records(scale: int) -> typing.List[_FlatRecord]:
+    """ Build the flat records for a workload. """
+
+    return [_make_flat_record(i) for i in range(scale)]
+
+def _build_flat_dicts(scale: int) -> typing.List[typing.Dict[str, typing.Any]]:
+    """ Build the flat records (as dicts) for a workload. """
+
+    return [record.to_dict() for record in _build_flat_records(scale)]
+
+def _build_nested_record(scale: int) -> _NestedRecord:
+    """ Build the nested record for a workload (which does not depend on scale). """
+
+    return _make_nested_record(0, NESTED_DEPTH)
+
+def _build_nested_dict(scale: int) -> typing.Dict[str, typing.Any]:
+    """ Build the nested record (as a dict) for a workload. """
+
+    return _build_nested_record(scale).to_dict()
+
+def _build_nested_record_and_dict(scale: int) -> typing.Tuple[_NestedRecord, typing.Dict[str, typing.Any]]:
+    """ Build the nested record (and its dict) for a workload. """
+
+    record = _build_nested_record(scale)
+    return record, record.to_dict()
+
+def _build_large_text_file(scale: int) -> edq.net.exchange.FileInfo:
+    """ Build a file with large text content for a workload (which does not depend on scale). """
+
+    return edq.net.exchange.FileInfo(name = 'large.txt', content = 'a' * LARGE_FIELD_SIZE)
+
+def _build_large_bytes_file(scale: int) -> edq.net.exchange.FileInfo:
+    """ Build a file with large binary content for a workload (which does not depend on scale). """
+
+    return edq.net.exchange.FileInfo(name = 'large.bin', content = bytes(range(256)) * (LARGE_FIELD_SIZE // 256))
+
+def _build_large_bytes_dict(scale: int) -> typing.Dict[str, typing.Any]:
+    """ Build a file with large binary content (as a dict) for a workload. """
+
+    return _build_large_bytes_file(scale).to_dict()
+
+def _build_exchanges(scale: int) -> typing.List[edq.net.exchange.HTTPExchange]:
+    """ Build the exchanges for a workload. """
+
+    return [_make_exchange(i) for i in range(scale)]
+
+def _build_exchange_dicts(scale: int) -> typing.List[typing.Dict[str, typing.Any]]:
+    """ Build the exchanges (as dicts) for a workload. """
+
+    return [exchange.to_dict() for exchange in _build_exchanges(scale)]
+
+def _build_exchanges_json(scale: int) -> str:
+    """ Build the exchanges (as JSON) for a workload. """
+
+    return edq.util.json.dumps(_build_exchange_dicts(scale))
+
+def _build_exchanges_msgpack(scale: int) -> bytes:
+    """ Build the exchanges (as MessagePack) for a workload. """
+
+    return edq.util.msgpack.dumps(_build_exchange_dicts(scale))
+
+def _name_matches(query: str, name: str) -> bool:
+    """ Check if a query name matches a workload name. """
+
+    return ((query == name) or name.startswith(query + '.'))
+
+def _make_flat_record(index: int) -> _FlatRecord:
+    """ Make a synthetic flat record. """
+
+    return _FlatRecord(
+        index = index,
+        name = f"record-{index:06d}",
+        score = index / 7.0,
+        active = ((index % 2) == 0),
+        tags = [f"tag-{i}" for i in range(index % 5)],
+        attributes = {f"key-{i}": f"value-{index}-{i}" for i in range(5)},
+    )
+
+def _make_nested_record(index: int, depth: int) -> _NestedRecord:
+    """ Make a synthetic tree of records. """
+
+    children = []
+    if (depth > 1):
+        children = [_make_nested_record((index * NESTED_WIDTH) + i + 1, depth - 1) for i in range(NESTED_WIDTH)]
+
+    return _NestedRecord(record = _make_flat_record(index), children = children)
+
+def _make_exchange(index: int) -> edq.net.exchange.HTTPExchange:
+    """ Make a synthetic HTTP exchange. """
+
+    return edq.net.exchange.HTTPExchange(
+        method = 'POST' if ((index % 2) == 0) else 'GET',
+        url_path = f"api/v1/items/{index}",
+        parameters = {'page': str(index % 10), 'filter': ['a', 'b', 'c']},
+        headers = {'Accept': 'application/json', 'X-Request-Id': f"{index:08x}"},
+        files = [edq.net.exchange.FileInfo(name = f"file-{index}.txt", content = f"content {index}\n" * 10)],
+        response_headers = {'Content-Type': 'application/json'},
+        json_body = True,
+        response_body = {'id': index, 'items': [{'name': f"item-{i}", 'value': i} for i in range(10)]},
+    )
@@ -2,7 +2,6 @@
 Verify that exchanges sent to a given server have the same response.
 """
 
-import glob
 import logging
 import os
 import typing
@@ -11,6 +10,7 @@ import unittest
 import edq.net.exchange
 import edq.net.request
 import edq.testing.unittest
+import edq.util.dirent
 
 _logger = logging.getLogger(__name__)
 
@@ -80,9 +80,7 @@ def _collect_exchange_paths(
             else:
                 _logger.warning("Path does not look like an exchange file: '%s'.", path)
         else:
-            dirent_paths = glob.glob(os.path.join(path, "**", f"*{extension}"), recursive = True)
-            for dirent_path in dirent_paths:
-                final_paths.append(dirent_path)
+            final_paths += edq.util.dirent.walk_files(path, extensions = extension)
 
     final_paths.sort()
     return final_paths
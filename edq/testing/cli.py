@@ -22,7 +22,6 @@ For example, `__DATA_DIR__(foo/bar.txt)` references `bar.txt` inside the `foo` d
 """
 
 import contextlib
-import glob
 import io
 import os
 import re
@@ -51,6 +50,12 @@ DEFAULT_ASSERTION_FUNC_NAME: str = 'edq.testing.asserts.content_equals_normalize
 
 BASE_TEMP_DIR_ATTR: str = '_edq_cli_base_test_dir'
 
+DEFAULT_COPY_MODE: str = edq.util.dirent.COPY_MODE_REFLINK
+"""
+The default mode used to materialize test data in setup_teardown_copy() (see edq.util.dirent.COPY_MODES).
+Reflinks are safe to write to, and fall back to full copies where they are not supported.
+"""
+
 @typing.runtime_checkable
 class SetupTeardownFunction(typing.Protocol):
     """
@@ -263,10 +268,14 @@ class CLITestInfo:
         return f"This test has been skipped because of the following: {self.skip_reasons}."
 
     @staticmethod
-    def load_path(path: str, test_name: str, base_temp_dir: str, data_dir: str) -> 'CLITestInfo':
-        """ Load a CLI test file and extract the test info. """
+    def load_path(path: str, test_name: str, base_temp_dir: str, data_dir: str,
+            text: typing.Union[str, None] = None) -> 'CLITestInfo':
+        """
+        Load a CLI test file and extract the test info.
+        If the file's text has already been read, it can be passed in to avoid re-reading the file.
+        """
 
-        options, expected_stdout = read_test_file(path)
+        options, expected_stdout = read_test_file(path, text = text)
 
         options['expected_stdout'] = expected_stdout
 
@@ -291,13 +300,17 @@ class TestMethodWrapperFunction(typing.Protocol):
         The returned method will be used in-place of the input one.
         """
 
-def read_test_file(path: str) -> typing.Tuple[typing.Dict[str, typing.Any], str]:
-    """ Read a test case file and split the output into JSON data and text. """
+def read_test_file(path: str, text: typing.Union[str, None] = None) -> typing.Tuple[typing.Dict[str, typing.Any], str]:
+    """
+    Read a test case file and split the output into JSON data and text.
+    If the file's text has already been read, it can be passed in to avoid re-reading the file.
+    """
 
     json_lines: typing.List[str] = []
     output_lines: typing.List[str] = []
 
-    text = edq.util.dirent.read_file(path, strip = False)
+    if (text is None):
+        text = edq.util.dirent.read_file(path, strip = False)
 
     accumulator = json_lines
     switched_accumulator = False
@@ -366,14 +379,14 @@ def compute_ancestor_basename(path: str, cli_tests_dir: str) -> str:
     return name
 
 
-def _get_test_method(test_name: str, path: str, data_dir: str) -> typing.Callable:
-    """ Get a test method that represents the test case at the given path. """
+def _get_test_method(test_name: str, path: str, data_dir: str, text: typing.Union[str, None] = None) -> typing.Callable:
+    """ Get a test method that represents the test case at the given path (with optional pre-read text). """
 
     def __method(self: edq.testing.unittest.BaseTest,
             reraise_exception_types: typing.Union[typing.Tuple[typing.Type], None] = None,
             **kwargs: typing.Any,
             ) -> None:
-        test_info = CLITestInfo.load_path(path, test_name, getattr(self, BASE_TEMP_DIR_ATTR), data_dir)
+        test_info = CLITestInfo.load_path(path, test_name, getattr(self, BASE_TEMP_DIR_ATTR), data_dir, text = text)
 
         # Allow the test class a chance to modify the test info before the test runs.
         if (hasattr(self, 'modify_cli_test_info')):
@@ -449,7 +462,13 @@ def add_test_paths(target_class: type, data_dir: str, paths: typing.List[str],
     if (not hasattr(target_class, BASE_TEMP_DIR_ATTR)):
         setattr(target_class, BASE_TEMP_DIR_ATTR, edq.util.dirent.get_temp_path('edq_cli_test_'))
 
+    # Read all the test files up-front (in bulk).
+    texts, errors = edq.util.dirent.read_files(paths, strip = False)
+
     for path in sorted(paths):
+        if (path in errors):
+            raise ValueError(f"Failed to read test case '{path}': {errors[path]}")
+
         basename = os.path.splitext(os.path.basename(path))[0]
         if (hasattr(target_class, 'get_test_basename')):
             basename = getattr(target_class, 'get_test_basename')(path)
@@ -457,7 +476,7 @@ def add_test_paths(target_class: type, data_dir: str, paths: typing.List[str],
         test_name = 'test_cli__' + basename
 
         try:
-            test_method = _get_test_method(test_name, path, data_dir)
+            test_method = _get_test_method(test_name, path, data_dir, text = typing.cast(str, texts[path]))
         except Exception as ex:
             raise ValueError(f"Failed to parse test case '{path}'.") from ex
 
@@ -470,7 +489,7 @@ def discover_test_cases(target_class: type, test_cases_dir: str, data_dir: str,
         test_method_wrapper: typing.Union[TestMethodWrapperFunction, None] = None) -> None:
     """ Look in the text cases directory for any test cases and add them as test methods to the test class. """
 
-    paths = list(sorted(glob.glob(os.path.join(test_cases_dir, "**", "*.txt"), recursive = True)))
+    paths = edq.util.dirent.walk_files(test_cases_dir, extensions = '.txt')
     add_test_paths(target_class, data_dir, paths, test_method_wrapper = test_method_wrapper)
 
 def setup_teardown_copy(
@@ -482,8 +501,15 @@ def setup_teardown_copy(
 
     Will read copy operands from the list `test_info.extra_options['copy']` as two-item tuples (source, dest).
     Paths should be absolute or relative to the test's work dir and use POSIX-style path separators.
+
+    The copy mode (see edq.util.dirent.COPY_MODES) can be set with `test_info.extra_options['copy_mode']`
+    and defaults to DEFAULT_COPY_MODE.
+    Tests may use hardlinks if they only modify their copied data through the edq.util.dirent write helpers
+    (or call edq.util.dirent.break_link() before any other in-place write), see edq.util.dirent.COPY_MODE_HARDLINK.
     """
 
+    mode = test_info.extra_options.get('copy_mode', DEFAULT_COPY_MODE)
+
     for (source, dest) in test_info.extra_options.get('copy', []):
         source = test_info._process_text(source)
         dest = test_info._process_text(dest)
@@ -496,7 +522,7 @@ def setup_teardown_copy(
         if (not os.path.isabs(dest)):
             dest = os.path.join(test_info.work_dir, dest)
 
-        edq.util.dirent.copy(source, dest)
+        edq.util.dirent.copy(source, dest, mode = mode)
 
 def create_directory_structure(
         test: edq.testing.unittest.BaseTest,
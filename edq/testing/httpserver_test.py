@@ -1,9 +1,12 @@
 import os
+import time
 import typing
 
 import edq.net.exchange
 import edq.net.exchangeserver
 import edq.testing.httpserver
+import edq.util.dirent
+import edq.util.json
 
 THIS_DIR: str = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
 TEST_EXCHANGES_DIR: str = os.path.join(THIS_DIR, "testdata", "http", 'exchanges')
@@ -434,3 +437,96 @@ class HTTPTestServerTest(edq.testing.httpserver.HTTPServerTest):
                     self.assertIn(hint_substring, hint, 'Hint is not as expected.')
                 elif (hint_substring is not None):
                     self.fail(f"Did not get expected hint: '{hint_substring}'.")
+
+    def test_exchange_hot_reload(self) -> None:
+        """ Test that a watched exchange dir reloads changed exchange files. """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = 'edq_test_exchange_reload_')
+        edq.util.dirent.copy(os.path.join(TEST_EXCHANGES_DIR, 'simple.httpex.json'), os.path.join(temp_dir, 'simple.httpex.json'))
+
+        server = edq.net.exchangeserver.HTTPExchangeServer()
+        server.load_exchanges_dir(temp_dir, watch = True)
+
+        query = edq.net.exchange.HTTPExchange(method = 'GET', url = 'simple')
+        new_query = edq.net.exchange.HTTPExchange(method = 'GET', url = 'new')
+
+        # [(path, exchange data (None to delete), query, expected body (None for no match)), ...]
+        test_cases: typing.List[typing.Tuple[
+            str,
+            typing.Union[typing.Dict[str, typing.Any], None],
+            edq.net.exchange.HTTPExchange,
+            typing.Union[str, None],
+        ]] = [
+            # Modify
+            ('simple.httpex.json', {'method': 'GET', 'url': 'simple', 'response_body': 'modified'}, query, 'modified'),
+
+            # Create
+            (os.path.join('nested', 'new.httpex.json'), {'method': 'GET', 'url': 'new', 'response_body': 'new'}, new_query, 'new'),
+
+            # Delete
+            ('simple.httpex.json', None, query, None),
+        ]
+
+        try:
+            self.assertEqual('simple', self._wait_for_body(server, query, 'simple'))
+
+            for (i, test_case) in enumerate(test_cases):
+                (relpath, data, test_query, expected_body) = test_case
+
+                with self.subTest(msg = f"Case {i} ('{relpath}'):"):
+                    path = os.path.join(temp_dir, relpath)
+                    if (data is None):
+                        edq.util.dirent.remove(path)
+                    else:
+                        edq.util.dirent.mkdir(os.path.dirname(path))
+                        edq.util.json.dump_path(data, path)
+
+                    self.assertEqual(expected_body, self._wait_for_body(server, test_query, expected_body))
+        finally:
+            server.stop()
+
+    def test_exchange_file_reload(self) -> None:
+        """ Test that loading an exchange file again replaces its exchanges (instead of duplicating them). """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = 'edq_test_exchange_file_reload_')
+        path = os.path.join(temp_dir, 'simple.httpex.json')
+        edq.util.json.dump_path({'method': 'GET', 'url': 'simple', 'response_body': 'old'}, path)
+
+        server = edq.net.exchangeserver.HTTPExchangeServer()
+        server.load_exchange_file(path)
+
+        edq.util.json.dump_path({'method': 'GET', 'url': 'simple', 'response_body': 'new'}, path)
+        server.load_exchange_file(path)
+        server.load_exchange_file(path)
+
+        exchange, hint = server.lookup_exchange(edq.net.exchange.HTTPExchange(method = 'GET', url = 'simple'))
+        self.assertIsNone(hint)
+        self.assertIsNotNone(exchange)
+        self.assertEqual('new', typing.cast(edq.net.exchange.HTTPExchange, exchange).response_body)
+
+        server.unload_exchange_file(path)
+
+        exchange, _ = server.lookup_exchange(edq.net.exchange.HTTPExchange(method = 'GET', url = 'simple'))
+        self.assertIsNone(exchange)
+
+    def _wait_for_body(self,
+            server: edq.net.exchangeserver.HTTPExchangeServer,
+            query: edq.net.exchange.HTTPExchange,
+            expected_body: typing.Union[str, None],
+            ) -> typing.Union[str, None]:
+        """ Wait for a lookup to give the expected response body (or give up and return the last body). """
+
+        body = None
+        for _ in range(100):
+            exchange, _ = server.lookup_exchange(query)
+
+            body = None
+            if (exchange is not None):
+                body = exchange.response_body
+
+            if (body == expected_body):
+                break
+
+            time.sleep(0.05)
+
+        return body
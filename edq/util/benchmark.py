@@ -0,0 +1,255 @@
+"""
+Utilities for simple (micro)benchmarks.
+
+A benchmark is just a named callable that is repeatedly called.
+Each benchmark reports its throughput (operations per second)
+and its memory behavior (as measured by tracemalloc).
+Results can be saved to (and compared against) a baseline JSON file.
+"""
+
+import gc
+import time
+import tracemalloc
+import typing
+
+import edq.util.json
+import edq.util.serial
+
+DEFAULT_MIN_TIME_SECS: float = 1.0
+""" The default minimum amount of time to spend running each benchmark. """
+
+DEFAULT_MIN_ITERATIONS: int = 3
+""" The default minimum number of times to run each benchmark. """
+
+DEFAULT_REGRESSION_THRESHOLD: float = 0.10
+""" The default fraction that throughput can drop (compared to a baseline) before being considered a regression. """
+
+class BenchmarkResult(edq.util.serial.DictConverter):
+    """ The results of running a single benchmark. """
+
+    def __init__(self,
+            name: str = '',
+            iterations: int = 0,
+            total_secs: float = 0.0,
+            retained_blocks: typing.Union[int, None] = None,
+            peak_bytes: typing.Union[int, None] = None,
+            **kwargs: typing.Any) -> None:
+        self.name: str = name
+        """ The name of the benchmark. """
+
+        self.iterations: int = iterations
+        """ The number of times the benchmark was run (while being timed). """
+
+        self.total_secs: float = total_secs
+        """ The total time (in seconds) spent running all iterations. """
+
+        self.retained_blocks: typing.Union[int, None] = retained_blocks
+        """
+        The number of new memory blocks still alive after a single run of the benchmark (including the benchmark's result).
+        Note that this is not the total number of allocations made during the run,
+        since blocks that were allocated and then freed are not counted.
+        None if allocations were not measured.
+        """
+
+        self.peak_bytes: typing.Union[int, None] = peak_bytes
+        """
+        The peak amount of traced memory (in bytes) used during a single run of the benchmark.
+        None if allocations were not measured.
+        """
+
+    def ops_per_sec(self) -> float:
+        """ Get the throughput of this benchmark. """
+
+        if (self.total_secs <= 0.0):
+            return 0.0
+
+        return self.iterations / self.total_secs
+
+class BenchmarkComparison(edq.util.serial.DictConverter):
+    """ A comparison of a benchmark result against a baseline result. """
+
+    def __init__(self,
+            name: str = '',
+            ops_per_sec: float = 0.0,
+            baseline_ops_per_sec: typing.Union[float, None] = None,
+            regression: bool = False,
+            **kwargs: typing.Any) -> None:
+        self.name: str = name
+        """ The name of the benchmark. """
+
+        self.ops_per_sec: float = ops_per_sec
+        """ The current throughput. """
+
+        self.baseline_ops_per_sec: typing.Union[float, None] = baseline_ops_per_sec
+        """ The baseline throughput, or None if this benchmark is not in the baseline. """
+
+        self.regression: bool = regression
+        """ Whether this benchmark has regressed past the allowed threshold. """
+
+    def ratio(self) -> typing.Union[float, None]:
+        """ Get the ratio of the current throughput to the baseline throughput (higher is better). """
+
+        if ((self.baseline_ops_per_sec is None) or (self.baseline_ops_per_sec <= 0.0)):
+            return None
+
+        return self.ops_per_sec / self.baseline_ops_per_sec
+
+def run_benchmark(
+        name: str,
+        function: typing.Callable[[], typing.Any],
+        min_time_secs: float = DEFAULT_MIN_TIME_SECS,
+        min_iterations: int = DEFAULT_MIN_ITERATIONS,
+        measure_allocations: bool = True,
+        ) -> BenchmarkResult:
+    """
+    Run a benchmark until both the minimum time and number of iterations have been reached.
+
+    Timing and allocation measurements are done in separate runs,
+    since tracing allocations has a large impact on performance.
+    """
+
+    # Warm up (populate any caches).
+    function()
+
+    retained_blocks = None
+    peak_bytes = None
+    if (measure_allocations):
+        retained_blocks, peak_bytes = _measure_allocations(function)
+
+    iterations = 0
+    total_secs = 0.0
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        while ((iterations < min_iterations) or (total_secs < min_time_secs)):
+            start_time = time.perf_counter()
+            function()
+            total_secs += (time.perf_counter() - start_time)
+            iterations += 1
+    finally:
+        if (gc_enabled):
+            gc.enable()
+
+    return BenchmarkResult(name, iterations, total_secs, retained_blocks, peak_bytes)
+
+def _measure_allocations(function: typing.Callable[[], typing.Any]) -> typing.Tuple[int, int]:
+    """ Measure the retained blocks and peak memory of a single call. """
+
+    already_tracing = tracemalloc.is_tracing()
+    if (not already_tracing):
+        tracemalloc.start()
+
+    try:
+        gc.collect()
+
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes, _ = tracemalloc.get_traced_memory()
+
+        # Keep the result alive so its blocks are counted.
+        result = function()
+
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if (not already_tracing):
+            tracemalloc.stop()
+
+    del result
+
+    retained_blocks = sum(max(0, stat.count_diff) for stat in after.compare_to(before, 'lineno'))
+
+    return retained_blocks, max(0, peak_bytes - start_bytes)
+
+def compare(
+        results: typing.List[BenchmarkResult],
+        baseline: typing.List[BenchmarkResult],
+        threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+        ) -> typing.List[BenchmarkComparison]:
+    """
+    Compare results against a baseline.
+    A benchmark is considered a regression if its throughput drops by more than the threshold (a fraction of the baseline).
+    """
+
+    baseline_ops = {result.name: result.ops_per_sec() for result in baseline}
+
+    comparisons = []
+    for result in results:
+        ops_per_sec = result.ops_per_sec()
+        baseline_ops_per_sec = baseline_ops.get(result.name, None)
+
+        regression = False
+        if (baseline_ops_per_sec is not None):
+            regression = (ops_per_sec < (baseline_ops_per_sec * (1.0 - threshold)))
+
+        comparisons.append(BenchmarkComparison(result.name, ops_per_sec, baseline_ops_per_sec, regression))
+
+    return comparisons
+
+def load_baseline(path: str) -> typing.List[BenchmarkResult]:
+    """ Load benchmark results from a JSON file (see save_baseline()). """
+
+    data = edq.util.json.load_path(path)
+    if (not isinstance(data, list)):
+        raise ValueError(f"Benchmark baseline should be a JSON list, found '{type(data)}': '{path}'.")
+
+    return [BenchmarkResult.from_dict(item) for item in data]
+
+def save_baseline(results: typing.List[BenchmarkResult], path: str) -> None:
+    """ Save benchmark results to a JSON file. """
+
+    edq.util.json.dump_path([result.to_dict() for result in results], path, indent = 4)
+
+def format_results(
+        results: typing.List[BenchmarkResult],
+        comparisons: typing.Union[typing.List[BenchmarkComparison], None] = None,
+        ) -> str:
+    """ Format benchmark results (and optional comparisons) as a human-readable table. """
+
+    headers = ['Name', 'Ops/Sec', 'Iterations', 'Retained Blocks', 'Peak Bytes']
+    if (comparisons is not None):
+        headers += ['Baseline Ops/Sec', 'Ratio', 'Status']
+
+    rows = [headers]
+    for (i, result) in enumerate(results):
+        row = [
+            result.name,
+            f"{result.ops_per_sec():.1f}",
+            str(result.iterations),
+            _format_optional(result.retained_blocks),
+            _format_optional(result.peak_bytes),
+        ]
+
+        if (comparisons is not None):
+            comparison = comparisons[i]
+            ratio = comparison.ratio()
+
+            status = 'new'
+            if (ratio is not None):
+                status = 'REGRESSION' if comparison.regression else 'ok'
+
+            row += [
+                _format_optional(comparison.baseline_ops_per_sec, '.1f'),
+                _format_optional(ratio, '.2f'),
+                status,
+            ]
+
+        rows.append(row)
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(headers))]
+
+    lines = []
+    for row in rows:
+        lines.append('  '.join(value.ljust(width) for (value, width) in zip(row, widths)).rstrip())
+
+    return "\n".join(lines)
+
+def _format_optional(value: typing.Union[int, float, None], format_spec: str = '') -> str:
+    """ Format a value that may be missing. """
+
+    if (value is None):
+        return '-'
+
+    return format(value, format_spec)
@@ -0,0 +1,65 @@
+import os
+
+import edq.testing.unittest
+import edq.util.benchmark
+import edq.util.dirent
+
+class TestBenchmark(edq.testing.unittest.BaseTest):
+    """ Test benchmark utils. """
+
+    def test_run_benchmark_base(self) -> None:
+        """ Test running a simple benchmark. """
+
+        result = edq.util.benchmark.run_benchmark('test', lambda: [0] * 100, min_time_secs = 0.0, min_iterations = 5)
+
+        self.assertEqual('test', result.name)
+        self.assertEqual(5, result.iterations)
+        self.assertGreater(result.ops_per_sec(), 0.0)
+
+        assert result.retained_blocks is not None
+        assert result.peak_bytes is not None
+        self.assertGreater(result.retained_blocks, 0)
+        self.assertGreater(result.peak_bytes, 0)
+
+        result = edq.util.benchmark.run_benchmark('test', lambda: None, min_time_secs = 0.0, min_iterations = 1, measure_allocations = False)
+        self.assertIsNone(result.retained_blocks)
+        self.assertIsNone(result.peak_bytes)
+
+    def test_compare_base(self) -> None:
+        """ Test comparing results against a baseline. """
+
+        baseline = [
+            edq.util.benchmark.BenchmarkResult('a', 100, 1.0),
+            edq.util.benchmark.BenchmarkResult('b', 100, 1.0),
+            edq.util.benchmark.BenchmarkResult('c', 100, 1.0),
+        ]
+
+        results = [
+            edq.util.benchmark.BenchmarkResult('a', 95, 1.0),
+            edq.util.benchmark.BenchmarkResult('b', 50, 1.0),
+            edq.util.benchmark.BenchmarkResult('c', 200, 1.0),
+            edq.util.benchmark.BenchmarkResult('d', 100, 1.0),
+        ]
+
+        comparisons = edq.util.benchmark.compare(results, baseline, threshold = 0.10)
+
+        self.assertEqual([False, True, False, False], [comparison.regression for comparison in comparisons])
+        self.assertEqual([0.95, 0.5, 2.0, None], [comparison.ratio() for comparison in comparisons])
+
+        text = edq.util.benchmark.format_results(results, comparisons)
+        self.assertIn('REGRESSION', text)
+        self.assertEqual(5, len(text.splitlines()))
+
+    def test_save_load_baseline(self) -> None:
+        """ Test round-tripping results through a baseline file. """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = 'edq_test_benchmark_')
+        path = os.path.join(temp_dir, 'baseline.json')
+
+        results = [
+            edq.util.benchmark.BenchmarkResult('a', 10, 0.5, 3, 1024),
+            edq.util.benchmark.BenchmarkResult('b', 20, 1.5),
+        ]
+
+        edq.util.benchmark.save_baseline(results, path)
+        self.assertEqual(results, edq.util.benchmark.load_baseline(path))
@@ -19,6 +19,7 @@ class SerializationContext:
             key: typing.Union[str, None] = None,
             json_options: typing.Union[typing.Dict[str, typing.Any], None] = None,
             extra: typing.Union[typing.Dict[str, typing.Any], None] = None,
+            allow_bytes: bool = False,
             **kwargs: typing.Any) -> None:
         if (base_dir is None):
             base_dir = '.'
@@ -44,6 +45,12 @@ class SerializationContext:
         self.json_options: typing.Dict[str, typing.Any] = json_options
         """ Options to pass to JSON functions. """
 
+        self.allow_bytes: bool = allow_bytes
+        """
+        Whether raw bytes may be left as-is when converting to POD types.
+        This is set when the target format (e.g., MessagePack) can natively represent bytes.
+        """
+
         if (extra is None):
             extra = {}
         else:
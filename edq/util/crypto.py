@@ -1,15 +1,24 @@
+import collections
+import concurrent.futures
 import enum
 import hashlib
+import hmac
+import itertools
 import logging
 import os
+import struct
+import threading
 import typing
 
+import cryptography.exceptions
 import cryptography.hazmat.primitives
 import cryptography.hazmat.primitives.ciphers
+import cryptography.hazmat.primitives.ciphers.aead
 import cryptography.hazmat.primitives.padding
 
 import edq.core.errors
 import edq.util.constants
+import edq.util.dirent
 import edq.util.encoding
 import edq.util.enum
 import edq.util.serial
@@ -34,6 +43,9 @@ SALT_LENGTH_BYTES: int = 16
 IV_LENGTH_BYTES: int = 16
 """ The length for generated IVs (before key derivation). """
 
+GCM_NONCE_LENGTH_BYTES: int = 12
+""" The length for generated AES-GCM nonces (the standard, and most efficient, length for GCM). """
+
 AES_BLOCK_SIZE_BYTES: int = 16
 """ AES always uses 128-bit blocks. """
 
@@ -43,32 +55,124 @@ SECRET_PREFIX: str = '__edq_secret__'
 SECRET_DELIM: str = '::'
 """ The delimiter for the components of an encrypted secret. """
 
+DERIVED_KEY_CACHE_SIZE: int = 256
+""" The max number of derived keys to keep in the derived key cache (see _derive_aes_key()). """
+
+_GCM_ASSOCIATED_DATA: bytes = (SECRET_PREFIX + SECRET_DELIM + 'AES256GCMv1').encode(edq.util.constants.DEFAULT_ENCODING)
+""" Associated (authenticated, but not encrypted) data for AES256-GCM secrets, binding the ciphertext to its method. """
+
+FILE_MAGIC: bytes = b'EDQE'
+""" The bytes that every encrypted file starts with (see encrypt_stream()). """
+
+FILE_FORMAT_VERSION: int = 1
+""" The current version of the encrypted file format. """
+
+FILE_NONCE_PREFIX_LENGTH_BYTES: int = 7
+"""
+The length of the random nonce prefix stored in an encrypted file's header.
+Each chunk's (12 byte) nonce is this prefix, a 4 byte chunk counter, and a 1 byte final chunk flag.
+"""
+
+FILE_TAG_LENGTH_BYTES: int = 16
+""" The length of the authentication tag appended to each encrypted chunk. """
+
+DEFAULT_FILE_CHUNK_SIZE_BYTES: int = 2 ** 16
+""" The default amount of cleartext in each encrypted chunk. """
+
+MAX_FILE_CHUNK_SIZE_BYTES: int = 2 ** 24
+""" The max allowed chunk size (limits the memory used when reading untrusted files). """
+
+_FILE_HEADER_FORMAT: str = f">{len(FILE_MAGIC)}sBI{SALT_LENGTH_BYTES}s{FILE_NONCE_PREFIX_LENGTH_BYTES}s"
+""" The struct format for an encrypted file header: magic, version, chunk size, salt, nonce prefix. """
+
+_FILE_HEADER_LENGTH_BYTES: int = struct.calcsize(_FILE_HEADER_FORMAT)
+""" The length of an encrypted file header. """
+
+PARALLEL_MIN_DERIVATIONS: int = 32
+"""
+The minimum number of key derivations needed to use a process pool in encrypt_many()/decrypt_many().
+Smaller batches are derived serially, since starting a pool costs more than it saves.
+"""
+
+_derived_key_cache: 'collections.OrderedDict[typing.Tuple[bytes, bytes, int, int, int, int], bytearray]' = collections.OrderedDict()
+"""
+Recently derived keys (in LRU order): {(key fingerprint, salt, iterations, block size, parallelization, length): derived key, ...}.
+Derived keys are stored in mutable buffers so they can be zeroed when evicted.
+"""
+
+_derived_key_cache_lock: threading.Lock = threading.Lock()
+""" A lock protecting _derived_key_cache. """
+
+_derived_key_cache_enabled: bool = True  # pylint: disable=invalid-name
+""" Whether derived keys should be cached (see set_derived_key_cache_enabled()). """
+
+_FINGERPRINT_KEY: bytes = os.urandom(32)
+"""
+A random (per-process) key used to fingerprint keys for the derived key cache.
+This ensures that cache keys cannot be used to check guesses of a key outside of this process.
+"""
+
 class EncryptionMethod(enum.Enum):
     """ Supported encryption methods. """
 
     AES256v1 = 'AES256v1'  # pylint: disable=invalid-name
+    """ AES256-CBC with PKCS7 padding. Both the key and IV are derived with scrypt. """
+
+    AES256GCMv1 = 'AES256GCMv1'  # pylint: disable=invalid-name
+    """
+    AES256-GCM (authenticated encryption).
+    The key is derived with scrypt and the random nonce is stored (in place of an IV).
+    Tampered secrets (or secrets read with the wrong key) are detected when decrypting.
+    """
 
 class Secret(edq.util.serial.PODConverter):
     """
     Secrets represent data that should be protected on disk.
     This type can be configured to always be serialized in an encrypted form.
+
+    Secrets can also be lazy (see parse()),
+    where the ciphertext is kept and only decrypted the first time the cleartext is accessed.
     """
 
+    serialization_skip_fields = {
+        '_ciphertext_b64',
+        '_key',
+    }
+
     def __init__(self,
-            cleartext: str,
+            cleartext: typing.Union[str, None],
             iv_b64: typing.Union[str, None] = None,
             salt_b64: typing.Union[str, None] = None,
             encryption_method: EncryptionMethod = EncryptionMethod.AES256v1,
             write_encrypted: typing.Union[bool, None] = None,
+            ciphertext_b64: typing.Union[str, None] = None,
+            key: typing.Union[str, None] = None,
             ) -> None:
-        self.cleartext: str = cleartext
-        """ The contexts of the secret. """
+        if ((cleartext is None) and ((ciphertext_b64 is None) or (key is None) or (salt_b64 is None) or (iv_b64 is None))):
+            raise ValueError("Secrets without cleartext require a ciphertext, key, IV, and salt (to decrypt lazily).")
+
+        self._cleartext: typing.Union[str, None] = cleartext
+        """
+        The contents of the secret (see the `cleartext` property).
+        None if this is a lazy secret that has not been decrypted yet.
+        """
+
+        self._ciphertext_b64: typing.Union[str, None] = None
+        """ The ciphertext to decrypt on first access (lazy secrets only). Cleared once decrypted. """
+
+        self._key: typing.Union[str, None] = None
+        """ The key to decrypt with on first access (lazy secrets only). Cleared once decrypted. """
+
+        if (cleartext is None):
+            self._ciphertext_b64 = ciphertext_b64
+            self._key = key
 
         self.iv_b64: typing.Union[str, None] = iv_b64
         """
-        The base64 of the iv to use during encryption.
+        The base64 of the iv (or nonce, for AEAD methods) to use during encryption.
         May be none is this secret has not been encrypted yet,
         will be set during the first encryption.
+        AEAD methods ignore any existing nonce and set a fresh one on every encryption.
         """
 
         self.salt_b64: typing.Union[str, None] = salt_b64
@@ -100,6 +204,32 @@ class Secret(edq.util.serial.PODConverter):
 
         return (self.salt_b64 is not None)
 
+    def is_decrypted(self) -> bool:
+        """ Check if this secret's cleartext is available (i.e., it is not a lazy secret still waiting to be decrypted). """
+
+        return (self._cleartext is not None)
+
+    @property
+    def cleartext(self) -> str:
+        """
+        The contents of the secret.
+        Lazy secrets will be decrypted (and the result kept) on first access,
+        so decryption errors (e.g., a wrong key) are raised here.
+        """
+
+        if (self._cleartext is None):
+            self._cleartext = _decrypt(self.encryption_method, str(self._key), str(self.iv_b64), str(self.salt_b64), str(self._ciphertext_b64))
+            self._ciphertext_b64 = None
+            self._key = None
+
+        return self._cleartext
+
+    @cleartext.setter
+    def cleartext(self, cleartext: str) -> None:
+        self._cleartext = cleartext
+        self._ciphertext_b64 = None
+        self._key = None
+
     def __repr__(self) -> str:
         return self.cleartext
 
@@ -108,6 +238,9 @@ class Secret(edq.util.serial.PODConverter):
         if (not isinstance(other, Secret)):
             return False
 
+        # Make sure any lazy secrets are decrypted before comparing.
+        _ = (self.cleartext, other.cleartext)
+
         context = edq.util.serial.SerializationContext()
         return bool(super().to_pod(context) == super(edq.util.serial.PODConverter, other).to_pod(context))  # type: ignore[attr-defined,unused-ignore]
 
@@ -115,19 +248,29 @@ class Secret(edq.util.serial.PODConverter):
         """
         Get the full delimited and encrypted representation for this secret.
         If the IV and/or salt has not been set, this call will set them.
+
+        AEAD methods (AES256GCMv1) always generate (and set) a new random nonce,
+        since reusing a nonce with the same key for a different cleartext breaks GCM.
         """
 
         if (self.encryption_method == EncryptionMethod.AES256v1):
             ciphertext, self.iv_b64, self.salt_b64 = aes256_encrypt(key, self.cleartext, self.iv_b64, self.salt_b64)
+        elif (self.encryption_method == EncryptionMethod.AES256GCMv1):
+            ciphertext, self.iv_b64, self.salt_b64 = aes256gcm_encrypt(key, self.cleartext, None, self.salt_b64)
         else:
             raise edq.core.errors.SerializationError(f"Secret has an unsupported encryption method: '{self.encryption_method}'.")
 
+        return self._format_encrypted(ciphertext)
+
+    def _format_encrypted(self, ciphertext_b64: str) -> str:
+        """ Get the full delimited representation for this secret given its (already computed) ciphertext. """
+
         parts: typing.List[str] = [
             SECRET_PREFIX,
             self.encryption_method.value,
-            self.iv_b64,
-            self.salt_b64,
-            ciphertext,
+            str(self.iv_b64),
+            str(self.salt_b64),
+            ciphertext_b64,
         ]
 
         return SECRET_DELIM.join(parts)
@@ -144,40 +287,33 @@ class Secret(edq.util.serial.PODConverter):
         if (context.key is None):
             raise edq.core.errors.SerializationError("No key provided for writing an encrypted secret.")
 
+        # A lazy secret being written with its original key can just use its original ciphertext
+        # (a lazy secret's cleartext has not been accessed, so it cannot have been changed (see the cleartext setter)).
+        if ((self._cleartext is None) and (self._key == context.key)):
+            return self._format_encrypted(str(self._ciphertext_b64))
+
         return self.encrypt(context.key)
 
     @classmethod
-    def parse(cls, text: str, key: typing.Union[str, None] = None) -> 'Secret':
+    def parse(cls, text: str, key: typing.Union[str, None] = None, lazy: bool = False) -> 'Secret':
         """
         Parse a secret from text.
         A key is required if the text is encrypted.
-        """
-
-        text = text.strip()
 
-        # Check for only cleartext.
-        if (not text.startswith(SECRET_PREFIX)):
-            return Secret(text)
-
-        if (key is None):
-            raise edq.core.errors.SerializationError("No key provided for reading an encrypted secret.")
-
-        parts = text.split(SECRET_DELIM)
-        if (len(parts) != 5):
-            raise edq.core.errors.SerializationError(f"Secret has an unexpected number of parts, expecting 5 and found {len(parts)}: '{text}'.")
+        If `lazy` is true, then an encrypted secret will only have its format checked here
+        and will be decrypted the first time its cleartext is accessed.
+        """
 
-        (_, raw_method, iv_b64, salt_b64, ciphertext_b64) = parts
+        parts = _split_secret(text, key)
+        if (parts is None):
+            return Secret(text.strip())
 
-        if (not edq.util.enum.has_value(EncryptionMethod, raw_method)):
-            raise edq.core.errors.SerializationError(f"Secret has an unknown encryption method: '{raw_method}'.")
+        (encryption_method, iv_b64, salt_b64, ciphertext_b64) = parts
 
-        encryption_method = EncryptionMethod(raw_method)
-
-        if (encryption_method == EncryptionMethod.AES256v1):
-            cleartext = aes256_decrypt(key, iv_b64, salt_b64, ciphertext_b64)
-        else:
-            raise edq.core.errors.SerializationError(f"Secret has an unsupported encryption method: '{encryption_method}'.")
+        if (lazy):
+            return Secret(None, iv_b64, salt_b64, encryption_method, ciphertext_b64 = ciphertext_b64, key = key)
 
+        cleartext = _decrypt(encryption_method, str(key), iv_b64, salt_b64, ciphertext_b64)
         return Secret(cleartext, iv_b64, salt_b64, encryption_method)
 
     @classmethod
@@ -185,6 +321,10 @@ class Secret(edq.util.serial.PODConverter):
             data: edq.util.serial.PODType,
             context: typing.Union[edq.util.serial.SerializationContext, None] = None,
             ) -> 'Secret':
+        # Secrets may have already been parsed (e.g., in bulk with decrypt_many()).
+        if (isinstance(data, Secret)):
+            return data
+
         if (not isinstance(data, str)):
             raise edq.core.errors.SerializationError(f"Secrets should be deserialized from a string, found a '{type(data)}' ({data}).")
 
@@ -193,6 +333,23 @@ class Secret(edq.util.serial.PODConverter):
 
         return cls.parse(str(data), context.key)
 
+def _decrypt(
+        encryption_method: EncryptionMethod,
+        key: str,
+        iv_b64: str,
+        salt_b64: str,
+        ciphertext_b64: str,
+        ) -> str:
+    """ Decrypt the components of a secret with the given method. """
+
+    if (encryption_method == EncryptionMethod.AES256v1):
+        return aes256_decrypt(key, iv_b64, salt_b64, ciphertext_b64)
+
+    if (encryption_method == EncryptionMethod.AES256GCMv1):
+        return aes256gcm_decrypt(key, iv_b64, salt_b64, ciphertext_b64)
+
+    raise edq.core.errors.SerializationError(f"Secret has an unsupported encryption method: '{encryption_method}'.")
+
 def aes256_encrypt(
         key: str,
         cleartext: str,
@@ -206,10 +363,24 @@ def aes256_encrypt(
     If the IV and/or salt are passed in, the same values will be passed back.
     """
 
-    # Resolve optional fields.
+    (iv_bytes, salt_bytes) = _resolve_iv_salt(iv_b64, salt_b64, encoding)
+
+    # Derive fixed-sized keys from the key (32 bytes) and IV (16 bytes).
+    aes_key = _derive_aes_key(key.encode(encoding), salt_bytes, 32)
+    aes_iv = _derive_aes_key(iv_bytes, salt_bytes, AES_BLOCK_SIZE_BYTES)
+
+    return _aes256_encrypt_derived(aes_key, aes_iv, cleartext, iv_bytes, salt_bytes, encoding)
+
+def _resolve_iv_salt(
+        iv_b64: typing.Union[str, None],
+        salt_b64: typing.Union[str, None],
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        iv_length: int = IV_LENGTH_BYTES,
+        ) -> typing.Tuple[bytes, bytes]:
+    """ Decode an IV and salt, generating any that are missing. """
 
     if (iv_b64 is None):
-        iv_bytes = os.urandom(IV_LENGTH_BYTES)
+        iv_bytes = os.urandom(iv_length)
     else:
         iv_bytes = edq.util.encoding.from_base64(iv_b64, encoding = encoding)
 
@@ -218,9 +389,17 @@ def aes256_encrypt(
     else:
         salt_bytes = edq.util.encoding.from_base64(salt_b64, encoding = encoding)
 
-    # Derive fixed-sized keys from the key (32 bytes) and IV (16 bytes).
-    aes_key = _derive_aes_key(key.encode(encoding), salt_bytes, 32)
-    aes_iv = _derive_aes_key(iv_bytes, salt_bytes, AES_BLOCK_SIZE_BYTES)
+    return (iv_bytes, salt_bytes)
+
+def _aes256_encrypt_derived(
+        aes_key: bytes,
+        aes_iv: bytes,
+        cleartext: str,
+        iv_bytes: bytes,
+        salt_bytes: bytes,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> typing.Tuple[str, str, str]:
+    """ Perform AES256-CBC encryption using already derived keys (see aes256_encrypt()). """
 
     # Convert the cleartext to bytes and pad for a 256 block size.
     cleartext_bytes = cleartext.encode(encoding)
@@ -256,12 +435,23 @@ def aes256_decrypt(
     # Get the input data as bytes.
     iv_bytes = edq.util.encoding.from_base64(iv_b64, encoding = encoding)
     salt_bytes = edq.util.encoding.from_base64(salt_b64, encoding = encoding)
-    ciphertext_bytes = edq.util.encoding.from_base64(ciphertext_b64, encoding = encoding)
 
     # Derive fixed-sized keys from the key (32 bytes) and IV (16 bytes).
     aes_key = _derive_aes_key(key.encode(encoding), salt_bytes, 32)
     aes_iv = _derive_aes_key(iv_bytes, salt_bytes, AES_BLOCK_SIZE_BYTES)
 
+    return _aes256_decrypt_derived(aes_key, aes_iv, ciphertext_b64, encoding)
+
+def _aes256_decrypt_derived(
+        aes_key: bytes,
+        aes_iv: bytes,
+        ciphertext_b64: str,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> str:
+    """ Perform AES256-CBC decryption using already derived keys (see aes256_decrypt()). """
+
+    ciphertext_bytes = edq.util.encoding.from_base64(ciphertext_b64, encoding = encoding)
+
     # Decrypt the data.
     cipher = cryptography.hazmat.primitives.ciphers.Cipher(
         cryptography.hazmat.primitives.ciphers.algorithms.AES(aes_key),
@@ -282,14 +472,523 @@ def aes256_decrypt(
 
     return cleartext
 
+def aes256gcm_encrypt(
+        key: str,
+        cleartext: str,
+        nonce_b64: typing.Union[str, None] = None,
+        salt_b64: typing.Union[str, None] = None,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> typing.Tuple[str, str, str]:
+    """
+    Perform AES256-GCM (authenticated) encryption.
+    Returns the base64 encoding of the ciphertext (with the authentication tag), nonce, and salt.
+    If the nonce and/or salt are passed in, the same values will be passed back.
+
+    A nonce must never be reused (with the same key and salt) for different cleartexts,
+    so passing in a nonce is only safe when re-encrypting the same cleartext.
+    """
+
+    (nonce_bytes, salt_bytes) = _resolve_iv_salt(nonce_b64, salt_b64, encoding, iv_length = GCM_NONCE_LENGTH_BYTES)
+    aes_key = _derive_aes_key(key.encode(encoding), salt_bytes, 32)
+
+    return _aes256gcm_encrypt_derived(aes_key, cleartext, nonce_bytes, salt_bytes, encoding)
+
+def _aes256gcm_encrypt_derived(
+        aes_key: bytes,
+        cleartext: str,
+        nonce_bytes: bytes,
+        salt_bytes: bytes,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> typing.Tuple[str, str, str]:
+    """ Perform AES256-GCM encryption using an already derived key (see aes256gcm_encrypt()). """
+
+    aead = cryptography.hazmat.primitives.ciphers.aead.AESGCM(aes_key)
+    ciphertext_bytes = aead.encrypt(nonce_bytes, cleartext.encode(encoding), _GCM_ASSOCIATED_DATA)
+
+    ciphertext_b64 = edq.util.encoding.to_base64(ciphertext_bytes)
+    nonce_b64 = edq.util.encoding.to_base64(nonce_bytes)
+    salt_b64 = edq.util.encoding.to_base64(salt_bytes)
+
+    return (ciphertext_b64, nonce_b64, salt_b64)
+
+def aes256gcm_decrypt(
+        key: str,
+        nonce_b64: str,
+        salt_b64: str,
+        ciphertext_b64: str,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> str:
+    """
+    Perform AES256-GCM (authenticated) decryption.
+    Raises an error if the key is wrong or the data has been modified.
+    """
+
+    salt_bytes = edq.util.encoding.from_base64(salt_b64, encoding = encoding)
+    aes_key = _derive_aes_key(key.encode(encoding), salt_bytes, 32)
+
+    return _aes256gcm_decrypt_derived(aes_key, nonce_b64, ciphertext_b64, encoding)
+
+def _aes256gcm_decrypt_derived(
+        aes_key: bytes,
+        nonce_b64: str,
+        ciphertext_b64: str,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> str:
+    """ Perform AES256-GCM decryption using an already derived key (see aes256gcm_decrypt()). """
+
+    nonce_bytes = edq.util.encoding.from_base64(nonce_b64, encoding = encoding)
+    ciphertext_bytes = edq.util.encoding.from_base64(ciphertext_b64, encoding = encoding)
+
+    aead = cryptography.hazmat.primitives.ciphers.aead.AESGCM(aes_key)
+    try:
+        cleartext_bytes = aead.decrypt(nonce_bytes, ciphertext_bytes, _GCM_ASSOCIATED_DATA)
+    except (cryptography.exceptions.InvalidTag, ValueError) as ex:
+        _logger.debug("Decryption failed.", exc_info = ex)
+        raise edq.core.errors.UtilsError("Decryption failed. Do you have the correct key (or has the secret been modified)?")  # pylint: disable=raise-missing-from
+
+    return cleartext_bytes.decode(encoding)
+
+def encrypt_many(
+        key: str,
+        secrets: typing.Iterable[Secret],
+        num_processes: typing.Union[int, None] = None,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> typing.List[str]:
+    """
+    Encrypt many secrets (see Secret.encrypt()) and return their full encrypted representations (in the same order).
+    Like Secret.encrypt(), any secret without an IV and/or salt will have them set
+    (and AEAD methods always get a new nonce).
+
+    Key derivation (the slow part of encryption) is run across a pool of `num_processes` processes
+    (defaults to the number of CPUs).
+    Small batches (see PARALLEL_MIN_DERIVATIONS) are always run serially.
+    """
+
+    secrets = list(secrets)
+    key_bytes = key.encode(encoding)
+
+    inputs = []
+    jobs = []
+    for secret in secrets:
+        iv_b64 = secret.iv_b64
+        iv_length = IV_LENGTH_BYTES
+        if (secret.encryption_method == EncryptionMethod.AES256GCMv1):
+            # Never reuse a nonce.
+            iv_b64 = None
+            iv_length = GCM_NONCE_LENGTH_BYTES
+
+        (iv_bytes, salt_bytes) = _resolve_iv_salt(iv_b64, secret.salt_b64, encoding, iv_length = iv_length)
+
+        inputs.append((iv_bytes, salt_bytes))
+        jobs += _get_derivation_jobs(secret.encryption_method, key_bytes, iv_bytes, salt_bytes)
+
+    derived_keys = iter(_derive_aes_keys(jobs, num_processes))
+
+    results = []
+    for (secret, (iv_bytes, salt_bytes)) in zip(secrets, inputs):
+        if (secret.encryption_method == EncryptionMethod.AES256v1):
+            (aes_key, aes_iv) = (next(derived_keys), next(derived_keys))
+            result = _aes256_encrypt_derived(aes_key, aes_iv, secret.cleartext, iv_bytes, salt_bytes, encoding)
+        else:
+            result = _aes256gcm_encrypt_derived(next(derived_keys), secret.cleartext, iv_bytes, salt_bytes, encoding)
+
+        ciphertext, secret.iv_b64, secret.salt_b64 = result
+        results.append(secret._format_encrypted(ciphertext))
+
+    return results
+
+def decrypt_many(
+        key: typing.Union[str, None],
+        texts: typing.Iterable[str],
+        num_processes: typing.Union[int, None] = None,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> typing.List[Secret]:
+    """
+    Parse many secrets (see Secret.parse()) and return them (in the same order).
+    Cleartext secrets are passed through as-is.
+
+    Key derivation (the slow part of decryption) is run across a pool of `num_processes` processes
+    (defaults to the number of CPUs).
+    Small batches (see PARALLEL_MIN_DERIVATIONS) are always run serially.
+    """
+
+    texts = list(texts)
+    all_parts = [_split_secret(text, key) for text in texts]
+
+    jobs = []
+    for parts in all_parts:
+        if (parts is None):
+            continue
+
+        (encryption_method, iv_b64, salt_b64, _) = parts
+
+        iv_bytes = edq.util.encoding.from_base64(iv_b64, encoding = encoding)
+        salt_bytes = edq.util.encoding.from_base64(salt_b64, encoding = encoding)
+
+        jobs += _get_derivation_jobs(encryption_method, str(key).encode(encoding), iv_bytes, salt_bytes)
+
+    derived_keys = iter(_derive_aes_keys(jobs, num_processes))
+
+    results = []
+    for (text, parts) in zip(texts, all_parts):
+        if (parts is None):
+            results.append(Secret(text.strip()))
+            continue
+
+        (encryption_method, iv_b64, salt_b64, ciphertext_b64) = parts
+
+        if (encryption_method == EncryptionMethod.AES256v1):
+            (aes_key, aes_iv) = (next(derived_keys), next(derived_keys))
+            cleartext = _aes256_decrypt_derived(aes_key, aes_iv, ciphertext_b64, encoding)
+        else:
+            cleartext = _aes256gcm_decrypt_derived(next(derived_keys), iv_b64, ciphertext_b64, encoding)
+
+        results.append(Secret(cleartext, iv_b64, salt_b64, encryption_method))
+
+    return results
+
+def _get_derivation_jobs(
+        encryption_method: EncryptionMethod,
+        key_bytes: bytes,
+        iv_bytes: bytes,
+        salt_bytes: bytes,
+        ) -> typing.List[typing.Tuple[bytes, bytes, int]]:
+    """ Get the key derivations (see _derive_aes_keys()) needed to encrypt/decrypt a secret with the given method. """
+
+    if (encryption_method == EncryptionMethod.AES256v1):
+        return [(key_bytes, salt_bytes, 32), (iv_bytes, salt_bytes, AES_BLOCK_SIZE_BYTES)]
+
+    if (encryption_method == EncryptionMethod.AES256GCMv1):
+        return [(key_bytes, salt_bytes, 32)]
+
+    raise edq.core.errors.SerializationError(f"Secret has an unsupported encryption method: '{encryption_method}'.")
+
+def _split_secret(
+        text: str,
+        key: typing.Union[str, None],
+        ) -> typing.Union[typing.Tuple[EncryptionMethod, str, str, str], None]:
+    """
+    Split an encrypted secret into its components: (encryption method, IV, salt, ciphertext).
+    Returns None if the text is only cleartext.
+    """
+
+    text = text.strip()
+
+    # Check for only cleartext.
+    if (not text.startswith(SECRET_PREFIX)):
+        return None
+
+    if (key is None):
+        raise edq.core.errors.SerializationError("No key provided for reading an encrypted secret.")
+
+    parts = text.split(SECRET_DELIM)
+    if (len(parts) != 5):
+        raise edq.core.errors.SerializationError(f"Secret has an unexpected number of parts, expecting 5 and found {len(parts)}: '{text}'.")
+
+    (_, raw_method, iv_b64, salt_b64, ciphertext_b64) = parts
+
+    if (not edq.util.enum.has_value(EncryptionMethod, raw_method)):
+        raise edq.core.errors.SerializationError(f"Secret has an unknown encryption method: '{raw_method}'.")
+
+    return (EncryptionMethod(raw_method), iv_b64, salt_b64, ciphertext_b64)
+
+def encrypt_file(
+        key: str,
+        source_path: str,
+        dest_path: str,
+        chunk_size: int = DEFAULT_FILE_CHUNK_SIZE_BYTES,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> None:
+    """
+    Encrypt a file (see encrypt_stream()).
+    The destination is written atomically (see edq.util.dirent.open_atomic()).
+    """
+
+    with open(source_path, 'rb') as source:
+        with edq.util.dirent.open_atomic(dest_path, 'wb') as dest:
+            encrypt_stream(key, source, typing.cast(typing.BinaryIO, dest), chunk_size = chunk_size, encoding = encoding)
+
+def decrypt_file(
+        key: str,
+        source_path: str,
+        dest_path: str,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> None:
+    """
+    Decrypt a file (see decrypt_stream()).
+    The destination is written atomically (see edq.util.dirent.open_atomic()),
+    so a file that fails authentication will never leave (partial) cleartext behind.
+    """
+
+    with open(source_path, 'rb') as source:
+        with edq.util.dirent.open_atomic(dest_path, 'wb') as dest:
+            decrypt_stream(key, source, typing.cast(typing.BinaryIO, dest), encoding = encoding)
+
+def encrypt_stream(
+        key: str,
+        source: typing.BinaryIO,
+        dest: typing.BinaryIO,
+        chunk_size: int = DEFAULT_FILE_CHUNK_SIZE_BYTES,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> None:
+    """
+    Encrypt a binary stream into another binary stream using AES256-GCM.
+    Data is processed in chunks, so memory usage does not depend on the size of the data.
+
+    The output is a fixed-size binary header (magic, format version, chunk size, salt, and nonce prefix)
+    followed by each encrypted chunk (with its authentication tag).
+    Every chunk is authenticated along with the header, its position, and whether it is the final chunk,
+    so reordered, truncated, or extended data will fail to decrypt.
+    """
+
+    if ((chunk_size < 1) or (chunk_size > MAX_FILE_CHUNK_SIZE_BYTES)):
+        raise ValueError(f"Chunk size must be in [1, {MAX_FILE_CHUNK_SIZE_BYTES}], got {chunk_size}.")
+
+    salt = os.urandom(SALT_LENGTH_BYTES)
+    nonce_prefix = os.urandom(FILE_NONCE_PREFIX_LENGTH_BYTES)
+
+    header = struct.pack(_FILE_HEADER_FORMAT, FILE_MAGIC, FILE_FORMAT_VERSION, chunk_size, salt, nonce_prefix)
+    dest.write(header)
+
+    aead = cryptography.hazmat.primitives.ciphers.aead.AESGCM(_derive_aes_key(key.encode(encoding), salt, 32))
+
+    # Read one chunk ahead so we know which chunk is the final one.
+    index = 0
+    chunk = _read_fully(source, chunk_size)
+    while True:
+        next_chunk = _read_fully(source, chunk_size)
+        final = (len(next_chunk) == 0)
+
+        dest.write(aead.encrypt(_get_file_nonce(nonce_prefix, index, final), chunk, header))
+
+        if (final):
+            break
+
+        chunk = next_chunk
+        index += 1
+
+def decrypt_stream(
+        key: str,
+        source: typing.BinaryIO,
+        dest: typing.BinaryIO,
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        ) -> None:
+    """
+    Decrypt a binary stream (written by encrypt_stream()) into another binary stream.
+    Each chunk is authenticated before it is written,
+    but an error may be raised after earlier chunks have already been written (see decrypt_file()).
+    """
+
+    header = _read_fully(source, _FILE_HEADER_LENGTH_BYTES)
+    if ((len(header) != _FILE_HEADER_LENGTH_BYTES) or (not header.startswith(FILE_MAGIC))):
+        raise edq.core.errors.UtilsError("Data is not an encrypted file (bad header).")
+
+    (_, version, chunk_size, salt, nonce_prefix) = struct.unpack(_FILE_HEADER_FORMAT, header)
+
+    if (version != FILE_FORMAT_VERSION):
+        raise edq.core.errors.UtilsError(f"Unsupported encrypted file version: {version}.")
+
+    if ((chunk_size < 1) or (chunk_size > MAX_FILE_CHUNK_SIZE_BYTES)):
+        raise edq.core.errors.UtilsError(f"Encrypted file has an invalid chunk size: {chunk_size}.")
+
+    aead = cryptography.hazmat.primitives.ciphers.aead.AESGCM(_derive_aes_key(key.encode(encoding), salt, 32))
+    encrypted_chunk_size = chunk_size + FILE_TAG_LENGTH_BYTES
+
+    index = 0
+    chunk = _read_fully(source, encrypted_chunk_size)
+    while True:
+        next_chunk = _read_fully(source, encrypted_chunk_size)
+        final = (len(next_chunk) == 0)
+
+        try:
+            dest.write(aead.decrypt(_get_file_nonce(nonce_prefix, index, final), chunk, header))
+        except cryptography.exceptions.InvalidTag as ex:
+            _logger.debug("Decryption failed on chunk %d.", index, exc_info = ex)
+            raise edq.core.errors.UtilsError("Decryption failed. Do you have the correct key?")  # pylint: disable=raise-missing-from
+
+        if (final):
+            break
+
+        chunk = next_chunk
+        index += 1
+
+def _read_fully(stream: typing.BinaryIO, size: int) -> bytes:
+    """ Read exactly `size` bytes from a stream (fewer only at the end of the stream), even if the stream returns short reads. """
+
+    data = stream.read(size)
+    if (len(data) in (0, size)):
+        return data
+
+    parts = [data]
+    remaining = size - len(data)
+    while (remaining > 0):
+        data = stream.read(remaining)
+        if (len(data) == 0):
+            break
+
+        parts.append(data)
+        remaining -= len(data)
+
+    return b''.join(parts)
+
+def _get_file_nonce(nonce_prefix: bytes, index: int, final: bool) -> bytes:
+    """ Get the nonce for a chunk of an encrypted file (see FILE_NONCE_PREFIX_LENGTH_BYTES). """
+
+    if (index >= (2 ** 32)):
+        raise edq.core.errors.UtilsError("Too many chunks in encrypted file, use a larger chunk size.")
+
+    return nonce_prefix + struct.pack('>IB', index, int(final))
+
+def get_derived_key_cache_enabled() -> bool:
+    """ Get whether derived keys are cached. """
+
+    return _derived_key_cache_enabled
+
+def set_derived_key_cache_enabled(enabled: bool = True) -> None:
+    """
+    Set whether derived keys are cached.
+    Caching makes repeated encryption/decryption with the same key and salt much faster (key derivation is intentionally slow),
+    but keeps derived keys in memory.
+    High-security contexts should disable caching.
+    Disabling the cache will also clear (and zero) it.
+    """
+
+    global _derived_key_cache_enabled  # pylint: disable=global-statement
+    _derived_key_cache_enabled = enabled
+
+    if (not enabled):
+        clear_derived_key_cache()
+
+def clear_derived_key_cache() -> None:
+    """ Remove (and zero) all cached derived keys. """
+
+    with _derived_key_cache_lock:
+        for derived_key in _derived_key_cache.values():
+            _zero(derived_key)
+
+        _derived_key_cache.clear()
+
 def _derive_aes_key(
         key_bytes: bytes,
         salt: bytes,
         derived_key_length: int,
         iterations: int = SCRYPT_DEFAULT_ITERATIONS,
         block_size: int = SCRYPT_DEFAULT_BLOCK_SIZE,
+        use_cache: typing.Union[bool, None] = None,
         ) -> bytes:
-    """ Derive a key for use in AES256 from a cleartext key and salt. """
+    """
+    Derive a key for use in AES256 from a cleartext key and salt.
+
+    Derived keys are cached (see DERIVED_KEY_CACHE_SIZE) unless caching is disabled
+    (via `use_cache` or set_derived_key_cache_enabled()).
+    The cache is keyed on a fingerprint of the key (never the key itself), the salt, and the scrypt parameters.
+    """
+
+    if (use_cache is None):
+        use_cache = _derived_key_cache_enabled
+
+    if (not use_cache):
+        return _scrypt(key_bytes, salt, derived_key_length, iterations, block_size)
+
+    cache_key = _get_derived_key_cache_key(key_bytes, salt, derived_key_length, iterations, block_size)
+
+    derived_key = _get_cached_derived_key(cache_key)
+    if (derived_key is not None):
+        return derived_key
+
+    derived_key = _scrypt(key_bytes, salt, derived_key_length, iterations, block_size)
+    _put_cached_derived_key(cache_key, derived_key)
+
+    return derived_key
+
+def _derive_aes_keys(
+        jobs: typing.List[typing.Tuple[bytes, bytes, int]],
+        num_processes: typing.Union[int, None] = None,
+        iterations: int = SCRYPT_DEFAULT_ITERATIONS,
+        block_size: int = SCRYPT_DEFAULT_BLOCK_SIZE,
+        ) -> typing.List[bytes]:
+    """
+    Derive many keys (see _derive_aes_key()), each job being: (key bytes, salt, derived key length).
+    Derived keys are returned in the same order as the jobs.
+    Keys missing from the derived key cache are derived in a process pool (see encrypt_many()).
+    """
+
+    if (num_processes is None):
+        num_processes = os.cpu_count() or 1
+
+    use_cache = _derived_key_cache_enabled
+
+    results: typing.List[typing.Union[bytes, None]] = [None] * len(jobs)
+    cache_keys: typing.List[typing.Any] = [None] * len(jobs)
+    missing_indexes = []
+
+    for (i, (key_bytes, salt, derived_key_length)) in enumerate(jobs):
+        if (use_cache):
+            cache_keys[i] = _get_derived_key_cache_key(key_bytes, salt, derived_key_length, iterations, block_size)
+            results[i] = _get_cached_derived_key(cache_keys[i])
+
+        if (results[i] is None):
+            missing_indexes.append(i)
+
+    args = [(jobs[i][0], jobs[i][1], jobs[i][2], iterations, block_size) for i in missing_indexes]
+
+    if ((num_processes <= 1) or (len(args) < PARALLEL_MIN_DERIVATIONS)):
+        derived_keys = list(itertools.starmap(_scrypt, args))
+    else:
+        chunk_size = max(1, len(args) // (num_processes * 4))
+        with concurrent.futures.ProcessPoolExecutor(max_workers = num_processes) as executor:
+            derived_keys = list(executor.map(_scrypt_args, args, chunksize = chunk_size))
+
+    for (i, derived_key) in zip(missing_indexes, derived_keys):
+        results[i] = derived_key
+
+        if (use_cache):
+            _put_cached_derived_key(cache_keys[i], derived_key)
+
+    return typing.cast(typing.List[bytes], results)
+
+def _get_derived_key_cache_key(
+        key_bytes: bytes,
+        salt: bytes,
+        derived_key_length: int,
+        iterations: int,
+        block_size: int,
+        ) -> typing.Tuple[bytes, bytes, int, int, int, int]:
+    """ Get the key into the derived key cache (see _derive_aes_key()). """
+
+    fingerprint = hmac.new(_FINGERPRINT_KEY, key_bytes, 'sha256').digest()
+    return (fingerprint, bytes(salt), iterations, block_size, SCRYPT_PARALLELIZATION, derived_key_length)
+
+def _get_cached_derived_key(cache_key: typing.Tuple[bytes, bytes, int, int, int, int]) -> typing.Union[bytes, None]:
+    """ Get a derived key from the cache (marking it as recently used), or None if it is not cached. """
+
+    with _derived_key_cache_lock:
+        cached_key = _derived_key_cache.get(cache_key, None)
+        if (cached_key is None):
+            return None
+
+        _derived_key_cache.move_to_end(cache_key)
+        return bytes(cached_key)
+
+def _put_cached_derived_key(cache_key: typing.Tuple[bytes, bytes, int, int, int, int], derived_key: bytes) -> None:
+    """ Add a derived key to the cache, evicting (and zeroing) the least recently used keys if the cache is full. """
+
+    with _derived_key_cache_lock:
+        if (cache_key not in _derived_key_cache):
+            _derived_key_cache[cache_key] = bytearray(derived_key)
+
+        while (len(_derived_key_cache) > DERIVED_KEY_CACHE_SIZE):
+            (_, evicted_key) = _derived_key_cache.popitem(last = False)
+            _zero(evicted_key)
+
+def _scrypt(
+        key_bytes: bytes,
+        salt: bytes,
+        derived_key_length: int,
+        iterations: int,
+        block_size: int,
+        ) -> bytes:
+    """ Run scrypt with the standard parameters. """
 
     return hashlib.scrypt(
         key_bytes,
@@ -299,3 +998,13 @@ def _derive_aes_key(
         p = SCRYPT_PARALLELIZATION,
         dklen = derived_key_length,
     )
+
+def _scrypt_args(args: typing.Tuple[bytes, bytes, int, int, int]) -> bytes:
+    """ Call _scrypt() with packed arguments (for process pools). """
+
+    return _scrypt(*args)
+
+def _zero(buffer: bytearray) -> None:
+    """ Overwrite a buffer with zeros (in-place). """
+
+    buffer[:] = bytes(len(buffer))
@@ -1,7 +1,11 @@
+import io
+import os
 import typing
 
+import edq.core.errors
 import edq.testing.unittest
 import edq.util.crypto
+import edq.util.dirent
 import edq.util.encoding
 import edq.util.serial
 
@@ -337,3 +341,382 @@ class CryptoTest(edq.testing.unittest.BaseTest):
 
                 self.assertNotIn(ciphertext, seen_ciphertexts, 'Found duplicate ciphertext.')
                 seen_ciphertexts.add(ciphertext)
+
+    def test_aes256gcm_base(self) -> None:
+        """ Test AES256-GCM encryption/decryption. """
+
+        nonce = edq.util.encoding.to_base64(b'0' * edq.util.crypto.GCM_NONCE_LENGTH_BYTES)
+        salt = edq.util.encoding.to_base64('salt')
+
+        # [(key, nonce, salt, cleartext, error substring), ...]
+        test_cases: typing.List[typing.Tuple[
+                str,
+                typing.Union[str, None],
+                typing.Union[str, None],
+                str,
+                typing.Union[str, None],
+        ]] = [
+            # Base
+            ('key', nonce, salt, 'abc123', None),
+            ('key2', nonce, salt, 'abc123', None),
+            ('key', nonce, salt, 'a' * (edq.util.crypto.AES_BLOCK_SIZE_BYTES * 3), None),
+
+            # Optional Field Generation
+            ('key', None, salt, 'abc123', None),
+            ('key', nonce, None, 'abc123', None),
+            ('key', None, None, 'abc123', None),
+
+            # Empty
+            ('', nonce, '', '', None),
+            ('key', nonce, salt, '', None),
+
+            # Errors
+            ('key', '', salt, 'abc123', 'Nonce must be'),
+        ]
+
+        # Ensure that no duplicate ciphertexts are found.
+        seen_ciphertexts: typing.Set[str] = set()
+
+        for (i, test_case) in enumerate(test_cases):
+            (key, nonce_b64, salt_b64, cleartext, error_substring) = test_case
+
+            with self.subTest(msg = f"Case {i} ('{cleartext}'):"):
+                try:
+                    ciphertext, actual_nonce, actual_salt = edq.util.crypto.aes256gcm_encrypt(
+                            key, cleartext, nonce_b64 = nonce_b64, salt_b64 = salt_b64)
+                    actual = edq.util.crypto.aes256gcm_decrypt(key, actual_nonce, actual_salt, ciphertext)
+                except Exception as ex:
+                    error_string = self.format_error_string(ex)
+                    if (error_substring is None):
+                        self.fail(f"Unexpected error: '{error_string}'.")
+
+                    self.assertIn(error_substring, error_string, 'Error is not as expected.')
+
+                    continue
+
+                if (error_substring is not None):
+                    self.fail(f"Did not get expected error: '{error_substring}'.")
+
+                self.assertEqual(cleartext, actual)
+
+                if (nonce_b64 is not None):
+                    self.assertEqual(nonce_b64, actual_nonce)
+
+                if (salt_b64 is not None):
+                    self.assertEqual(salt_b64, actual_salt)
+
+                self.assertNotIn(ciphertext, seen_ciphertexts, 'Found duplicate ciphertext.')
+                seen_ciphertexts.add(ciphertext)
+
+    def test_secret_gcm_nonce(self) -> None:
+        """ Test that AES256-GCM secrets get a new nonce on every encryption. """
+
+        nonce = edq.util.encoding.to_base64(b'0' * edq.util.crypto.GCM_NONCE_LENGTH_BYTES)
+        secret = edq.util.crypto.Secret('secret', iv_b64 = nonce, encryption_method = edq.util.crypto.EncryptionMethod.AES256GCMv1)
+
+        first_text = secret.encrypt('key')
+        first_nonce = secret.iv_b64
+
+        second_text = edq.util.crypto.encrypt_many('key', [secret])[0]
+        second_nonce = secret.iv_b64
+
+        secret.cleartext = 'new secret'
+        third_text = secret.encrypt('key')
+
+        nonces = [nonce, first_nonce, second_nonce, secret.iv_b64]
+        self.assertEqual(len(nonces), len(set(nonces)), 'Found a reused nonce.')
+
+        self.assertEqual('secret', edq.util.crypto.Secret.parse(first_text, 'key').cleartext)
+        self.assertEqual('secret', edq.util.crypto.Secret.parse(second_text, 'key').cleartext)
+        self.assertEqual('new secret', edq.util.crypto.Secret.parse(third_text, 'key').cleartext)
+
+        # A lazy secret only reuses its ciphertext until its cleartext is changed.
+        lazy_secret = edq.util.crypto.Secret.parse(third_text, 'key', lazy = True)
+        context = edq.util.serial.SerializationContext(key = 'key')
+        self.assertEqual(third_text, lazy_secret.to_pod(context))
+
+        lazy_secret.cleartext = 'newer secret'
+        fourth_text = str(lazy_secret.to_pod(context))
+        self.assertNotEqual(secret.iv_b64, lazy_secret.iv_b64)
+        self.assertEqual('newer secret', edq.util.crypto.Secret.parse(fourth_text, 'key').cleartext)
+
+    def test_aes256gcm_tampered(self) -> None:
+        """ Test that modified AES256-GCM secrets are detected. """
+
+        secret = edq.util.crypto.Secret('secret', encryption_method = edq.util.crypto.EncryptionMethod.AES256GCMv1)
+        text = secret.encrypt('key')
+
+        parts = text.split(edq.util.crypto.SECRET_DELIM)
+        ciphertext = bytearray(edq.util.encoding.from_base64(parts[-1]))
+        ciphertext[0] ^= 0x01
+        tampered_ciphertext = edq.util.crypto.SECRET_DELIM.join(parts[:-1] + [edq.util.encoding.to_base64(bytes(ciphertext))])
+
+        other_nonce = edq.util.encoding.to_base64(b'1' * edq.util.crypto.GCM_NONCE_LENGTH_BYTES)
+        tampered_nonce = edq.util.crypto.SECRET_DELIM.join(parts[:2] + [other_nonce] + parts[3:])
+
+        # [(key, text, error substring), ...]
+        test_cases = [
+            ('wrong key', text, 'Decryption failed'),
+            ('key', tampered_ciphertext, 'has the secret been modified'),
+            ('key', tampered_nonce, 'has the secret been modified'),
+        ]
+
+        self.assertEqual('secret', edq.util.crypto.Secret.parse(text, 'key').cleartext)
+
+        for (i, test_case) in enumerate(test_cases):
+            (key, test_text, error_substring) = test_case
+
+            with self.subTest(msg = f"Case {i}:"):
+                try:
+                    edq.util.crypto.Secret.parse(test_text, key)
+                except Exception as ex:
+                    self.assertIn(error_substring, self.format_error_string(ex), 'Error is not as expected.')
+                    continue
+
+                self.fail(f"Did not get expected error: '{error_substring}'.")
+
+    def test_derived_key_cache(self) -> None:
+        """ Test that derived keys are cached (and can be disabled). """
+
+        salt = b'0' * edq.util.crypto.SALT_LENGTH_BYTES
+        edq.util.crypto.clear_derived_key_cache()
+
+        try:
+            first_key = edq.util.crypto._derive_aes_key(b'key', salt, 32)
+            self.assertEqual(1, len(edq.util.crypto._derived_key_cache))
+
+            # The key itself should never be used in the cache.
+            cache_key = list(edq.util.crypto._derived_key_cache.keys())[0]
+            self.assertNotIn(b'key', cache_key)
+
+            second_key = edq.util.crypto._derive_aes_key(b'key', salt, 32)
+            self.assertEqual(first_key, second_key)
+            self.assertEqual(1, len(edq.util.crypto._derived_key_cache))
+
+            # Different parameters get different entries.
+            edq.util.crypto._derive_aes_key(b'key', salt, 16)
+            edq.util.crypto._derive_aes_key(b'other key', salt, 32)
+            self.assertEqual(3, len(edq.util.crypto._derived_key_cache))
+
+            # Evicted keys are zeroed.
+            cached_buffer = edq.util.crypto._derived_key_cache[cache_key]
+            edq.util.crypto.clear_derived_key_cache()
+            self.assertEqual(bytes(32), bytes(cached_buffer))
+
+            # Disabling the cache.
+            edq.util.crypto.set_derived_key_cache_enabled(False)
+            uncached_key = edq.util.crypto._derive_aes_key(b'key', salt, 32)
+            self.assertEqual(first_key, uncached_key)
+            self.assertEqual(0, len(edq.util.crypto._derived_key_cache))
+        finally:
+            edq.util.crypto.set_derived_key_cache_enabled(True)
+
+    def test_encrypt_decrypt_many(self) -> None:
+        """ Test bulk encryption/decryption (serial and in a process pool). """
+
+        # [(num processes, cache enabled), ...]
+        test_cases = [
+            (1, True),
+            (2, True),
+            (2, False),
+        ]
+
+        num_secrets = edq.util.crypto.PARALLEL_MIN_DERIVATIONS
+
+        for (i, test_case) in enumerate(test_cases):
+            (num_processes, cache_enabled) = test_case
+
+            with self.subTest(msg = f"Case {i} ({num_processes} processes, cache {cache_enabled}):"):
+                edq.util.crypto.clear_derived_key_cache()
+                edq.util.crypto.set_derived_key_cache_enabled(cache_enabled)
+
+                try:
+                    methods = list(edq.util.crypto.EncryptionMethod)
+                    secrets = [edq.util.crypto.Secret(f"secret {j}", encryption_method = methods[j % len(methods)]) for j in range(num_secrets)]
+                    texts = edq.util.crypto.encrypt_many('key', secrets, num_processes = num_processes)
+
+                    self.assertEqual(num_secrets, len(texts))
+                    for (secret, text) in zip(secrets, texts):
+                        self.assertTrue(secret.is_encrypted())
+                        self.assertEqual(secret.cleartext, edq.util.crypto.Secret.parse(text, 'key').cleartext)
+
+                    # Re-encrypting with the now set IVs/salts should be stable (except for AEAD nonces, which are never reused).
+                    old_nonces = [secret.iv_b64 for secret in secrets]
+                    new_texts = [secret.encrypt('key') for secret in secrets]
+
+                    for (secret, old_nonce, text, new_text) in zip(secrets, old_nonces, texts, new_texts):
+                        if (secret.encryption_method == edq.util.crypto.EncryptionMethod.AES256GCMv1):
+                            self.assertNotEqual(old_nonce, secret.iv_b64)
+                            self.assertNotEqual(text, new_text)
+                        else:
+                            self.assertEqual(text, new_text)
+
+                    texts = new_texts
+                    texts.append('cleartext')
+                    parsed = edq.util.crypto.decrypt_many('key', texts, num_processes = num_processes)
+
+                    expected = [(secret.cleartext, secret.iv_b64, secret.salt_b64, secret.encryption_method) for secret in secrets]
+                    expected.append(('cleartext', None, None, edq.util.crypto.EncryptionMethod.AES256v1))
+
+                    actual = [(secret.cleartext, secret.iv_b64, secret.salt_b64, secret.encryption_method) for secret in parsed]
+                    self.assertEqual(expected, actual)
+
+                    if (not cache_enabled):
+                        self.assertEqual(0, len(edq.util.crypto._derived_key_cache))
+                finally:
+                    edq.util.crypto.set_derived_key_cache_enabled(True)
+
+    def test_decrypt_many_errors(self) -> None:
+        """ Test bulk decryption failures. """
+
+        text = edq.util.crypto.Secret('secret').encrypt('key')
+
+        # [(key, texts, error substring), ...]
+        test_cases: typing.List[typing.Tuple[typing.Union[str, None], typing.List[str], str]] = [
+            (None, ['cleartext', text], 'No key provided for reading an encrypted secret'),
+            ('wrong key', [text], 'Decryption failed'),
+            ('key', ['__edq_secret__::a::b'], 'unexpected number of parts'),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (key, texts, error_substring) = test_case
+
+            with self.subTest(msg = f"Case {i}:"):
+                try:
+                    edq.util.crypto.decrypt_many(key, texts)
+                except Exception as ex:
+                    self.assertIn(error_substring, self.format_error_string(ex), 'Error is not as expected.')
+                    continue
+
+                self.fail(f"Did not get expected error: '{error_substring}'.")
+
+    def test_encrypt_decrypt_file(self) -> None:
+        """ Test streaming file encryption/decryption. """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = 'edq_test_crypto_file_')
+        source_path = os.path.join(temp_dir, 'source.bin')
+        encrypted_path = os.path.join(temp_dir, 'encrypted.bin')
+        dest_path = os.path.join(temp_dir, 'dest.bin')
+
+        chunk_size = 16
+
+        # [(data, chunk size), ...]
+        test_cases = [
+            (b'', chunk_size),
+            (b'a', chunk_size),
+            (b'a' * chunk_size, chunk_size),
+            (bytes(range(256)) * 3, chunk_size),
+            (bytes(range(256)) * 3, edq.util.crypto.DEFAULT_FILE_CHUNK_SIZE_BYTES),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (data, chunk_size) = test_case
+
+            with self.subTest(msg = f"Case {i} ({len(data)} bytes, chunk size {chunk_size}):"):
+                edq.util.dirent.write_file_bytes(source_path, data)
+
+                edq.util.crypto.encrypt_file('key', source_path, encrypted_path, chunk_size = chunk_size)
+                encrypted = edq.util.dirent.read_file_bytes(encrypted_path)
+
+                self.assertTrue(encrypted.startswith(edq.util.crypto.FILE_MAGIC))
+                # Short data may appear in the ciphertext by chance.
+                if (len(data) >= chunk_size):
+                    self.assertNotIn(data, encrypted)
+
+                edq.util.crypto.decrypt_file('key', encrypted_path, dest_path)
+                self.assertEqual(data, edq.util.dirent.read_file_bytes(dest_path))
+
+    def test_decrypt_stream_errors(self) -> None:
+        """ Test that bad/tampered encrypted streams fail to decrypt. """
+
+        chunk_size = 16
+        header_size = edq.util.crypto._FILE_HEADER_LENGTH_BYTES
+        encrypted_chunk_size = chunk_size + edq.util.crypto.FILE_TAG_LENGTH_BYTES
+
+        output = io.BytesIO()
+        edq.util.crypto.encrypt_stream('key', io.BytesIO(b'a' * (chunk_size * 3)), output, chunk_size = chunk_size)
+        encrypted = output.getvalue()
+
+        flipped_chunk = bytearray(encrypted)
+        flipped_chunk[header_size + 1] ^= 0x01
+
+        flipped_header = bytearray(encrypted)
+        flipped_header[header_size - 1] ^= 0x01
+
+        # [(key, data, error substring), ...]
+        test_cases = [
+            ('key', b'', 'bad header'),
+            ('key', b'not an encrypted file at all, but long enough', 'bad header'),
+            ('key', encrypted[:4] + b'\x09' + encrypted[5:], 'Unsupported encrypted file version'),
+            ('wrong key', encrypted, 'Decryption failed'),
+            ('key', bytes(flipped_chunk), 'Decryption failed'),
+            ('key', bytes(flipped_header), 'Decryption failed'),
+
+            # Truncated (at a chunk boundary).
+            ('key', encrypted[:-encrypted_chunk_size], 'Decryption failed'),
+
+            # Extended.
+            ('key', encrypted + encrypted[header_size:(header_size + encrypted_chunk_size)], 'Decryption failed'),
+
+            # Reordered.
+            (
+                'key',
+                (encrypted[:header_size]
+                    + encrypted[(header_size + encrypted_chunk_size):(header_size + (2 * encrypted_chunk_size))]
+                    + encrypted[header_size:(header_size + encrypted_chunk_size)]
+                    + encrypted[(header_size + (2 * encrypted_chunk_size)):]),
+                'Decryption failed',
+            ),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (key, data, error_substring) = test_case
+
+            with self.subTest(msg = f"Case {i}:"):
+                try:
+                    edq.util.crypto.decrypt_stream(key, io.BytesIO(data), io.BytesIO())
+                except Exception as ex:
+                    self.assertIn(error_substring, self.format_error_string(ex), 'Error is not as expected.')
+                    continue
+
+                self.fail(f"Did not get expected error: '{error_substring}'.")
+
+    def test_lazy_secret(self) -> None:
+        """ Test that lazy secrets are only decrypted when their cleartext is accessed. """
+
+        for method in edq.util.crypto.EncryptionMethod:
+            with self.subTest(msg = f"Method {method}:"):
+                text = edq.util.crypto.Secret('secret', encryption_method = method).encrypt('key')
+
+                secret = edq.util.crypto.Secret.parse(text, 'key', lazy = True)
+                self.assertFalse(secret.is_decrypted())
+                self.assertTrue(secret.is_encrypted())
+
+                # Writing with the same key does not need to decrypt.
+                self.assertEqual(text, secret.to_pod(edq.util.serial.SerializationContext(key = 'key')))
+                self.assertFalse(secret.is_decrypted())
+
+                # Copies stay lazy.
+                secret_copy = secret.copy()
+                self.assertFalse(secret_copy.is_decrypted())
+
+                self.assertEqual('secret', secret.cleartext)
+                self.assertTrue(secret.is_decrypted())
+                self.assertIsNone(secret._key)
+
+                self.assertEqual(edq.util.crypto.Secret.parse(text, 'key'), secret_copy)
+                self.assertTrue(secret_copy.is_decrypted())
+
+                # A bad key is only noticed on access.
+                bad_secret = edq.util.crypto.Secret.parse(text, 'wrong key', lazy = True)
+                with self.assertRaises(edq.core.errors.UtilsError):
+                    _ = bad_secret.cleartext
+
+                # Setting the cleartext drops any pending ciphertext.
+                bad_secret.cleartext = 'new secret'
+                self.assertTrue(bad_secret.is_decrypted())
+                self.assertEqual('new secret', edq.util.crypto.Secret.parse(bad_secret.encrypt('key'), 'key').cleartext)
+
+        # The format is still checked right away.
+        with self.assertRaises(edq.core.errors.SerializationError):
+            edq.util.crypto.Secret.parse('__edq_secret__::a::b', 'key', lazy = True)
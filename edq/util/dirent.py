@@ -1,7 +1,9 @@
 """
 Operations relating to directory entries (dirents).
 
-These operations are designed for clarity and compatibility, not performance.
+These operations are designed for clarity and compatibility first.
+Bulk operations (e.g., recursively copying a directory) will do their safety checks once up front,
+and then do the bulk of their work across a thread pool.
 
 Only directories, files, and links will be handled.
 Other types of dirents may result in an error being raised.
@@ -10,20 +12,217 @@ In general, all recursive operations do not follow symlinks by default and inste
 """
 
 import atexit
+import collections
+import concurrent.futures
+import contextlib
+import ctypes
+import errno
+import fnmatch
+import itertools
+import json
+import logging
+import mmap
 import os
+import queue
+import select
 import shutil
+import stat
+import struct
+import sys
 import tempfile
+import threading
+import time
 import typing
 import uuid
 
+if (sys.platform == 'win32'):
+    import msvcrt  # pylint: disable=import-error
+else:
+    import fcntl
+
 import edq.util.constants
 import edq.util.hash
 
+_logger = logging.getLogger(__name__)
+
 DEFAULT_ENCODING: str = edq.util.constants.DEFAULT_ENCODING
 """ The default encoding that will be used when reading and writing. """
 
 DEPTH_LIMIT: int = 10000
 
+DEFAULT_WORKERS: int = min(32, (os.cpu_count() or 1) + 4)
+""" The default number of threads to use for bulk operations. """
+
+PARALLEL_MIN_ITEMS: int = 16
+""" Bulk operations with fewer items than this will be run serially (since a thread pool is not worth the overhead). """
+
+LOCK_POLL_INTERVAL_SECS: float = 0.05
+""" The time to wait between attempts to acquire a lock (see lock_path()). """
+
+COPY_MODE_COPY: str = 'copy'
+""" Copy files by making a full (independent) copy of their data. """
+
+COPY_MODE_REFLINK: str = 'reflink'
+"""
+Copy files by cloning them (a reflink, where data blocks are shared until written to).
+Clones are safe to modify (the filesystem handles copy-on-write).
+Falls back to COPY_MODE_COPY when the filesystem does not support cloning.
+"""
+
+COPY_MODE_HARDLINK: str = 'hardlink'
+"""
+Copy files by hardlinking them to the source.
+This is the fastest mode, but the source and destination will share the same file.
+All the write helpers in this module (write_file(), write_file_bytes(), write_files(), and open_atomic())
+replace files instead of writing to them in-place, so they automatically break the link.
+Any other in-place write (e.g., opening the file to append) will also modify the source,
+so callers doing those writes must call break_link() first.
+Falls back to COPY_MODE_COPY when a link cannot be made (e.g., across filesystems).
+"""
+
+COPY_MODES: typing.List[str] = [
+    COPY_MODE_COPY,
+    COPY_MODE_REFLINK,
+    COPY_MODE_HARDLINK,
+]
+""" All the allowed copy modes. """
+
+_FICLONE: int = 0x40049409
+""" The Linux ioctl request code to clone (reflink) a file (see ioctl_ficlone(2)). """
+
+_COPY_FALLBACK_ERRNOS: typing.Set[int] = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.EXDEV,
+}
+""" Errors that indicate that a fast copy method is not supported (and a regular copy should be used instead). """
+
+_fast_copy_supported: bool = True  # pylint: disable=invalid-name
+""" Set to false if in-kernel copies (os.copy_file_range()) are not supported by this platform. """
+
+RACY_WINDOW_NS: int = 2 * (10 ** 9)
+"""
+Dirents modified more recently than this (in nanoseconds) should not be cached based on their mtime,
+since filesystem timestamps may not have enough resolution to distinguish two quick writes.
+Used by the file hash cache (see hash_files_cached()), the walk cache (see walk_files()), and similar caches.
+"""
+
+HASH_CACHE_SIZE: int = 2 ** 16
+""" The max number of file hashes to keep in the in-memory hash cache (see hash_files_cached()). """
+
+WALK_CACHE_SIZE: int = 2 ** 14
+""" The max number of dir listings to keep in the walk cache (see walk_files()). """
+
+TREE_DIFF_ADDED: str = 'added'
+""" A dirent that only exists in the second tree (see diff_trees()). """
+
+TREE_DIFF_REMOVED: str = 'removed'
+""" A dirent that only exists in the first tree (see diff_trees()). """
+
+TREE_DIFF_MODIFIED: str = 'modified'
+""" A dirent that exists in both trees, but is different (see diff_trees()). """
+
+TREE_DIFF_STATUSES: typing.List[str] = [
+    TREE_DIFF_ADDED,
+    TREE_DIFF_REMOVED,
+    TREE_DIFF_MODIFIED,
+]
+""" All the possible statuses returned by diff_trees(). """
+
+_hash_cache: 'collections.OrderedDict[str, typing.Tuple[int, int, int, str]]' = collections.OrderedDict()
+""" Cached file hashes (in LRU order): {path: (inode, size, mtime_ns, hash), ...} (see hash_files_cached()). """
+
+_hash_cache_lock: threading.Lock = threading.Lock()
+""" A lock protecting _hash_cache. """
+
+_walk_cache: 'collections.OrderedDict[str, typing.Tuple[int, int, typing.List[str], typing.List[str], typing.List[str]]]' = collections.OrderedDict()
+"""
+Cached dir listings (in LRU order): {path: (inode, mtime_ns, [non-dir names], [dir names], [link names]), ...}
+(see list_dir() and walk_files()).
+Links (to anything) are included in the non-dir names, and also listed on their own.
+The names in each list are sorted.
+"""
+
+_walk_cache_lock: threading.Lock = threading.Lock()
+""" A lock protecting _walk_cache. """
+
+_LINK_FALLBACK_ERRNOS: typing.Set[int] = _COPY_FALLBACK_ERRNOS | {
+    errno.EACCES,
+    errno.EMLINK,
+}
+""" Errors that indicate that a hardlink cannot be made (and a regular copy should be used instead). """
+
+_BULK_WRITE_FLAGS: int = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+""" The flags used to create the temp files in write_files(). """
+
+_FD_REMOVE_SUPPORTED: bool = (({os.open, os.rmdir, os.unlink} <= os.supports_dir_fd) and (os.scandir in os.supports_fd))
+""" Whether this platform supports removing trees using paths relative to dir file descriptors. """
+
+_DIR_OPEN_FLAGS: int = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_NOFOLLOW', 0)
+""" The flags used to open dirs when removing trees. """
+
+_removal_queue: typing.Union['queue.Queue[typing.Tuple[str, typing.Union[int, None]]]', None] = None  # pylint: disable=invalid-name
+""" Paths waiting to be removed in the background (see remove()). """
+
+_removal_errors: typing.List[typing.Tuple[str, Exception]] = []  # pylint: disable=invalid-name
+""" Background removals that failed and have not yet been reported (see wait_for_removals()). """
+
+_removal_lock: threading.Lock = threading.Lock()
+""" A lock protecting the creation of _removal_queue and _removal_errors. """
+
+WATCH_EVENT_CREATED: str = 'created'
+""" A file was created under a watched dir (see DirWatcher). """
+
+WATCH_EVENT_MODIFIED: str = 'modified'
+""" A file was modified under a watched dir (see DirWatcher). """
+
+WATCH_EVENT_DELETED: str = 'deleted'
+""" A file was deleted under a watched dir (see DirWatcher). """
+
+WATCH_EVENTS: typing.List[str] = [
+    WATCH_EVENT_CREATED,
+    WATCH_EVENT_MODIFIED,
+    WATCH_EVENT_DELETED,
+]
+""" All the possible events reported by DirWatcher. """
+
+DEFAULT_WATCH_DEBOUNCE_SECS: float = 0.1
+""" The default time a watched dir must be quiet before its changes are reported. """
+
+DEFAULT_WATCH_POLL_INTERVAL_SECS: float = 0.5
+""" The default time between scans when a watched dir is being polled. """
+
+# Flags from Linux's inotify (see inotify(7)).
+_IN_NONBLOCK: int = 0o4000
+_IN_CLOEXEC: int = 0o2000000
+_IN_MODIFY: int = 0x00000002
+_IN_ATTRIB: int = 0x00000004
+_IN_CLOSE_WRITE: int = 0x00000008
+_IN_MOVED_FROM: int = 0x00000040
+_IN_MOVED_TO: int = 0x00000080
+_IN_CREATE: int = 0x00000100
+_IN_DELETE: int = 0x00000200
+_IN_DELETE_SELF: int = 0x00000400
+_IN_MOVE_SELF: int = 0x00000800
+_IN_Q_OVERFLOW: int = 0x00004000
+_IN_IGNORED: int = 0x00008000
+_IN_ONLYDIR: int = 0x01000000
+_IN_ISDIR: int = 0x40000000
+
+_INOTIFY_WATCH_MASK: int = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+        | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR)
+""" The inotify events to watch for on each dir. """
+
+_INOTIFY_EVENT_FORMAT: str = 'iIII'
+""" The struct format for the fixed-size portion of an inotify event (wd, mask, cookie, name length). """
+
+_INOTIFY_READ_SIZE: int = 64 * 1024
+""" The max number of bytes to read from an inotify file descriptor at once. """
+
 def exists(path: str) -> bool:
     """
     Check if a path exists.
@@ -103,11 +302,16 @@ def _check_parent_dirs(raw_path: str) -> None:
 
     raise ValueError("Depth limit reached.")
 
-def remove(path: str) -> None:
+def remove(path: str, workers: typing.Union[int, None] = None, background: bool = False) -> None:
     """
     Remove the given path.
     The path can be of any type (dir, file, link),
     and does not need to exist.
+
+    Dirs are removed in parallel across `workers` threads (a single worker will use shutil.rmtree()).
+    If `background` is true, then a dir will be moved out of the way (so the path is immediately free)
+    and then removed by a background thread (see wait_for_removals()).
+    Background removals cannot raise, failures are logged and reported by wait_for_removals().
     """
 
     if (not exists(path)):
@@ -116,10 +320,178 @@ def remove(path: str) -> None:
     if (os.path.isfile(path) or os.path.islink(path)):
         os.remove(path)
     elif (os.path.isdir(path)):
-        shutil.rmtree(path)
+        if (background and _queue_removal(path, workers)):
+            return
+
+        _remove_tree(path, workers)
     else:
         raise ValueError(f"Unknown type of dirent: '{path}'.")
 
+def wait_for_removals() -> typing.List[typing.Tuple[str, Exception]]:
+    """
+    Block until all background removals (see remove()) have finished.
+    Returns the (temp path, error) of every background removal that failed since the last call.
+    """
+
+    if (_removal_queue is not None):
+        _removal_queue.join()
+
+    with _removal_lock:
+        errors = list(_removal_errors)
+        _removal_errors.clear()
+
+    return errors
+
+def _queue_removal(path: str, workers: typing.Union[int, None]) -> bool:
+    """
+    Move a dir to a temp sibling path and queue it for background removal.
+    Returns false if the dir could not be moved (and should be removed in the foreground).
+    """
+
+    path = os.path.abspath(path)
+    temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{uuid.uuid4().hex}.removing")
+
+    try:
+        os.rename(path, temp_path)
+    except OSError:
+        return False
+
+    _get_removal_queue().put((temp_path, workers))
+    return True
+
+def _get_removal_queue() -> 'queue.Queue[typing.Tuple[str, typing.Union[int, None]]]':
+    """ Get the background removal queue, starting its thread on the first call. """
+
+    global _removal_queue  # pylint: disable=global-statement
+
+    with _removal_lock:
+        if (_removal_queue is None):
+            _removal_queue = queue.Queue()
+            threading.Thread(target = _run_removals, args = (_removal_queue,), daemon = True).start()
+
+            # Let pending removals finish before exiting.
+            atexit.register(wait_for_removals)
+
+        return _removal_queue
+
+def _run_removals(removal_queue: 'queue.Queue[typing.Tuple[str, typing.Union[int, None]]]') -> None:
+    """ Remove queued paths (forever). """
+
+    while (True):
+        (path, workers) = removal_queue.get()
+
+        try:
+            _remove_tree(path, workers)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _logger.warning("Failed to remove '%s' in the background.", path, exc_info = ex)
+
+            with _removal_lock:
+                _removal_errors.append((path, ex))
+        finally:
+            removal_queue.task_done()
+
+def _remove_tree(path: str, workers: typing.Union[int, None]) -> None:
+    """
+    Remove a dir (and everything in it) in parallel.
+
+    The top of the tree is expanded (breadth-first) until there are enough subtrees to keep all the workers busy,
+    then each subtree is removed by a worker.
+
+    Platforms that cannot remove relative to dir file descriptors (e.g., Windows) always use shutil.rmtree(),
+    which knows how to safely handle platform-specific links (e.g., Windows junctions).
+    """
+
+    if (workers is None):
+        workers = DEFAULT_WORKERS
+
+    if ((workers <= 1) or (not _FD_REMOVE_SUPPORTED)):
+        shutil.rmtree(path)
+        return
+
+    expanded_dirs = []
+    subtrees = [path]
+
+    while ((len(subtrees) > 0) and (len(subtrees) < max(workers, PARALLEL_MIN_ITEMS))):
+        next_subtrees = []
+
+        for dirpath in subtrees:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    if (entry.is_dir(follow_symlinks = False)):
+                        next_subtrees.append(entry.path)
+                    else:
+                        os.unlink(entry.path)
+
+            expanded_dirs.append(dirpath)
+
+        subtrees = next_subtrees
+
+    _run_parallel(_remove_subtree, [(subtree,) for subtree in subtrees], workers)
+
+    # Children were added after their parents.
+    for dirpath in reversed(expanded_dirs):
+        os.rmdir(dirpath)
+
+def _remove_subtree(path: str) -> None:
+    """ Remove a dir (and everything in it) using paths relative to dir file descriptors. """
+
+    fd = os.open(path, _DIR_OPEN_FLAGS)
+    try:
+        _remove_dir_contents(fd)
+    finally:
+        os.close(fd)
+
+    os.rmdir(path)
+
+def _remove_dir_contents(root_fd: int) -> None:
+    """
+    Remove everything inside the dir referenced by a file descriptor.
+    An explicit stack is used (instead of recursion), so trees of any depth can be removed.
+    """
+
+    # [(dir fd, remaining entries, name in the parent dir (None for the root)), ...]
+    stack: typing.List[typing.Tuple[int, typing.List[os.DirEntry], typing.Union[str, None]]] = [
+        (root_fd, _list_dir_fd(root_fd), None),
+    ]
+
+    try:
+        while (len(stack) > 0):
+            (dir_fd, entries, name) = stack[-1]
+
+            if (len(entries) > 0):
+                entry = entries.pop()
+
+                if (not entry.is_dir(follow_symlinks = False)):
+                    os.unlink(entry.name, dir_fd = dir_fd)
+                    continue
+
+                child_fd = os.open(entry.name, _DIR_OPEN_FLAGS, dir_fd = dir_fd)
+                try:
+                    child_entries = _list_dir_fd(child_fd)
+                except BaseException:
+                    os.close(child_fd)
+                    raise
+
+                stack.append((child_fd, child_entries, entry.name))
+                continue
+
+            # The dir is now empty.
+            stack.pop()
+            if (name is not None):
+                os.close(dir_fd)
+                os.rmdir(name, dir_fd = stack[-1][0])
+    finally:
+        # Close any child dirs left open by an error (the root fd belongs to the caller).
+        for (dir_fd, _, name) in stack:
+            if (name is not None):
+                os.close(dir_fd)
+
+def _list_dir_fd(dir_fd: int) -> typing.List[os.DirEntry]:
+    """ List the entries of the dir referenced by a file descriptor. """
+
+    with os.scandir(dir_fd) as entries:
+        return list(entries)
+
 def same(a: str, b: str) -> bool:
     """
     Check if two paths represent the same dirent.
@@ -162,7 +534,13 @@ def move(raw_source: str, raw_dest: str, no_clobber: bool = False) -> None:
 
     shutil.move(source, dest)
 
-def copy(raw_source: str, raw_dest: str, no_clobber: bool = False) -> None:
+def copy(
+        raw_source: str,
+        raw_dest: str,
+        no_clobber: bool = False,
+        workers: typing.Union[int, None] = None,
+        mode: str = COPY_MODE_COPY,
+        ) -> None:
     """
     Copy a dirent or directory to a destination.
 
@@ -170,6 +548,37 @@ def copy(raw_source: str, raw_dest: str, no_clobber: bool = False) -> None:
     For copying the contents of a directory INTO another directory, use copy_contents().
 
     No copy is made if the source and dest refer to the same dirent.
+
+    Directories are walked (without following links) and recreated first,
+    and then files are copied across a pool of `workers` threads (defaults to DEFAULT_WORKERS).
+    The mode (see COPY_MODES) determines how files are copied (e.g., full copies, clones, or hardlinks).
+    Full copies will be made in-kernel when possible.
+    """
+
+    copy_function = _get_copy_function(mode)
+
+    file_pairs: typing.List[typing.Tuple[str, str]] = []
+    _copy(raw_source, raw_dest, no_clobber, file_pairs)
+    _run_parallel(copy_function, file_pairs, workers)
+
+def _get_copy_function(mode: str) -> typing.Callable[[str, str], None]:
+    """ Get the function used to copy a single file for a copy mode. """
+
+    if (mode == COPY_MODE_COPY):
+        return _copy_file
+
+    if (mode == COPY_MODE_REFLINK):
+        return _reflink_file
+
+    if (mode == COPY_MODE_HARDLINK):
+        return _hardlink_file
+
+    raise ValueError(f"Unknown copy mode '{mode}'. Allowed values: {COPY_MODES}.")
+
+def _copy(raw_source: str, raw_dest: str, no_clobber: bool, file_pairs: typing.List[typing.Tuple[str, str]]) -> None:
+    """
+    Do all the checks for a copy and create all the directories and links.
+    Files are not copied, but instead added to `file_pairs` as (source, dest) to be copied later.
     """
 
     source = os.path.abspath(raw_source)
@@ -200,16 +609,162 @@ def copy(raw_source: str, raw_dest: str, no_clobber: bool = False) -> None:
         link_target = os.readlink(source)
         os.symlink(link_target, dest)
     elif (os.path.isfile(source)):
-        shutil.copy2(source, dest, follow_symlinks = False)
+        file_pairs.append((source, dest))
     elif (os.path.isdir(source)):
         mkdir(dest)
-
-        for child in sorted(os.listdir(source)):
-            copy(os.path.join(raw_source, child), os.path.join(raw_dest, child))
+        _copy_dir_entries(source, dest, raw_source, file_pairs)
     else:
         raise ValueError(f"Source of copy is not a dir, fie, or link: '{raw_source}'.")
 
-def copy_contents(raw_source: str, raw_dest: str, no_clobber: bool = False) -> None:
+def _copy_dir_entries(source: str, dest: str, raw_source: str, file_pairs: typing.List[typing.Tuple[str, str]]) -> None:
+    """
+    Recreate all the dirs and links inside of a (checked) source dir inside of an existing dest dir.
+    Files are added to `file_pairs` to be copied later.
+    """
+
+    # [(source dir, dest dir, raw source dir, level), ...]
+    stack = [(source, dest, raw_source, 0)]
+
+    while (len(stack) > 0):
+        source_dir, dest_dir, raw_source_dir, level = stack.pop()
+
+        if (level > DEPTH_LIMIT):
+            raise ValueError("Depth limit reached.")
+
+        with os.scandir(source_dir) as entries:
+            for entry in entries:
+                dest_path = os.path.join(dest_dir, entry.name)
+
+                if (entry.is_symlink()):
+                    os.symlink(os.readlink(entry.path), dest_path)
+                elif (entry.is_file(follow_symlinks = False)):
+                    file_pairs.append((entry.path, dest_path))
+                elif (entry.is_dir(follow_symlinks = False)):
+                    os.mkdir(dest_path)
+                    stack.append((entry.path, dest_path, os.path.join(raw_source_dir, entry.name), level + 1))
+                else:
+                    raise ValueError(f"Source of copy is not a dir, fie, or link: '{os.path.join(raw_source_dir, entry.name)}'.")
+
+def _copy_file(source: str, dest: str) -> None:
+    """
+    Copy a single file (including its metadata, like shutil.copy2()).
+    An in-kernel copy (see _fast_copy_file()) will be attempted first.
+    """
+
+    if (not _fast_copy_file(source, dest)):
+        shutil.copyfile(source, dest, follow_symlinks = False)
+
+    shutil.copystat(source, dest, follow_symlinks = False)
+
+def _reflink_file(source: str, dest: str) -> None:
+    """ Clone a single file (see COPY_MODE_REFLINK). """
+
+    if (not _clone_file(source, dest)):
+        _copy_file(source, dest)
+        return
+
+    shutil.copystat(source, dest, follow_symlinks = False)
+
+def _hardlink_file(source: str, dest: str) -> None:
+    """ Hardlink a single file (see COPY_MODE_HARDLINK). """
+
+    try:
+        os.link(source, dest)
+    except OSError as ex:
+        if (ex.errno not in _LINK_FALLBACK_ERRNOS):
+            raise
+
+        _copy_file(source, dest)
+
+def _clone_file(source: str, dest: str) -> bool:
+    """
+    Attempt to clone a file (make a reflink) using the FICLONE ioctl.
+    Returns true if the clone was made, and false if a regular copy should be made instead.
+    """
+
+    if (sys.platform == 'linux'):
+        with open(source, 'rb') as source_file, open(dest, 'wb') as dest_file:
+            try:
+                fcntl.ioctl(dest_file.fileno(), _FICLONE, source_file.fileno())
+            except OSError as ex:
+                if (ex.errno not in _COPY_FALLBACK_ERRNOS):
+                    raise
+
+                return False
+
+        return True
+
+    return False
+
+def _fast_copy_file(source: str, dest: str) -> bool:
+    """
+    Attempt to copy a file in-kernel (os.copy_file_range()).
+    Returns true if the copy was made, and false if a regular copy should be made instead.
+    """
+
+    global _fast_copy_supported  # pylint: disable=global-statement
+
+    if ((not _fast_copy_supported) or (not hasattr(os, 'copy_file_range'))):
+        return False
+
+    with open(source, 'rb') as source_file, open(dest, 'wb') as dest_file:
+        source_fd = source_file.fileno()
+        dest_fd = dest_file.fileno()
+
+        try:
+            size = os.fstat(source_fd).st_size
+            offset = 0
+            while (offset < size):
+                count = os.copy_file_range(source_fd, dest_fd, size - offset, offset, offset)
+                if (count == 0):
+                    break
+
+                offset += count
+        except OSError as ex:
+            if (ex.errno not in _COPY_FALLBACK_ERRNOS):
+                raise
+
+            if (ex.errno == errno.ENOSYS):
+                _fast_copy_supported = False
+
+            return False
+
+    return True
+
+def break_link(raw_path: str) -> bool:
+    """
+    If the given file shares its data with other paths (i.e., it is hardlinked),
+    then replace it with an independent copy (see COPY_MODE_HARDLINK).
+    Returns true if the link was broken.
+    Links (symlinks) and dirs are ignored.
+    """
+
+    path = os.path.abspath(raw_path)
+
+    if ((not exists(path)) or os.path.islink(path) or (not os.path.isfile(path))):
+        return False
+
+    if (os.stat(path).st_nlink <= 1):
+        return False
+
+    # Keep the temp file in the same dir, so the replace is atomic.
+    temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{uuid.uuid4()}")
+
+    try:
+        _copy_file(path, temp_path)
+        os.replace(temp_path, path)
+    finally:
+        remove(temp_path)
+
+    return True
+
+def copy_contents(
+        raw_source: str,
+        raw_dest: str,
+        no_clobber: bool = False,
+        workers: typing.Union[int, None] = None,
+        mode: str = COPY_MODE_COPY,
+        ) -> None:
     """
     Copy a file or the contents of a directory (excluding the top-level directory itself) into a destination.
     If the destination exists, it must be a directory.
@@ -218,8 +773,12 @@ def copy_contents(raw_source: str, raw_dest: str, no_clobber: bool = False) -> N
 
     For a file, this is equivalent to `mkdir -p dest && cp source dest`
     For a dir, this is equivalent to `mkdir -p dest && cp -r source/* dest`
+
+    Files are copied in parallel, using the given mode (see copy()).
     """
 
+    copy_function = _get_copy_function(mode)
+
     source = os.path.abspath(raw_source)
     dest = os.path.abspath(raw_dest)
 
@@ -231,14 +790,18 @@ def copy_contents(raw_source: str, raw_dest: str, no_clobber: bool = False) -> N
 
     mkdir(dest)
 
+    file_pairs: typing.List[typing.Tuple[str, str]] = []
+
     if (os.path.isfile(source) or os.path.islink(source)):
-        copy(source, os.path.join(dest, os.path.basename(source)), no_clobber = no_clobber)
+        _copy(source, os.path.join(dest, os.path.basename(source)), no_clobber, file_pairs)
     elif (os.path.isdir(source)):
         for child in sorted(os.listdir(source)):
-            copy(os.path.join(raw_source, child), os.path.join(raw_dest, child), no_clobber = no_clobber)
+            _copy(os.path.join(raw_source, child), os.path.join(raw_dest, child), no_clobber, file_pairs)
     else:
         raise ValueError(f"Source of contents copy is not a dir, fie, or link: '{raw_source}'.")
 
+    _run_parallel(copy_function, file_pairs, workers)
+
 def read_file(
         raw_path: str,
         strip: bool = True,
@@ -269,10 +832,15 @@ def write_file(
         newline: bool = True,
         encoding: typing.Union[str, None] = DEFAULT_ENCODING,
         no_clobber: bool = False,
+        atomic: bool = False,
+        fsync_dir: bool = False,
         ) -> None:
     """
     Write the contents of a file.
     If clobbering, any existing dirent will be removed before write.
+
+    If `atomic` is true, then the file will be written atomically (see open_atomic()),
+    so readers will only ever see the old or the new contents.
     """
 
     if (encoding is None):
@@ -284,7 +852,8 @@ def write_file(
         if (no_clobber):
             raise ValueError(f"Destination of write already exists: '{raw_path}'.")
 
-        remove(path)
+        if (not atomic):
+            remove(path)
 
     if (contents is None):
         contents = ''
@@ -295,6 +864,12 @@ def write_file(
     if (newline):
         contents += "\n"
 
+    if (atomic):
+        with open_atomic(path, 'w', encoding = encoding, fsync_dir = fsync_dir) as atomic_file:
+            atomic_file.write(contents)
+
+        return
+
     with open(path, 'w', encoding = encoding) as file:
         file.write(contents)
 
@@ -309,12 +884,63 @@ def read_file_bytes(raw_path: str) -> bytes:
     with open(path, 'rb') as file:
         return file.read()
 
+@contextlib.contextmanager
+def map_file(raw_path: str) -> typing.Iterator[memoryview]:
+    """
+    Memory-map a file and provide its contents as a read-only memoryview (without copying the file into memory).
+    The view (and any slices of it) are only valid inside of the context,
+    so callers should copy out (e.g., via bytes()) anything they need to keep.
+    Any views that are still alive when the context exits will cause a ValueError.
+
+    The file must not be modified (especially truncated) while it is mapped,
+    since accessing a page past the new end of the file will crash the process (SIGBUS) instead of raising an error.
+    So only map files that are never modified in-place (e.g., files that are only replaced with write_file() or open_atomic()).
+    Arbitrary user files should be streamed instead.
+    """
+
+    path = os.path.abspath(raw_path)
+
+    if (not exists(path)):
+        raise ValueError(f"Source of map does not exist: '{raw_path}'.")
+
+    if (not os.path.isfile(path)):
+        raise ValueError(f"Source of map is not a file: '{raw_path}'.")
+
+    with open(path, 'rb') as file:
+        # Empty files cannot be mapped.
+        if (os.fstat(file.fileno()).st_size == 0):
+            yield memoryview(b'')
+            return
+
+        mapped = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        view = memoryview(mapped)
+
+        try:
+            yield view
+        finally:
+            # Do not mask an error that is already being raised (e.g., whose traceback holds a view).
+            pending_error = sys.exc_info()[1]
+
+            view.release()
+
+            try:
+                mapped.close()
+            except BufferError as ex:
+                if (pending_error is None):
+                    raise ValueError(f"A view of a mapped file is still in use after its context closed: '{raw_path}'.") from ex
+
 def write_file_bytes(
         raw_path: str, contents: typing.Union[bytes, str, None],
-        no_clobber: bool = False) -> None:
+        no_clobber: bool = False,
+        atomic: bool = False,
+        fsync_dir: bool = False,
+        ) -> None:
     """
     Write the contents of a file as bytes.
     If clobbering, any existing dirent will be removed before write.
+
+    If `atomic` is true, then the file will be written atomically (see open_atomic()),
+    so readers will only ever see the old or the new contents.
     """
 
     if (contents is None):
@@ -329,91 +955,1227 @@ def write_file_bytes(
         if (no_clobber):
             raise ValueError(f"Destination of write bytes already exists: '{raw_path}'.")
 
-        remove(path)
+        if (not atomic):
+            remove(path)
+
+    if (atomic):
+        with open_atomic(path, 'wb', fsync_dir = fsync_dir) as atomic_file:
+            atomic_file.write(contents)
+
+        return
 
     with open(path, 'wb') as file:
         file.write(contents)
 
-def contains_path(parent: str, child: str) -> bool:
+@contextlib.contextmanager
+def open_atomic(
+        raw_path: str,
+        mode: str = 'w',
+        encoding: typing.Union[str, None] = DEFAULT_ENCODING,
+        fsync_dir: bool = False,
+        ) -> typing.Iterator[typing.IO]:
     """
-    Check if the parent path contains the child path.
-    This is pure lexical analysis, no dirent stats are checked.
-    Will return false if the (absolute) paths are the same
-    (this function does not allow a path to contain itself).
+    Open a file for writing that will atomically replace the given path when the context exits successfully.
+
+    Data is written to a temp file in the same dir, flushed and fsync'd, and then moved into place with os.replace().
+    Readers will see either the old or new file (never a partial one), and a failure will leave the old file untouched.
+    If `fsync_dir` is true, then the parent dir will also be fsync'd so that the replace itself is durable
+    (this is skipped on platforms that cannot fsync dirs, e.g., Windows).
+
+    Only write modes ('w', 'wt', and 'wb') are allowed.
+    An existing dir at the path will be removed first (which is not atomic).
+
+    Symlinks are resolved first (see os.path.realpath()), so the link is kept and its target is replaced.
+    The permission bits of an existing file are copied onto the new file.
     """
 
-    if ((parent == '') or (child == '')):
-        return False
+    if (mode not in ('w', 'wt', 'wb')):
+        raise ValueError(f"Unsupported mode for atomic open: '{mode}'.")
 
-    parent = os.path.abspath(parent)
-    child = os.path.abspath(child)
+    path = os.path.realpath(os.path.abspath(raw_path))
+    dirname = os.path.dirname(path)
 
-    child = os.path.dirname(child)
-    for _ in range(DEPTH_LIMIT):
-        if (parent == child):
-            return True
+    if (os.path.isdir(path) and (not os.path.islink(path))):
+        remove(path)
 
-        new_child = os.path.dirname(child)
-        if (child == new_child):
-            return False
+    # Keep the temp file in the same dir, so the replace is atomic.
+    temp_path = os.path.join(dirname, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    exclusive_mode = mode.replace('w', 'x')
 
-        child = new_child
+    try:
+        if ('b' in mode):
+            file: typing.IO = open(temp_path, exclusive_mode)  # pylint: disable=consider-using-with
+        else:
+            if (encoding is None):
+                encoding = DEFAULT_ENCODING
 
-    raise ValueError("Depth limit reached.")
+            file = open(temp_path, exclusive_mode, encoding = encoding)  # pylint: disable=consider-using-with
 
-def hash_file(raw_path: str) -> str:
-    """
-    Compute the SHA256 hash of the file (see edq.util.hash.sha256_hex()).
-    Links will has their path (according to os.readlink()).
-    Directories will raise an exception.
-    """
+        with file:
+            _copy_file_mode(path, file.fileno())
 
-    path = os.path.abspath(raw_path)
+            yield file
 
-    contents: typing.Any = None
+            file.flush()
+            os.fsync(file.fileno())
 
-    if (not exists(path)):
-        raise ValueError(f"Target of hash file does not exist: '{raw_path}'.")
+        os.replace(temp_path, path)
+    except BaseException:
+        if (exists(temp_path)):
+            os.remove(temp_path)
 
-    if (os.path.islink(path)):
-        contents = os.readlink(path)
-    elif (os.path.isfile(path)):
-        contents = read_file_bytes(raw_path)
-    else:
-        raise ValueError(f"Target of hash file is not a file: '{raw_path}'.")
+        raise
+
+    if (fsync_dir):
+        _fsync_dir(dirname)
+
+def _copy_file_mode(path: str, fd: int) -> None:
+    """ Copy the permission bits of an existing file (if any) onto an open file. """
+
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return
+
+    # Windows does not have fchmod() (before Python 3.13).
+    if (hasattr(os, 'fchmod')):
+        os.fchmod(fd, mode)
 
-    return edq.util.hash.sha256_hex(contents)
+def _fsync_dir(path: str) -> None:
+    """ Attempt to fsync a dir (so that changes to its entries are durable). """
+
+    if (sys.platform == 'win32'):
+        return
 
-def tree(raw_path: str, hash_files: bool = False) -> typing.Dict[str, typing.Union[None, str, typing.Dict[str, typing.Any]]]:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError as ex:
+        # Some filesystems do not support fsyncing dirs.
+        if (ex.errno not in (errno.EBADF, errno.EINVAL, errno.EOPNOTSUPP)):
+            raise
+    finally:
+        os.close(fd)
+
+@contextlib.contextmanager
+def lock_path(
+        raw_path: str,
+        timeout_secs: typing.Union[float, None] = None,
+        ) -> typing.Iterator[None]:
     """
-    Return a tree structure that includes all descendants of the given dirent (including the dirent itself).
-    If `hash_files` is true, then the value of non-dir keys will be the SHA256 hash of the file (see hash_file()),
-    otherwise the value will be None.
+    Hold an exclusive lock on a path (across threads and processes) for the duration of the context.
+
+    The lock is advisory (only other callers of this function will respect it),
+    and is held on a hidden lock file next to the path (".<name>.lock"),
+    since the path itself may be atomically replaced (see open_atomic()) while locked.
+    Symlinks are resolved first (like open_atomic()), so a link and its target share the same lock.
+    The parent dir of the path must already exist.
+
+    The lock file is left in place (removing it would race with other lockers),
+    so every locked path leaves behind a single empty lock file that can be safely deleted when no one is holding it.
+    It is kept next to the path (instead of in a cache or runtime dir)
+    so that every user and process that can write to the path will contend on the same lock.
+
+    If `timeout_secs` is set and the lock could not be acquired in that time, then a TimeoutError will be raised.
     """
 
-    path = os.path.abspath(raw_path)
+    path = os.path.realpath(os.path.abspath(raw_path))
+    lock_file_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.lock")
+
+    fd = os.open(lock_file_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        start_time = time.monotonic()
+        while (not _try_lock_fd(fd)):
+            if ((timeout_secs is not None) and ((time.monotonic() - start_time) >= timeout_secs)):
+                raise TimeoutError(f"Timed out waiting for the lock on: '{raw_path}'.")
+
+            time.sleep(LOCK_POLL_INTERVAL_SECS)
+
+        try:
+            yield
+        finally:
+            _unlock_fd(fd)
+    finally:
+        os.close(fd)
+
+def _try_lock_fd(fd: int) -> bool:
+    """ Try to (exclusively) lock an open lock file without blocking, and return true if the lock was acquired. """
+
+    if (sys.platform == 'win32'):
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
 
-    if (not exists(path)):
-        raise ValueError(f"Target of tree does not exist: '{raw_path}'.")
+        return True
 
-    return {
-        os.path.basename(path): _tree(path, hash_files, 0),
-    }
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
 
-def _tree(path: str, hash_files: bool, level: int) -> typing.Union[str, None, typing.Dict[str, typing.Any]]:
-    """ Recursive helper for tree(). """
+    return True
 
-    if (level > DEPTH_LIMIT):
-        raise ValueError("Depth limit reached.")
+def _unlock_fd(fd: int) -> None:
+    """ Release a lock acquired with _try_lock_fd(). """
 
-    if (not os.path.isdir(path)):
-        if (hash_files):
-            return hash_file(path)
+    if (sys.platform == 'win32'):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        return
 
-        return None
+    fcntl.flock(fd, fcntl.LOCK_UN)
 
-    result = {}
-    for child in sorted(os.listdir(path)):
-        result[child] = _tree(os.path.join(path, child), hash_files, level + 1)
+def read_files(
+        raw_paths: typing.Iterable[str],
+        strip: bool = True,
+        encoding: typing.Union[str, None] = DEFAULT_ENCODING,
+        binary: bool = False,
+        workers: typing.Union[int, None] = None,
+        ) -> typing.Tuple[typing.Dict[str, typing.Union[str, bytes]], typing.Dict[str, str]]:
+    """
+    Read many (small) files across a thread pool.
+    Returns the contents of every file that was read and an error message for every file that could not be read
+    (both keyed by the given path).
+
+    Unlike read_file(), each file is just opened and read (without existence checks or path normalization),
+    so each read uses as few syscalls as possible.
+    If `binary` is true, then contents will be bytes (and `strip` will be ignored).
+    """
+
+    if (encoding is None):
+        encoding = DEFAULT_ENCODING
+
+    paths = list(dict.fromkeys(raw_paths))
+    results = _run_parallel(_read_file_result, [(path, strip, encoding, binary) for path in paths], workers)
+
+    contents: typing.Dict[str, typing.Union[str, bytes]] = {}
+    errors: typing.Dict[str, str] = {}
+
+    for (path, (content, error)) in zip(paths, results):
+        if (error is not None):
+            errors[path] = error
+        else:
+            contents[path] = content
+
+    return contents, errors
+
+def _read_file_result(
+        path: str,
+        strip: bool,
+        encoding: str,
+        binary: bool,
+        ) -> typing.Tuple[typing.Union[str, bytes, None], typing.Union[str, None]]:
+    """ Read a single file for read_files() and return (contents, error message). """
+
+    try:
+        if (binary):
+            with open(path, 'rb') as binary_file:
+                return binary_file.read(), None
+
+        with open(path, 'r', encoding = encoding) as file:
+            contents = file.read()
+    except FileNotFoundError:
+        return None, f"Source of read does not exist: '{path}'."
+    except (OSError, ValueError) as ex:
+        return None, f"Failed to read '{path}': {ex}."
+
+    if (strip):
+        contents = contents.strip()
+
+    return contents, None
+
+def write_files(
+        raw_contents: typing.Mapping[str, typing.Union[str, bytes, None]],
+        strip: bool = True,
+        newline: bool = True,
+        encoding: typing.Union[str, None] = DEFAULT_ENCODING,
+        make_dirs: bool = False,
+        workers: typing.Union[int, None] = None,
+        ) -> typing.Dict[str, str]:
+    """
+    Write many (small) files across a thread pool.
+    Returns an error message for every file that could not be written (keyed by the given path).
+
+    String contents are processed like write_file() (using `strip` and `newline`),
+    while bytes are written as-is (like write_file_bytes()).
+    If `make_dirs` is true, then any missing parent dirs will be created first.
+
+    Each file is written to a temp file in the same dir and then moved into place with os.replace(),
+    so readers never see an empty or partial file and any existing dirent (e.g., a hardlinked file or a link) is replaced
+    (instead of being written through).
+    Unlike open_atomic(), nothing is fsync'd, so writes are not durable across a crash.
+    """
+
+    if (encoding is None):
+        encoding = DEFAULT_ENCODING
+
+    errors: typing.Dict[str, str] = {}
+
+    if (make_dirs):
+        for dirname in dict.fromkeys(os.path.dirname(os.path.abspath(path)) for path in raw_contents):
+            try:
+                os.makedirs(dirname, exist_ok = True)
+            except OSError as ex:
+                for path in raw_contents:
+                    if (os.path.dirname(os.path.abspath(path)) == dirname):
+                        errors[path] = f"Failed to create parent dir for write '{path}': {ex}."
+
+    args_list = []
+    for (path, contents) in raw_contents.items():
+        if (path in errors):
+            continue
+
+        if (contents is None):
+            contents = ''
+
+        if (isinstance(contents, str)):
+            if (strip):
+                contents = contents.strip()
+
+            if (newline):
+                contents += "\n"
+
+        args_list.append((path, contents, encoding))
+
+    results = _run_parallel(_write_file_result, args_list, workers)
+
+    for ((path, _, _), error) in zip(args_list, results):
+        if (error is not None):
+            errors[path] = error
+
+    return errors
+
+def _write_file_result(path: str, contents: typing.Union[str, bytes], encoding: str) -> typing.Union[str, None]:
+    """ Write a single file for write_files() and return an error message (or None on success). """
+
+    abs_path = os.path.abspath(path)
+    temp_path = os.path.join(os.path.dirname(abs_path), f".{os.path.basename(abs_path)}.{uuid.uuid4().hex}.tmp")
+
+    try:
+        fd = os.open(temp_path, _BULK_WRITE_FLAGS, 0o666)
+
+        try:
+            if (isinstance(contents, bytes)):
+                with open(fd, 'wb') as binary_file:
+                    binary_file.write(contents)
+            else:
+                with open(fd, 'w', encoding = encoding) as file:
+                    file.write(contents)
+
+            try:
+                os.replace(temp_path, abs_path)
+            except OSError:
+                # A dir cannot be replaced by a file, so remove it first.
+                if ((not os.path.isdir(abs_path)) or os.path.islink(abs_path)):
+                    raise
+
+                remove(abs_path)
+                os.replace(temp_path, abs_path)
+        except BaseException:
+            if (os.path.lexists(temp_path)):
+                os.remove(temp_path)
+
+            raise
+    except (OSError, ValueError) as ex:
+        return f"Failed to write '{path}': {ex}."
+
+    return None
+
+def list_dir(raw_path: str, use_cache: bool = True) -> typing.List[str]:
+    """
+    Get the (sorted) names of all the dirents in a dir (like os.listdir()).
+    Listings are cached (see walk_files()).
+    """
+
+    path = os.path.abspath(raw_path)
+
+    if (not os.path.isdir(path)):
+        raise ValueError(f"Target of list is not a dir: '{raw_path}'.")
+
+    (_, files, dirs, _) = _list_dir_cached(path, use_cache)
+    return sorted(files + dirs)
+
+def walk_files(
+        raw_path: str,
+        extensions: typing.Union[str, typing.Iterable[str], None] = None,
+        pattern: typing.Union[str, None] = None,
+        include_hidden: bool = False,
+        use_cache: bool = True,
+        follow_links: bool = True,
+        ) -> typing.List[str]:
+    """
+    Get the (sorted) absolute paths of all files (and links) found recursively under a dir.
+    A path that does not exist has no files.
+
+    Files can be filtered by their extension(s) (any suffix, e.g., ".httpex.json")
+    and/or by a glob-style pattern (see fnmatch) that their name must match.
+    Like glob, hidden dirents (names starting with a dot) are skipped unless `include_hidden` is true.
+    Also like glob, links to dirs are followed (and their files are reported under the link's path)
+    unless `follow_links` is false (in which case the links themselves are reported like files).
+    A link to one of its own ancestor dirs is not followed, so link loops are only walked once.
+
+    The listing of each dir is cached and validated by the dir's inode and mtime (a single stat per dir),
+    so repeated walks of an unchanged tree do not need to re-read any dirs.
+    Only the most recently used WALK_CACHE_SIZE listings are kept.
+    Dirs modified very recently (see RACY_WINDOW_NS) are never cached.
+    """
+
+    path = os.path.abspath(raw_path)
+
+    if (not exists(path)):
+        return []
+
+    if (not os.path.isdir(path)):
+        raise ValueError(f"Target of walk is not a dir: '{raw_path}'.")
+
+    if (isinstance(extensions, str)):
+        extensions = [extensions]
+
+    suffixes = None
+    if (extensions is not None):
+        suffixes = tuple(extensions)
+
+    paths = []
+
+    # [(dir path, (device, inode) of all ancestor dirs), ...]
+    dirs: typing.List[typing.Tuple[str, typing.FrozenSet[typing.Tuple[int, int]]]] = [(path, frozenset())]
+
+    while (len(dirs) > 0):
+        (dirpath, ancestors) = dirs.pop()
+
+        try:
+            (dir_id, files, subdirs, links) = _list_dir_cached(dirpath, use_cache)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+        if (dir_id in ancestors):
+            # A link back to an ancestor.
+            continue
+
+        ancestors = ancestors | {dir_id}
+
+        link_dirs = set()
+        if (follow_links):
+            # Only links need an extra stat (their targets may change without changing this dir).
+            link_dirs = {name for name in links if os.path.isdir(os.path.join(dirpath, name))}
+
+        for name in files:
+            if ((not include_hidden) and name.startswith('.')):
+                continue
+
+            if (name in link_dirs):
+                dirs.append((os.path.join(dirpath, name), ancestors))
+                continue
+
+            if ((suffixes is not None) and (not name.endswith(suffixes))):
+                continue
+
+            if ((pattern is not None) and (not fnmatch.fnmatch(name, pattern))):
+                continue
+
+            paths.append(os.path.join(dirpath, name))
+
+        for name in subdirs:
+            if (include_hidden or (not name.startswith('.'))):
+                dirs.append((os.path.join(dirpath, name), ancestors))
+
+    return sorted(paths)
+
+def clear_walk_cache() -> None:
+    """ Clear the cached dir listings (see walk_files()). """
+
+    with _walk_cache_lock:
+        _walk_cache.clear()
+
+def _list_dir_cached(
+        path: str,
+        use_cache: bool,
+        ) -> typing.Tuple[typing.Tuple[int, int], typing.List[str], typing.List[str], typing.List[str]]:
+    """
+    Get the (device, inode) of a dir and its sorted (non-dir names, dir names, link names) using the walk cache.
+    The returned lists are shared with the cache and must not be modified.
+    """
+
+    stat_result = os.stat(path)
+    dir_id = (stat_result.st_dev, stat_result.st_ino)
+    key = (stat_result.st_ino, stat_result.st_mtime_ns)
+
+    if (use_cache):
+        with _walk_cache_lock:
+            entry = _walk_cache.get(path, None)
+            if (entry is not None):
+                _walk_cache.move_to_end(path)
+
+        if ((entry is not None) and (entry[0:2] == key)):
+            return dir_id, entry[2], entry[3], entry[4]
+
+    files = []
+    dirs = []
+    links = []
+
+    with os.scandir(path) as entries:
+        for dirent in entries:
+            if (dirent.is_dir(follow_symlinks = False)):
+                dirs.append(dirent.name)
+            else:
+                files.append(dirent.name)
+
+                if (dirent.is_symlink()):
+                    links.append(dirent.name)
+
+    files.sort()
+    dirs.sort()
+    links.sort()
+
+    if (use_cache and ((time.time_ns() - stat_result.st_mtime_ns) > RACY_WINDOW_NS)):
+        with _walk_cache_lock:
+            _walk_cache[path] = (stat_result.st_ino, stat_result.st_mtime_ns, files, dirs, links)
+            _walk_cache.move_to_end(path)
+
+            while (len(_walk_cache) > WALK_CACHE_SIZE):
+                _walk_cache.popitem(last = False)
+
+    return dir_id, files, dirs, links
+
+def contains_path(parent: str, child: str) -> bool:
+    """
+    Check if the parent path contains the child path.
+    This is pure lexical analysis, no dirent stats are checked.
+    Will return false if the (absolute) paths are the same
+    (this function does not allow a path to contain itself).
+    """
+
+    if ((parent == '') or (child == '')):
+        return False
+
+    parent = os.path.abspath(parent)
+    child = os.path.abspath(child)
+
+    child = os.path.dirname(child)
+    for _ in range(DEPTH_LIMIT):
+        if (parent == child):
+            return True
+
+        new_child = os.path.dirname(child)
+        if (child == new_child):
+            return False
+
+        child = new_child
+
+    raise ValueError("Depth limit reached.")
+
+def hash_file(raw_path: str) -> str:
+    """
+    Compute the SHA256 hash of the file (see edq.util.hash.sha256_hex()).
+    Links will has their path (according to os.readlink()).
+    Directories will raise an exception.
+
+    Files are streamed (see edq.util.hash.sha256_hex_stream()),
+    so large files are never copied into memory.
+    Files are not memory-mapped, since hashed files may be modified (e.g., truncated) by other processes.
+    """
+
+    path = os.path.abspath(raw_path)
+
+    if (not exists(path)):
+        raise ValueError(f"Target of hash file does not exist: '{raw_path}'.")
+
+    if (os.path.islink(path)):
+        return edq.util.hash.sha256_hex(os.readlink(path))
+
+    if (not os.path.isfile(path)):
+        raise ValueError(f"Target of hash file is not a file: '{raw_path}'.")
+
+    with open(path, 'rb') as file:
+        return edq.util.hash.sha256_hex_stream(file)
+
+def tree(
+        raw_path: str,
+        hash_files: bool = False,
+        cache_path: typing.Union[str, None] = None,
+        workers: typing.Union[int, None] = None,
+        ) -> typing.Dict[str, typing.Union[None, str, typing.Dict[str, typing.Any]]]:
+    """
+    Return a tree structure that includes all descendants of the given dirent (including the dirent itself).
+    If `hash_files` is true, then the value of non-dir keys will be the SHA256 hash of the file (see hash_file()),
+    otherwise the value will be None.
+
+    Files are hashed in parallel and their hashes are cached (see hash_files_cached()).
+    """
+
+    path = os.path.abspath(raw_path)
+
+    if (not exists(path)):
+        raise ValueError(f"Target of tree does not exist: '{raw_path}'.")
+
+    result: typing.Dict[str, typing.Any] = {}
+    leaves: typing.List[typing.Tuple[typing.Dict[str, typing.Any], str, str]] = []
+
+    _tree(path, result, os.path.basename(path), leaves, 0)
+
+    if (hash_files):
+        digests = hash_files_cached([leaf_path for (_, _, leaf_path) in leaves], cache_path = cache_path, workers = workers)
+        for ((parent, name, _), digest) in zip(leaves, digests):
+            parent[name] = digest
 
     return result
+
+def tree_digest(
+        raw_path: str,
+        cache_path: typing.Union[str, None] = None,
+        workers: typing.Union[int, None] = None,
+        ) -> str:
+    """
+    Compute a single (Merkle-style) digest for a dirent and all its descendants.
+    A file's digest is its hash (see hash_file()),
+    and a dir's digest is the hash of the names, types, and digests of all its children.
+    The name of the top-level dirent is not included, so identical trees at different paths will have the same digest.
+    """
+
+    root = list(tree(raw_path, hash_files = True, cache_path = cache_path, workers = workers).values())[0]
+    digest, _ = _merkle_node(root)
+    return digest
+
+def diff_trees(
+        raw_a: str,
+        raw_b: str,
+        cache_path: typing.Union[str, None] = None,
+        workers: typing.Union[int, None] = None,
+        ) -> typing.List[typing.Tuple[str, str]]:
+    """
+    Compare two trees by digest (see tree_digest()), only descending into dirs that differ.
+    Returns a sorted list of the differences as (relative POSIX-style path, status) (see TREE_DIFF_STATUSES).
+    When a dir was added or removed, only the dir itself will be reported (not its descendants).
+    An empty list means that the trees are identical.
+    """
+
+    a_root = list(tree(raw_a, hash_files = True, cache_path = cache_path, workers = workers).values())[0]
+    b_root = list(tree(raw_b, hash_files = True, cache_path = cache_path, workers = workers).values())[0]
+
+    results: typing.List[typing.Tuple[str, str]] = []
+    _diff_merkle_nodes(_merkle_node(a_root), _merkle_node(b_root), '', results)
+
+    return sorted(results)
+
+def hash_files_cached(
+        raw_paths: typing.Sequence[str],
+        cache_path: typing.Union[str, None] = None,
+        workers: typing.Union[int, None] = None,
+        ) -> typing.List[str]:
+    """
+    Hash many files (see hash_file()) in parallel.
+
+    Files are streamed (see hash_file()),
+    and the hash of each regular file is cached in-memory keyed on its path, inode, size, and mtime (in nanoseconds).
+    Unchanged files will not be re-read.
+    The in-memory cache only keeps the most recently used HASH_CACHE_SIZE hashes.
+    Files modified very recently (see RACY_WINDOW_NS) are never cached,
+    since a quick second modification may not change their mtime.
+
+    If `cache_path` is provided, then the cache will also be loaded from (and saved to) that JSON file (a sidecar),
+    so that hashes may be reused across processes.
+    A sidecar only ever holds the hashes of the given paths (e.g., the files of a single tree),
+    so each set of paths should use its own sidecar.
+    The sidecar should not be placed inside of a tree that is being hashed.
+    """
+
+    paths = [os.path.abspath(raw_path) for raw_path in raw_paths]
+
+    if (cache_path is not None):
+        _load_hash_cache(cache_path, paths)
+
+    digests = _run_parallel(_hash_file_cached, [(path,) for path in paths], workers)
+
+    if (cache_path is not None):
+        _save_hash_cache(cache_path, paths)
+
+    return digests
+
+def clear_hash_cache() -> None:
+    """ Clear the in-memory file hash cache (see hash_files_cached()). """
+
+    with _hash_cache_lock:
+        _hash_cache.clear()
+
+def _hash_file_cached(path: str) -> str:
+    """ Hash a single file using the file hash cache (see hash_files_cached()). """
+
+    try:
+        stat_result = os.lstat(path)
+    except FileNotFoundError:
+        # Let hash_file() raise the standard error.
+        return hash_file(path)
+
+    # Only regular files are cached.
+    if (not stat.S_ISREG(stat_result.st_mode)):
+        return hash_file(path)
+
+    key = (stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+
+    with _hash_cache_lock:
+        entry = _hash_cache.get(path, None)
+        if (entry is not None):
+            _hash_cache.move_to_end(path)
+
+    if ((entry is not None) and (tuple(entry[0:3]) == key)):
+        return entry[3]
+
+    with open(path, 'rb') as file:
+        digest = edq.util.hash.sha256_hex_stream(file)
+
+    if ((time.time_ns() - stat_result.st_mtime_ns) > RACY_WINDOW_NS):
+        _put_cached_hash(path, (key[0], key[1], key[2], digest))
+
+    return digest
+
+def _put_cached_hash(path: str, entry: typing.Tuple[int, int, int, str]) -> None:
+    """ Add a hash to the in-memory cache, evicting the least recently used hashes if the cache is full. """
+
+    with _hash_cache_lock:
+        _hash_cache[path] = entry
+        _hash_cache.move_to_end(path)
+
+        while (len(_hash_cache) > HASH_CACHE_SIZE):
+            _hash_cache.popitem(last = False)
+
+def _load_hash_cache(path: str, paths: typing.List[str]) -> None:
+    """
+    Load the entries for the given paths from a hash cache sidecar into the in-memory cache
+    (entries already in memory take precedence).
+    """
+
+    if (not exists(path)):
+        return
+
+    try:
+        data = json.loads(read_file(path))
+    except (ValueError, OSError):
+        # A bad cache is just ignored (it will be overwritten).
+        return
+
+    if (not isinstance(data, dict)):
+        return
+
+    for key in paths:
+        entry = data.get(key, None)
+        if (not (isinstance(entry, list) and (len(entry) == 4))):
+            continue
+
+        with _hash_cache_lock:
+            if (key in _hash_cache):
+                continue
+
+        _put_cached_hash(key, (int(entry[0]), int(entry[1]), int(entry[2]), str(entry[3])))
+
+def _save_hash_cache(path: str, paths: typing.List[str]) -> None:
+    """ Save the in-memory hash cache entries for the given paths to a sidecar. """
+
+    with _hash_cache_lock:
+        data = {key: list(_hash_cache[key]) for key in paths if (key in _hash_cache)}
+
+    write_file(path, json.dumps(data, sort_keys = True), strip = False, atomic = True)
+
+def _merkle_node(node: typing.Union[str, None, typing.Dict[str, typing.Any]]) -> typing.Tuple[str, typing.Union[typing.Dict[str, typing.Any], None]]:
+    """
+    Convert a (hashed) tree node (see tree()) into a Merkle node: (digest, children).
+    Children will be None for non-dirs.
+    """
+
+    if (not isinstance(node, dict)):
+        return str(node), None
+
+    children = {name: _merkle_node(child) for (name, child) in node.items()}
+
+    lines = []
+    for name in sorted(children.keys()):
+        digest, grandchildren = children[name]
+        kind = 'f' if (grandchildren is None) else 'd'
+        lines.append(json.dumps([kind, name, digest]))
+
+    return edq.util.hash.sha256_hex("\n".join(lines)), children
+
+def _diff_merkle_nodes(
+        a: typing.Union[typing.Tuple[str, typing.Any], None],
+        b: typing.Union[typing.Tuple[str, typing.Any], None],
+        relpath: str,
+        results: typing.List[typing.Tuple[str, str]],
+        ) -> None:
+    """ Recursive helper for diff_trees(). """
+
+    if (a is None):
+        results.append((relpath, TREE_DIFF_ADDED))
+        return
+
+    if (b is None):
+        results.append((relpath, TREE_DIFF_REMOVED))
+        return
+
+    a_digest, a_children = a
+    b_digest, b_children = b
+
+    if ((a_digest == b_digest) and ((a_children is None) == (b_children is None))):
+        return
+
+    if ((a_children is None) or (b_children is None)):
+        results.append((relpath, TREE_DIFF_MODIFIED))
+        return
+
+    for name in sorted(set(a_children.keys()) | set(b_children.keys())):
+        child_relpath = name if (relpath == '') else f"{relpath}/{name}"
+        _diff_merkle_nodes(a_children.get(name, None), b_children.get(name, None), child_relpath, results)
+
+WatchCallback = typing.Callable[[typing.List[typing.Tuple[str, str]]], None]
+""" A function that receives changes from a DirWatcher as (path, event) tuples. """
+
+class DirWatcher:
+    """
+    Watch a dir (recursively) for files being created, modified, or deleted.
+
+    Changes are passed to the callback (on a background thread) as a sorted list of (absolute path, event) tuples (see WATCH_EVENTS).
+    Changes are debounced: they are only reported once the dir has been quiet for `debounce_secs`,
+    and all the changes to a single file within that time are merged
+    (e.g., a file that was created and then deleted will not be reported).
+    Only files (and links) are reported, not dirs.
+    If `recursive` is false, then only the files directly inside the dir are watched.
+
+    On Linux inotify is used, on other platforms (or when `force_polling` is set) the dir is scanned every `poll_interval_secs`.
+    """
+
+    def __init__(self,
+            raw_path: str,
+            callback: WatchCallback,
+            debounce_secs: float = DEFAULT_WATCH_DEBOUNCE_SECS,
+            poll_interval_secs: float = DEFAULT_WATCH_POLL_INTERVAL_SECS,
+            force_polling: bool = False,
+            recursive: bool = True,
+            ) -> None:
+        self.path: str = os.path.abspath(raw_path)
+        """ The dir being watched. """
+
+        self.recursive: bool = recursive
+        """ Whether to also watch all the dirs under the dir. """
+
+        self.callback: WatchCallback = callback
+        """ The function changes are reported to. """
+
+        self.debounce_secs: float = debounce_secs
+        """ The time the dir must be quiet before changes are reported. """
+
+        self.poll_interval_secs: float = poll_interval_secs
+        """ The time between scans (when polling). """
+
+        self.force_polling: bool = force_polling
+        """ Poll even when inotify is available. """
+
+        self._snapshot: typing.Dict[str, typing.Tuple[int, int, int]] = {}
+        """ The last reported state of each file: {path: (inode, size, mtime_ns), ...}. """
+
+        self._last_scan: typing.Dict[str, typing.Tuple[int, int, int]] = {}
+        """ The most recent full scan (when polling). """
+
+        self._pending: typing.Set[str] = set()
+        """ Paths that have changed since changes were last reported. """
+
+        self._inotify: typing.Union[_Inotify, None] = None
+        """ The inotify instance (if not polling). """
+
+        self._wake_fds: typing.Union[typing.Tuple[int, int], None] = None
+        """ A pipe used to wake the watching thread when using inotify. """
+
+        self._stop_event: threading.Event = threading.Event()
+        """ Set when this watcher should stop. """
+
+        self._thread: typing.Union[threading.Thread, None] = None
+        """ The thread watching the dir. """
+
+    def start(self) -> None:
+        """ Start watching the dir (in a background thread). """
+
+        if (self._thread is not None):
+            raise ValueError(f"Watcher has already been started: '{self.path}'.")
+
+        if (not os.path.isdir(self.path)):
+            raise ValueError(f"Target of watch is not a dir: '{self.path}'.")
+
+        if (not self.force_polling):
+            self._inotify = _Inotify.create()
+
+        if (self._inotify is not None):
+            try:
+                # Add the watches before the initial scan, so no changes are missed.
+                self._inotify.add_tree(self.path, recursive = self.recursive)
+                self._wake_fds = os.pipe()
+            except OSError as ex:
+                _logger.debug("Failed to set up inotify, falling back to polling.", exc_info = ex)
+                self._inotify.close()
+                self._inotify = None
+
+        self._snapshot = _scan_watched_files(self.path, recursive = self.recursive)
+        self._last_scan = self._snapshot.copy()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target = self._run, daemon = True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """ Stop watching the dir (any unreported changes will be dropped). """
+
+        self._stop_event.set()
+
+        if (self._wake_fds is not None):
+            os.write(self._wake_fds[1], b'\0')
+
+        if (self._thread is not None):
+            self._thread.join()
+            self._thread = None
+
+        if (self._inotify is not None):
+            self._inotify.close()
+            self._inotify = None
+
+        if (self._wake_fds is not None):
+            for fd in self._wake_fds:
+                os.close(fd)
+
+            self._wake_fds = None
+
+    def is_polling(self) -> bool:
+        """ Check if this watcher is polling (instead of using inotify). """
+
+        return (self._inotify is None)
+
+    def _run(self) -> None:
+        """ Watch for changes until stopped. """
+
+        deadline = None
+
+        while (not self._stop_event.is_set()):
+            timeout = self.poll_interval_secs
+            if (deadline is not None):
+                timeout = max(0.0, deadline - time.monotonic())
+
+            if (self._inotify is not None):
+                changed = self._wait_inotify(timeout)
+            else:
+                changed = self._wait_poll(timeout)
+
+            if (self._stop_event.is_set()):
+                break
+
+            if (changed):
+                deadline = time.monotonic() + self.debounce_secs
+            elif ((deadline is not None) and (time.monotonic() >= deadline)):
+                deadline = None
+                self._report_changes()
+
+    def _wait_poll(self, timeout: float) -> bool:
+        """ Wait and then scan the dir, returning true if anything changed since the last scan. """
+
+        self._stop_event.wait(timeout)
+
+        scan = _scan_watched_files(self.path, recursive = self.recursive)
+        if (scan == self._last_scan):
+            return False
+
+        self._last_scan = scan
+        self._pending.add(self.path)
+
+        return True
+
+    def _wait_inotify(self, timeout: float) -> bool:
+        """ Wait for inotify events, returning true if any were found. """
+
+        if ((self._inotify is None) or (self._wake_fds is None)):
+            return False
+
+        ready, _, _ = select.select([self._inotify.fd, self._wake_fds[0]], [], [], timeout)
+        if (self._inotify.fd not in ready):
+            return False
+
+        try:
+            for (path, mask) in self._inotify.read():
+                if (mask & _IN_Q_OVERFLOW):
+                    # Events were dropped, rescan everything.
+                    path = self.path
+                elif ((mask & _IN_ISDIR) and (not self.recursive)):
+                    # Nested dirs are not watched.
+                    continue
+                elif (mask & _IN_ISDIR):
+                    if (mask & _IN_MOVED_FROM):
+                        self._inotify.remove_tree(path)
+                    elif (mask & (_IN_CREATE | _IN_MOVED_TO)):
+                        self._inotify.add_tree(path)
+
+                self._pending.add(path)
+        except OSError as ex:
+            # Usually, running out of watches.
+            _logger.warning("Failed to update inotify watches for '%s', falling back to polling.", self.path, exc_info = ex)
+
+            self._inotify.close()
+            self._inotify = None
+
+            self._last_scan = _scan_watched_files(self.path, recursive = self.recursive)
+            self._pending.add(self.path)
+
+        return True
+
+    def _report_changes(self) -> None:
+        """ Compare pending paths against the last reported state and report any changes. """
+
+        if (self._inotify is None):
+            scans = {self.path: self._last_scan}
+        else:
+            scans = {path: _scan_watched_files(path, recursive = self.recursive) for path in _remove_nested_paths(self._pending)}
+
+        self._pending.clear()
+
+        events = []
+        for (root, scan) in scans.items():
+            prefix = root + os.sep
+
+            for path in [path for path in self._snapshot if ((path == root) or path.startswith(prefix))]:
+                if (path not in scan):
+                    events.append((path, WATCH_EVENT_DELETED))
+                    del self._snapshot[path]
+
+            for (path, key) in scan.items():
+                old_key = self._snapshot.get(path, None)
+                if (old_key is None):
+                    events.append((path, WATCH_EVENT_CREATED))
+                elif (old_key != key):
+                    events.append((path, WATCH_EVENT_MODIFIED))
+
+                self._snapshot[path] = key
+
+        if (len(events) == 0):
+            return
+
+        try:
+            self.callback(sorted(events))
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _logger.error("Dir watcher callback failed for '%s'.", self.path, exc_info = ex)
+
+class _Inotify:
+    """ A minimal wrapper (via ctypes) around Linux's inotify. """
+
+    def __init__(self, libc: typing.Any, fd: int) -> None:
+        self._libc: typing.Any = libc
+        """ The C library providing inotify. """
+
+        self.fd: int = fd
+        """ The inotify file descriptor. """
+
+        self._watches: typing.Dict[int, str] = {}
+        """ The dir each watch descriptor is watching. """
+
+    @staticmethod
+    def create() -> typing.Union['_Inotify', None]:
+        """ Create an inotify instance, or return None if inotify is not available. """
+
+        if (sys.platform != 'linux'):
+            return None
+
+        try:
+            libc = ctypes.CDLL(None, use_errno = True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+
+        if (fd < 0):
+            return None
+
+        return _Inotify(libc, fd)
+
+    def add_tree(self, path: str, recursive: bool = True) -> None:
+        """ Watch a dir and (if recursive) all the dirs under it. """
+
+        dirs = [path]
+        while (len(dirs) > 0):
+            dirpath = dirs.pop()
+            if (not self._add_watch(dirpath)):
+                continue
+
+            if (not recursive):
+                break
+
+            try:
+                with os.scandir(dirpath) as entries:
+                    for entry in entries:
+                        if (entry.is_dir(follow_symlinks = False)):
+                            dirs.append(entry.path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+    def remove_tree(self, path: str) -> None:
+        """ Stop watching a dir and all the dirs under it. """
+
+        prefix = path + os.sep
+        for (wd, watch_path) in list(self._watches.items()):
+            if ((watch_path == path) or watch_path.startswith(prefix)):
+                self._libc.inotify_rm_watch(self.fd, wd)
+                del self._watches[wd]
+
+    def read(self) -> typing.List[typing.Tuple[str, int]]:
+        """ Read all available events as (path, mask) tuples. """
+
+        try:
+            data = os.read(self.fd, _INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        header_size = struct.calcsize(_INOTIFY_EVENT_FORMAT)
+
+        offset = 0
+        while ((offset + header_size) <= len(data)):
+            (wd, mask, _, name_length) = struct.unpack_from(_INOTIFY_EVENT_FORMAT, data, offset)
+            name = os.fsdecode(data[(offset + header_size):(offset + header_size + name_length)].rstrip(b'\0'))
+            offset += (header_size + name_length)
+
+            if (mask & _IN_IGNORED):
+                self._watches.pop(wd, None)
+                continue
+
+            if (mask & _IN_Q_OVERFLOW):
+                events.append(('', mask))
+                continue
+
+            dirpath = self._watches.get(wd, None)
+            if (dirpath is None):
+                continue
+
+            path = dirpath
+            if (name != ''):
+                path = os.path.join(dirpath, name)
+
+            events.append((path, mask))
+
+        return events
+
+    def close(self) -> None:
+        """ Close the inotify file descriptor. """
+
+        os.close(self.fd)
+        self._watches.clear()
+
+    def _add_watch(self, path: str) -> bool:
+        """ Watch a single dir, returning false if the dir no longer exists. """
+
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _INOTIFY_WATCH_MASK)
+        if (wd >= 0):
+            self._watches[wd] = path
+            return True
+
+        error_number = ctypes.get_errno()
+        if (error_number in (errno.ENOENT, errno.ENOTDIR)):
+            return False
+
+        raise OSError(error_number, os.strerror(error_number), path)
+
+def _scan_watched_files(path: str, recursive: bool = True) -> typing.Dict[str, typing.Tuple[int, int, int]]:
+    """
+    Get the state of all the files at/under a path: {path: (inode, size, mtime_ns), ...}.
+    If not recursive, then only the files directly inside the path are included.
+    """
+
+    result: typing.Dict[str, typing.Tuple[int, int, int]] = {}
+
+    try:
+        stat_result = os.lstat(path)
+    except FileNotFoundError:
+        return result
+
+    if (not stat.S_ISDIR(stat_result.st_mode)):
+        result[path] = (stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+        return result
+
+    dirs = [path]
+    while (len(dirs) > 0):
+        try:
+            with os.scandir(dirs.pop()) as entries:
+                for entry in entries:
+                    if (entry.is_dir(follow_symlinks = False)):
+                        if (recursive):
+                            dirs.append(entry.path)
+
+                        continue
+
+                    try:
+                        stat_result = entry.stat(follow_symlinks = False)
+                    except FileNotFoundError:
+                        continue
+
+                    result[entry.path] = (stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+    return result
+
+def _remove_nested_paths(paths: typing.Iterable[str]) -> typing.List[str]:
+    """ Remove any paths that are under another path in the collection. """
+
+    result: typing.List[str] = []
+    for path in sorted(paths):
+        if ((len(result) > 0) and ((path == result[-1]) or path.startswith(result[-1] + os.sep))):
+            continue
+
+        result.append(path)
+
+    return result
+
+def _run_parallel(
+        function: typing.Callable[..., typing.Any],
+        args_list: typing.Sequence[typing.Tuple[typing.Any, ...]],
+        workers: typing.Union[int, None] = None,
+        ) -> typing.List[typing.Any]:
+    """
+    Call a function with each set of args across a thread pool and return the results (in order).
+    Small batches (or a single worker) will be run serially.
+    The first exception raised will be re-raised.
+    """
+
+    if (workers is None):
+        workers = DEFAULT_WORKERS
+
+    if ((workers <= 1) or (len(args_list) < PARALLEL_MIN_ITEMS)):
+        return list(itertools.starmap(function, args_list))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers = workers) as executor:
+        futures = []
+        for (i, args) in enumerate(args_list):
+            try:
+                futures.append(executor.submit(function, *args))
+            except RuntimeError:
+                # New threads cannot be started once the interpreter is shutting down (e.g., in atexit), so finish serially.
+                return [future.result() for future in futures] + list(itertools.starmap(function, args_list[i:]))
+
+        return [future.result() for future in futures]
+
+def _tree(
+        path: str,
+        parent: typing.Dict[str, typing.Any],
+        name: str,
+        leaves: typing.List[typing.Tuple[typing.Dict[str, typing.Any], str, str]],
+        level: int,
+        ) -> None:
+    """
+    Recursive helper for tree().
+    The node for this path will be placed in `parent[name]`.
+    Non-dirs will be given a value of None, and recorded in `leaves` as (parent, name, path).
+    """
+
+    if (level > DEPTH_LIMIT):
+        raise ValueError("Depth limit reached.")
+
+    if (not os.path.isdir(path)):
+        parent[name] = None
+        leaves.append((parent, name, path))
+        return
+
+    result: typing.Dict[str, typing.Any] = {}
+    parent[name] = result
+
+    for child in sorted(os.listdir(path)):
+        _tree(os.path.join(path, child), result, child, leaves, level + 1)
@@ -1,9 +1,13 @@
 import os
+import stat
 import sys
+import threading
+import time
 import typing
 
 import edq.testing.unittest
 import edq.util.dirent
+import edq.util.json
 
 DIRENT_TYPE_DIR: str = 'dir'
 DIRENT_TYPE_FILE: str = 'file'
@@ -182,6 +186,24 @@ class TestDirent(edq.testing.unittest.BaseTest):
                 None,
             ),
 
+            # Atomic
+            (
+                "a.txt",
+                {'atomic': True},
+                {},
+                "test",
+                "test",
+                None,
+            ),
+            (
+                "dir_1",
+                {'atomic': True, 'fsync_dir': True},
+                {},
+                "test",
+                "test",
+                None,
+            ),
+
             # No Clobber
             (
                 "a.txt",
@@ -347,6 +369,48 @@ class TestDirent(edq.testing.unittest.BaseTest):
                 None,
             ),
 
+            # Atomic
+            (
+                "test.txt",
+                {'atomic': True},
+                {},
+                "test",
+                "test",
+                None,
+            ),
+            (
+                "a.txt",
+                {'atomic': True, 'fsync_dir': True},
+                {},
+                "test",
+                "test",
+                None,
+            ),
+            (
+                "dir_1",
+                {'atomic': True},
+                {},
+                "test",
+                "test",
+                None,
+            ),
+            (
+                "symlink_a.txt",
+                {'atomic': True},
+                {},
+                "test",
+                "test",
+                None,
+            ),
+            (
+                "a.txt",
+                {'atomic': True, 'no_clobber': True},
+                {},
+                "test",
+                "test",
+                'Destination of write already exists',
+            ),
+
             # No Clobber
             (
                 "a.txt",
@@ -398,6 +462,415 @@ class TestDirent(edq.testing.unittest.BaseTest):
 
                 self.assertEqual(expected_contents, actual_contents)
 
+    def test_open_atomic(self) -> None:
+        """ Test that atomic writes either fully replace a file or leave it untouched. """
+
+        temp_dir = self._prep_temp_dir()
+        path = os.path.join(temp_dir, 'a.txt')
+
+        with edq.util.dirent.open_atomic(path, 'w') as file:
+            file.write('new')
+
+            # The old contents are still visible until the write completes.
+            self.assertEqual('a', edq.util.dirent.read_file(path))
+
+        self.assertEqual('new', edq.util.dirent.read_file(path))
+
+        try:
+            with edq.util.dirent.open_atomic(path, 'wb') as file:
+                file.write(b'partial')
+                raise RuntimeError('Failed write.')
+        except RuntimeError:
+            pass
+
+        self.assertEqual('new', edq.util.dirent.read_file(path))
+
+        # No temp files should be left behind.
+        self.assertEqual([], [name for name in os.listdir(temp_dir) if name.endswith('.tmp')])
+
+        try:
+            with edq.util.dirent.open_atomic(path, 'a'):
+                pass
+        except ValueError as ex:
+            self.assertIn('Unsupported mode for atomic open', self.format_error_string(ex))
+        else:
+            self.fail('Did not get expected error.')
+
+    def test_open_atomic_preserve(self) -> None:
+        """ Test that atomic writes keep symlinks and file permissions. """
+
+        temp_dir = self._prep_temp_dir()
+        path = os.path.join(temp_dir, 'a.txt')
+        link_path = os.path.join(temp_dir, 'link.txt')
+
+        os.symlink(path, link_path)
+
+        with edq.util.dirent.open_atomic(link_path, 'w') as file:
+            file.write('new')
+
+        # The link is kept, and its target is replaced.
+        self.assertTrue(os.path.islink(link_path))
+        self.assertEqual('new', edq.util.dirent.read_file(path))
+        self.assertEqual([], [name for name in os.listdir(temp_dir) if name.endswith('.tmp')])
+
+        if (sys.platform == 'win32'):
+            return
+
+        os.chmod(path, 0o600)
+
+        with edq.util.dirent.open_atomic(path, 'w') as file:
+            file.write('newer')
+
+        self.assertEqual('newer', edq.util.dirent.read_file(path))
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(path).st_mode))
+
+    def test_lock_path(self) -> None:
+        """ Test that path locks are exclusive across lockers. """
+
+        temp_dir = self._prep_temp_dir()
+        path = os.path.join(temp_dir, 'a.txt')
+
+        with edq.util.dirent.lock_path(path):
+            try:
+                with edq.util.dirent.lock_path(path, timeout_secs = 0.1):
+                    self.fail('Acquired a held lock.')
+            except TimeoutError as ex:
+                self.assertIn('Timed out waiting for the lock', self.format_error_string(ex))
+            else:
+                self.fail('Did not get expected error.')
+
+        # The lock is released on exit.
+        with edq.util.dirent.lock_path(path, timeout_secs = 0.1):
+            pass
+
+        # The locked path itself is untouched, and the lock file is left next to it.
+        self.assertEqual('a', edq.util.dirent.read_file(path))
+        self.assertTrue(os.path.isfile(os.path.join(temp_dir, '.a.txt.lock')))
+
+        # A link shares the lock of its target.
+        link_path = os.path.join(temp_dir, 'link.txt')
+        os.symlink(path, link_path)
+
+        with edq.util.dirent.lock_path(link_path):
+            try:
+                with edq.util.dirent.lock_path(path, timeout_secs = 0.1):
+                    self.fail('Acquired a held lock through a link.')
+            except TimeoutError:
+                pass
+            else:
+                self.fail('Did not get expected error.')
+
+        self.assertFalse(os.path.exists(os.path.join(temp_dir, '.link.txt.lock')))
+
+    def test_map_file(self) -> None:
+        """ Test memory-mapping files. """
+
+        temp_dir = self._prep_temp_dir()
+        edq.util.dirent.write_file_bytes(os.path.join(temp_dir, 'zero.bin'), b'')
+
+        # [(path, expected contents, error substring), ...]
+        test_cases = [
+            ('a.txt', b'a\n', None),
+            ('zero.bin', b'', None),
+            ('symlink_a.txt', b'a\n', None),
+            ('dir_1', None, 'Source of map is not a file'),
+            ('missing.txt', None, 'Source of map does not exist'),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (path, expected_contents, error_substring) = test_case
+
+            with self.subTest(msg = f"Case {i} ('{path}'):"):
+                try:
+                    with edq.util.dirent.map_file(os.path.join(temp_dir, path)) as contents:
+                        self.assertTrue(contents.readonly)
+                        actual_contents = bytes(contents)
+                except Exception as ex:
+                    error_string = self.format_error_string(ex)
+                    if (error_substring is None):
+                        self.fail(f"Unexpected error: '{error_string}'.")
+
+                    self.assertIn(error_substring, error_string, 'Error is not as expected.')
+
+                    continue
+
+                if (error_substring is not None):
+                    self.fail(f"Did not get expected error: '{error_substring}'.")
+
+                self.assertEqual(expected_contents, actual_contents)
+
+        # Views cannot outlive their context.
+        leaked_views = []
+        try:
+            with edq.util.dirent.map_file(os.path.join(temp_dir, 'a.txt')) as contents:
+                leaked_views.append(contents[0:1])
+        except ValueError as ex:
+            self.assertIn('still in use', self.format_error_string(ex))
+        else:
+            self.fail('Did not get expected error.')
+        finally:
+            for view in leaked_views:
+                view.release()
+
+    def test_read_write_files(self) -> None:
+        """ Test reading and writing many files in bulk. """
+
+        temp_dir = self._prep_temp_dir()
+
+        # Enough files to use a thread pool.
+        contents: typing.Dict[str, typing.Union[str, bytes, None]] = {}
+        for i in range(edq.util.dirent.PARALLEL_MIN_ITEMS * 2):
+            contents[os.path.join(temp_dir, 'bulk', f"{i:03d}", 'file.txt')] = f" {i} "
+
+        # Clobber an existing file, dir, and link.
+        contents[os.path.join(temp_dir, 'a.txt')] = 'new a'
+        contents[os.path.join(temp_dir, 'dir_1')] = 'new dir_1'
+        contents[os.path.join(temp_dir, 'symlink_a.txt')] = 'new link'
+
+        # Clobber a hardlinked file.
+        source_path = os.path.join(temp_dir, 'source.txt')
+        edq.util.dirent.write_file(source_path, 'source')
+        os.link(source_path, os.path.join(temp_dir, 'hardlink.txt'))
+        contents[os.path.join(temp_dir, 'hardlink.txt')] = 'new hardlink'
+
+        contents[os.path.join(temp_dir, 'bytes.bin')] = b' \x00 '
+        contents[os.path.join(temp_dir, 'none.txt')] = None
+
+        errors = edq.util.dirent.write_files(contents, make_dirs = True)
+        self.assertEqual({}, errors)
+
+        # The links were replaced (not written through).
+        self.assertFalse(os.path.islink(os.path.join(temp_dir, 'symlink_a.txt')))
+        self.assertEqual('source', edq.util.dirent.read_file(source_path))
+
+        # No temp files should be left behind.
+        self.assertEqual([], [name for name in os.listdir(temp_dir) if name.endswith('.tmp')])
+
+        missing_path = os.path.join(temp_dir, 'missing.txt')
+        dir_path = os.path.join(temp_dir, 'dir_empty')
+        paths = list(contents.keys()) + [missing_path, dir_path]
+
+        actual_contents, errors = edq.util.dirent.read_files(paths)
+
+        self.assertEqual([dir_path, missing_path], sorted(errors.keys()))
+        self.assertIn('Source of read does not exist', errors[missing_path])
+
+        for (path, expected_contents) in contents.items():
+            if (isinstance(expected_contents, bytes)):
+                self.assertEqual(expected_contents.decode().strip(), actual_contents[path])
+            else:
+                self.assertEqual((expected_contents or '').strip(), actual_contents[path])
+
+        actual_contents, errors = edq.util.dirent.read_files([os.path.join(temp_dir, 'bytes.bin')], binary = True)
+        self.assertEqual({}, errors)
+        self.assertEqual(b' \x00 ', actual_contents[os.path.join(temp_dir, 'bytes.bin')])
+
+        # Missing parent dirs.
+        errors = edq.util.dirent.write_files({os.path.join(temp_dir, 'missing', 'a.txt'): 'a'})
+        self.assertEqual(1, len(errors))
+
+    def test_dir_watcher(self) -> None:
+        """ Test watching a dir for changes (with inotify (when available) and polling). """
+
+        for force_polling in [False, True]:
+            with self.subTest(msg = f"Polling: {force_polling}:"):
+                temp_dir = self._prep_temp_dir()
+                reported: typing.List[typing.Tuple[str, str]] = []
+                reported_event = threading.Event()
+
+                def _callback(events: typing.List[typing.Tuple[str, str]]) -> None:
+                    reported.extend(events)  # pylint: disable=cell-var-from-loop
+                    reported_event.set()  # pylint: disable=cell-var-from-loop
+
+                watcher = edq.util.dirent.DirWatcher(temp_dir, _callback,
+                        debounce_secs = 0.05, poll_interval_secs = 0.05, force_polling = force_polling)
+                watcher.start()
+
+                try:
+                    if (force_polling):
+                        self.assertTrue(watcher.is_polling())
+
+                    # Wait long enough for mtimes to be distinguishable.
+                    time.sleep(0.05)
+
+                    edq.util.dirent.write_file(os.path.join(temp_dir, 'a.txt'), 'new a')
+                    edq.util.dirent.remove(os.path.join(temp_dir, 'dir_1', 'b.txt'))
+                    edq.util.dirent.write_file(os.path.join(temp_dir, 'new.txt'), 'new')
+
+                    edq.util.dirent.mkdir(os.path.join(temp_dir, 'new_dir', 'nested'))
+                    edq.util.dirent.write_file(os.path.join(temp_dir, 'new_dir', 'nested', 'd.txt'), 'd')
+
+                    # A file that is created and then deleted (before the debounce) will not be reported.
+                    edq.util.dirent.write_file(os.path.join(temp_dir, 'temp.txt'), 'temp')
+                    edq.util.dirent.remove(os.path.join(temp_dir, 'temp.txt'))
+
+                    self.assertTrue(reported_event.wait(5.0), 'Changes were not reported.')
+
+                    # Allow any trailing events to be reported.
+                    time.sleep(0.3)
+                finally:
+                    watcher.stop()
+
+                expected = [
+                    (os.path.join(temp_dir, 'a.txt'), edq.util.dirent.WATCH_EVENT_MODIFIED),
+                    (os.path.join(temp_dir, 'dir_1', 'b.txt'), edq.util.dirent.WATCH_EVENT_DELETED),
+                    (os.path.join(temp_dir, 'new.txt'), edq.util.dirent.WATCH_EVENT_CREATED),
+                    (os.path.join(temp_dir, 'new_dir', 'nested', 'd.txt'), edq.util.dirent.WATCH_EVENT_CREATED),
+                ]
+
+                self.assertEqual(expected, sorted(reported))
+
+    def test_walk_files(self) -> None:
+        """ Test walking (and listing) dirs with the walk cache. """
+
+        temp_dir = self._prep_temp_dir()
+        edq.util.dirent.write_file(os.path.join(temp_dir, 'dir_1', 'd.json'), '{}')
+        edq.util.dirent.write_file(os.path.join(temp_dir, '.hidden.txt'), 'hidden')
+        edq.util.dirent.mkdir(os.path.join(temp_dir, '.hidden_dir'))
+        edq.util.dirent.write_file(os.path.join(temp_dir, '.hidden_dir', 'e.txt'), 'e')
+
+        # A link loop.
+        os.symlink(temp_dir, os.path.join(temp_dir, '.hidden_dir', 'loop'))
+
+        # [(kwargs, expected relpaths, error substring), ...]
+        test_cases: typing.List[typing.Tuple[typing.Dict[str, typing.Any], typing.List[str], typing.Union[str, None]]] = [
+            (
+                {'follow_links': False},
+                [
+                    'a.txt',
+                    os.path.join('dir_1', 'b.txt'),
+                    os.path.join('dir_1', 'd.json'),
+                    os.path.join('dir_1', 'dir_2', 'c.txt'),
+                    'file_empty',
+                    'symlink_a.txt',
+                    'symlink_dir_1',
+                    'symlink_dir_empty',
+                    'symlink_file_empty',
+                ],
+                None,
+            ),
+            (
+                {'extensions': '.txt', 'follow_links': False},
+                ['a.txt', os.path.join('dir_1', 'b.txt'), os.path.join('dir_1', 'dir_2', 'c.txt'), 'symlink_a.txt'],
+                None,
+            ),
+            (
+                {'extensions': ['.json', '_empty'], 'follow_links': False},
+                [os.path.join('dir_1', 'd.json'), 'file_empty', 'symlink_dir_empty', 'symlink_file_empty'],
+                None,
+            ),
+            (
+                {'pattern': '[bc].*', 'follow_links': False},
+                [os.path.join('dir_1', 'b.txt'), os.path.join('dir_1', 'dir_2', 'c.txt')],
+                None,
+            ),
+            (
+                {'extensions': '.txt', 'include_hidden': True, 'follow_links': False},
+                [
+                    '.hidden.txt',
+                    os.path.join('.hidden_dir', 'e.txt'),
+                    'a.txt',
+                    os.path.join('dir_1', 'b.txt'),
+                    os.path.join('dir_1', 'dir_2', 'c.txt'),
+                    'symlink_a.txt',
+                ],
+                None,
+            ),
+            (
+                {},
+                [
+                    'a.txt',
+                    os.path.join('dir_1', 'b.txt'),
+                    os.path.join('dir_1', 'd.json'),
+                    os.path.join('dir_1', 'dir_2', 'c.txt'),
+                    'file_empty',
+                    'symlink_a.txt',
+                    os.path.join('symlink_dir_1', 'b.txt'),
+                    os.path.join('symlink_dir_1', 'd.json'),
+                    os.path.join('symlink_dir_1', 'dir_2', 'c.txt'),
+                    'symlink_file_empty',
+                ],
+                None,
+            ),
+            (
+                {'pattern': '[bc].*'},
+                [
+                    os.path.join('dir_1', 'b.txt'),
+                    os.path.join('dir_1', 'dir_2', 'c.txt'),
+                    os.path.join('symlink_dir_1', 'b.txt'),
+                    os.path.join('symlink_dir_1', 'dir_2', 'c.txt'),
+                ],
+                None,
+            ),
+            (
+                {'extensions': '.txt', 'include_hidden': True},
+                [
+                    '.hidden.txt',
+                    os.path.join('.hidden_dir', 'e.txt'),
+                    'a.txt',
+                    os.path.join('dir_1', 'b.txt'),
+                    os.path.join('dir_1', 'dir_2', 'c.txt'),
+                    'symlink_a.txt',
+                    os.path.join('symlink_dir_1', 'b.txt'),
+                    os.path.join('symlink_dir_1', 'dir_2', 'c.txt'),
+                ],
+                None,
+            ),
+            (
+                {'raw_path': os.path.join(temp_dir, 'dir_1')},
+                [os.path.join('dir_1', 'b.txt'), os.path.join('dir_1', 'd.json'), os.path.join('dir_1', 'dir_2', 'c.txt')],
+                None,
+            ),
+            (
+                {'raw_path': os.path.join(temp_dir, 'ZZZ')},
+                [],
+                None,
+            ),
+            (
+                {'raw_path': os.path.join(temp_dir, 'a.txt')},
+                [],
+                'Target of walk is not a dir',
+            ),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (options, expected_relpaths, error_substring) = test_case
+
+            with self.subTest(msg = f"Case {i} ({options}):"):
+                options = options.copy()
+                raw_path = options.pop('raw_path', temp_dir)
+
+                try:
+                    # Walk twice (the second walk may use the cache).
+                    uncached_paths = edq.util.dirent.walk_files(raw_path, use_cache = False, **options)
+                    edq.util.dirent.walk_files(raw_path, **options)
+                    cached_paths = edq.util.dirent.walk_files(raw_path, **options)
+                except Exception as ex:
+                    error_string = self.format_error_string(ex)
+                    if (error_substring is None):
+                        self.fail(f"Unexpected error: '{error_string}'.")
+
+                    self.assertIn(error_substring, error_string, 'Error is not as expected.')
+
+                    continue
+
+                if (error_substring is not None):
+                    self.fail(f"Did not get expected error: '{error_substring}'.")
+
+                expected_paths = [os.path.join(temp_dir, relpath) for relpath in expected_relpaths]
+                self.assertEqual(expected_paths, uncached_paths)
+                self.assertEqual(expected_paths, cached_paths)
+
+        # Changes to a dir invalidate its cached listing (even if the mtime is old).
+        old_time_ns = 10 ** 18
+        os.utime(os.path.join(temp_dir, 'dir_1'), ns = (old_time_ns, old_time_ns))
+        self.assertNotIn('new.txt', edq.util.dirent.list_dir(os.path.join(temp_dir, 'dir_1')))
+
+        edq.util.dirent.write_file(os.path.join(temp_dir, 'dir_1', 'new.txt'), 'new')
+        self.assertIn('new.txt', edq.util.dirent.list_dir(os.path.join(temp_dir, 'dir_1')))
+
+        edq.util.dirent.clear_walk_cache()
+
     def test_copy_contents_base(self) -> None:
         """ Test copying the contents of a dirent. """
 
@@ -541,6 +1014,106 @@ class TestDirent(edq.testing.unittest.BaseTest):
 
                 self._check_existing_paths(temp_dir, checks)
 
+    def test_copy_parallel(self) -> None:
+        """ Test copying a tree large enough to be copied in parallel. """
+
+        temp_dir = self._prep_temp_dir()
+        source = os.path.join(temp_dir, 'large')
+
+        for i in range(5):
+            edq.util.dirent.mkdir(os.path.join(source, f"dir_{i}"))
+            for j in range(edq.util.dirent.PARALLEL_MIN_ITEMS):
+                edq.util.dirent.write_file(os.path.join(source, f"dir_{i}", f"file_{j}.txt"), f"{i} {j}" * (j + 1))
+
+        os.symlink('file_0.txt', os.path.join(source, 'dir_0', 'symlink_file_0.txt'))
+        os.chmod(os.path.join(source, 'dir_0', 'file_0.txt'), 0o600)
+
+        # [(workers, copy contents?), ...]
+        test_cases = [
+            (1, False),
+            (4, False),
+            (None, False),
+            (4, True),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (workers, contents) = test_case
+
+            with self.subTest(msg = f"Case {i} (workers: {workers}, contents: {contents}):"):
+                dest = os.path.join(temp_dir, f"large_copy_{i}")
+
+                if (contents):
+                    edq.util.dirent.copy_contents(source, dest, workers = workers)
+                else:
+                    edq.util.dirent.copy(source, dest, workers = workers)
+
+                expected = list(edq.util.dirent.tree(source, hash_files = True).values())[0]
+                actual = list(edq.util.dirent.tree(dest, hash_files = True).values())[0]
+                self.assertEqual(expected, actual)
+
+                self.assertTrue(os.path.islink(os.path.join(dest, 'dir_0', 'symlink_file_0.txt')))
+
+                source_stat = os.stat(os.path.join(source, 'dir_0', 'file_0.txt'))
+                dest_stat = os.stat(os.path.join(dest, 'dir_0', 'file_0.txt'))
+                self.assertEqual(source_stat.st_mode, dest_stat.st_mode)
+                self.assertEqual(int(source_stat.st_mtime), int(dest_stat.st_mtime))
+
+    def test_copy_modes(self) -> None:
+        """ Test copying with each copy mode. """
+
+        for mode in edq.util.dirent.COPY_MODES:
+            with self.subTest(msg = f"Mode '{mode}':"):
+                temp_dir = self._prep_temp_dir()
+
+                source = os.path.join(temp_dir, 'dir_1')
+                dest = os.path.join(temp_dir, 'dest')
+
+                edq.util.dirent.copy(source, dest, mode = mode)
+                edq.util.dirent.copy_contents(source, os.path.join(temp_dir, 'dest_contents'), mode = mode)
+
+                for path in [dest, os.path.join(temp_dir, 'dest_contents')]:
+                    self.assertEqual(
+                        list(edq.util.dirent.tree(source, hash_files = True).values())[0],
+                        list(edq.util.dirent.tree(path, hash_files = True).values())[0],
+                    )
+
+                source_path = os.path.join(source, 'b.txt')
+                dest_path = os.path.join(dest, 'b.txt')
+
+                # Only hardlinks will share the same file.
+                is_hardlink = (mode == edq.util.dirent.COPY_MODE_HARDLINK)
+                self.assertEqual(is_hardlink, os.path.samefile(source_path, dest_path))
+
+                # Breaking the link allows independent writes.
+                self.assertEqual(is_hardlink, edq.util.dirent.break_link(dest_path))
+                self.assertFalse(os.path.samefile(source_path, dest_path))
+
+                with open(dest_path, 'a', encoding = edq.util.dirent.DEFAULT_ENCODING) as file:
+                    file.write('z')
+
+                self.assertEqual('b', edq.util.dirent.read_file(source_path))
+                self.assertEqual("b\nz", edq.util.dirent.read_file(dest_path))
+
+                # All the write helpers replace files, so they never write through to the source.
+                edq.util.dirent.copy(source, os.path.join(temp_dir, 'dest_writes'), mode = mode)
+                for name in ['b.txt', os.path.join('dir_2', 'c.txt')]:
+                    write_path = os.path.join(temp_dir, 'dest_writes', name)
+                    self.assertEqual(is_hardlink, os.path.samefile(os.path.join(source, name), write_path))
+
+                edq.util.dirent.write_file(os.path.join(temp_dir, 'dest_writes', 'b.txt'), 'new')
+                edq.util.dirent.write_file_bytes(os.path.join(temp_dir, 'dest_writes', 'dir_2', 'c.txt'), b'new', atomic = True)
+                edq.util.dirent.write_files({os.path.join(dest, 'dir_2', 'c.txt'): 'new'})
+
+                self.assertEqual('b', edq.util.dirent.read_file(source_path))
+                self.assertEqual('c', edq.util.dirent.read_file(os.path.join(source, 'dir_2', 'c.txt')))
+
+        try:
+            edq.util.dirent.copy(os.path.join(temp_dir, 'a.txt'), os.path.join(temp_dir, 'ZZZ'), mode = 'ZZZ')
+        except Exception as ex:
+            self.assertIn("Unknown copy mode 'ZZZ'", self.format_error_string(ex))
+        else:
+            self.fail('Did not get expected error.')
+
     def test_copy_special_matching_subdir_name(self) -> None:
         """ Test copying a special case of copying a files into themselves with matching names. """
 
@@ -934,6 +1507,82 @@ class TestDirent(edq.testing.unittest.BaseTest):
         self._check_nonexisting_paths(temp_dir, remove_relpaths)
         self._check_existing_paths(temp_dir, expected_paths)
 
+    def test_remove_parallel(self) -> None:
+        """ Test removing large dirs in parallel and in the background. """
+
+        # [(remove kwargs), ...]
+        test_cases: typing.List[typing.Dict[str, typing.Any]] = [
+            {},
+            {'workers': 1},
+            {'workers': 4},
+            {'background': True},
+        ]
+
+        for (i, remove_options) in enumerate(test_cases):
+            with self.subTest(msg = f"Case {i} ({remove_options}):"):
+                temp_dir = self._prep_temp_dir()
+                target = os.path.join(temp_dir, 'large')
+
+                for dir_index in range(edq.util.dirent.PARALLEL_MIN_ITEMS):
+                    for file_index in range(4):
+                        path = os.path.join(target, f"dir_{dir_index}", 'nested', f"file_{file_index}.txt")
+                        edq.util.dirent.mkdir(os.path.dirname(path))
+                        edq.util.dirent.write_file(path, str(file_index))
+
+                os.symlink(os.path.join(temp_dir, 'dir_1'), os.path.join(target, 'symlink_dir_1'))
+
+                edq.util.dirent.remove(target, **remove_options)
+
+                # The path should be free immediately (even for background removals).
+                self.assertFalse(edq.util.dirent.exists(target))
+
+                edq.util.dirent.wait_for_removals()
+
+                # Links are removed, not followed.
+                self._check_existing_paths(temp_dir, [(os.path.join('dir_1', 'b.txt'), DIRENT_TYPE_FILE)])
+
+                # No background temp dirs should be left behind.
+                self.assertEqual([], [name for name in os.listdir(temp_dir) if name.endswith('.removing')])
+
+    def test_remove_deep(self) -> None:
+        """ Test removing a tree that is deeper than the recursion limit. """
+
+        if (not edq.util.dirent._FD_REMOVE_SUPPORTED):
+            self.skipTest('Removing relative to dir file descriptors is not supported.')
+
+        temp_dir = self._prep_temp_dir()
+        target = os.path.join(temp_dir, 'deep')
+
+        # Build the tree one level at a time (os.makedirs() is recursive).
+        leaf = target
+        os.mkdir(leaf)
+        for _ in range(sys.getrecursionlimit() + 10):
+            leaf = os.path.join(leaf, 'd')
+            os.mkdir(leaf)
+
+        edq.util.dirent.write_file(os.path.join(leaf, 'leaf.txt'), 'leaf')
+
+        edq.util.dirent._remove_subtree(target)
+
+        self.assertFalse(edq.util.dirent.exists(target))
+
+    def test_remove_background_errors(self) -> None:
+        """ Test that failed background removals are reported. """
+
+        temp_dir = self._prep_temp_dir()
+        missing_path = os.path.join(temp_dir, 'missing')
+
+        self.assertEqual([], edq.util.dirent.wait_for_removals())
+
+        edq.util.dirent._get_removal_queue().put((missing_path, None))
+
+        errors = edq.util.dirent.wait_for_removals()
+        self.assertEqual([missing_path], [path for (path, _) in errors])
+        self.assertIsInstance(errors[0][1], FileNotFoundError)
+
+        # Errors are only reported once.
+        self.assertEqual([], edq.util.dirent.wait_for_removals())
+
     def test_tree_base(self) -> None:
         """
         Test getting a recursive tree for a directory.
@@ -1003,6 +1652,114 @@ class TestDirent(edq.testing.unittest.BaseTest):
 
         self.assertJSONEqual(expected, actual)
 
+    def test_tree_digest_diff(self) -> None:
+        """ Test tree digests and diffs. """
+
+        temp_dir = self._prep_temp_dir()
+
+        source = os.path.join(temp_dir, 'dir_1')
+        dest = os.path.join(temp_dir, 'dir_1_copy')
+        edq.util.dirent.copy(source, dest)
+
+        self.assertEqual(edq.util.dirent.tree_digest(source), edq.util.dirent.tree_digest(dest))
+        self.assertEqual([], edq.util.dirent.diff_trees(source, dest))
+
+        edq.util.dirent.write_file(os.path.join(dest, 'b.txt'), 'z')
+        edq.util.dirent.write_file(os.path.join(dest, 'new.txt'), 'new')
+        edq.util.dirent.remove(os.path.join(dest, 'dir_2'))
+        edq.util.dirent.mkdir(os.path.join(dest, 'dir_3'))
+
+        self.assertNotEqual(edq.util.dirent.tree_digest(source), edq.util.dirent.tree_digest(dest))
+
+        expected = [
+            ('b.txt', edq.util.dirent.TREE_DIFF_MODIFIED),
+            ('dir_2', edq.util.dirent.TREE_DIFF_REMOVED),
+            ('dir_3', edq.util.dirent.TREE_DIFF_ADDED),
+            ('new.txt', edq.util.dirent.TREE_DIFF_ADDED),
+        ]
+        self.assertEqual(expected, edq.util.dirent.diff_trees(source, dest))
+
+        # A file replaced with an empty dir.
+        edq.util.dirent.remove(os.path.join(dest, 'b.txt'))
+        edq.util.dirent.mkdir(os.path.join(dest, 'b.txt'))
+        self.assertIn(('b.txt', edq.util.dirent.TREE_DIFF_MODIFIED), edq.util.dirent.diff_trees(source, dest))
+
+    def test_hash_files_cached(self) -> None:
+        """ Test that file hashes are cached in memory and in a sidecar. """
+
+        temp_dir = self._prep_temp_dir()
+        cache_path = os.path.join(edq.util.dirent.get_temp_dir(prefix = 'edq_test_dirent_cache_'), 'cache.json')
+
+        path = os.path.join(temp_dir, 'a.txt')
+        original_hash = edq.util.dirent.hash_file(path)
+
+        # Make the file old enough to be cached.
+        old_time_ns = 10 ** 18
+        os.utime(path, ns = (old_time_ns, old_time_ns))
+
+        edq.util.dirent.clear_hash_cache()
+        self.assertEqual([original_hash], edq.util.dirent.hash_files_cached([path], cache_path = cache_path))
+        self.assertTrue(os.path.exists(cache_path))
+
+        # Change the content in-place without changing the size, inode, or mtime.
+        with open(path, 'r+b') as file:
+            file.write(b'z')
+
+        os.utime(path, ns = (old_time_ns, old_time_ns))
+
+        # The cached (now stale) hash is used from memory and then the sidecar.
+        self.assertEqual([original_hash], edq.util.dirent.hash_files_cached([path]))
+        edq.util.dirent.clear_hash_cache()
+        self.assertEqual([original_hash], edq.util.dirent.hash_files_cached([path], cache_path = cache_path))
+
+        # Without any cache, the file is re-read.
+        edq.util.dirent.clear_hash_cache()
+        new_hash = edq.util.dirent.hash_files_cached([path])[0]
+        self.assertNotEqual(original_hash, new_hash)
+        self.assertEqual(edq.util.dirent.hash_file(path), new_hash)
+
+        # Any change to the mtime invalidates the cache.
+        with open(path, 'r+b') as file:
+            file.write(b'y')
+
+        os.utime(path, ns = (old_time_ns, old_time_ns + 1))
+        self.assertNotEqual(new_hash, edq.util.dirent.hash_files_cached([path])[0])
+        self.assertEqual(edq.util.dirent.hash_file(path), edq.util.dirent.hash_files_cached([path])[0])
+
+    def test_hash_files_cached_scope(self) -> None:
+        """ Test that the hash cache is bounded and that sidecars only hold their own paths. """
+
+        temp_dir = self._prep_temp_dir()
+        cache_dir = edq.util.dirent.get_temp_dir(prefix = 'edq_test_dirent_cache_')
+
+        paths = [os.path.join(temp_dir, 'a.txt'), os.path.join(temp_dir, 'dir_1', 'b.txt'), os.path.join(temp_dir, 'dir_1', 'dir_2', 'c.txt')]
+
+        # Make the files old enough to be cached.
+        old_time_ns = 10 ** 18
+        for path in paths:
+            os.utime(path, ns = (old_time_ns, old_time_ns))
+
+        edq.util.dirent.clear_hash_cache()
+
+        edq.util.dirent.hash_files_cached(paths[0:1], cache_path = os.path.join(cache_dir, 'first.json'))
+        edq.util.dirent.hash_files_cached(paths[1:], cache_path = os.path.join(cache_dir, 'second.json'))
+
+        self.assertEqual(paths[0:1], sorted(edq.util.json.load_path(os.path.join(cache_dir, 'first.json')).keys()))
+        self.assertEqual(paths[1:], sorted(edq.util.json.load_path(os.path.join(cache_dir, 'second.json')).keys()))
+
+        original_size = edq.util.dirent.HASH_CACHE_SIZE
+        edq.util.dirent.HASH_CACHE_SIZE = 2
+
+        try:
+            edq.util.dirent.clear_hash_cache()
+            edq.util.dirent.hash_files_cached(paths, workers = 1)
+
+            # Only the most recently used hashes are kept.
+            self.assertEqual(paths[1:], list(edq.util.dirent._hash_cache.keys()))
+        finally:
+            edq.util.dirent.HASH_CACHE_SIZE = original_size
+            edq.util.dirent.clear_hash_cache()
+
     def _prep_temp_dir(self) -> str:
         return create_test_dir('edq_test_dirent_')
 
@@ -1,8 +1,14 @@
 import gzip
+import io
+import shutil
+import typing
 
 import edq.util.dirent
 import edq.util.encoding
 
+DEFAULT_CHUNK_SIZE: int = 2 ** 20
+""" The amount of data read at a time when (un)compressing files. """
+
 def uncompress_base64(b64_contents: str, encoding: str = edq.util.dirent.DEFAULT_ENCODING) -> bytes:
     """ Uncompress base64 encoded gzipped bytes into bytes. """
 
@@ -20,11 +26,24 @@ def uncompress_base64_to_string(b64_contents: str, encoding: str = edq.util.dire
 
     return uncompress_base64(b64_contents, encoding).decode(encoding)
 
-def uncompress(data: bytes) -> bytes:
-    """ Uncompress gzipped bytes into bytes. """
+def uncompress(data: typing.Union[bytes, bytearray, memoryview]) -> bytes:
+    """ Uncompress gzipped bytes (or any bytes-like object) into bytes. """
 
     return gzip.decompress(data)
 
+def uncompress_path(path: str) -> bytes:
+    """
+    Uncompress a gzipped file into bytes.
+    The compressed file is streamed (DEFAULT_CHUNK_SIZE at a time), so it is never fully copied into memory.
+    """
+
+    output = io.BytesIO()
+
+    with gzip.open(path, 'rb') as file:
+        shutil.copyfileobj(file, output, DEFAULT_CHUNK_SIZE)
+
+    return output.getvalue()
+
 def uncompress_to_path(data: bytes, path: str) -> None:
     """ Uncompress gzipped bytes into a file. """
 
@@ -42,8 +61,8 @@ def compress_as_base64(raw_data: bytes, encoding: str = edq.util.dirent.DEFAULT_
     data = compress(raw_data)
     return edq.util.encoding.to_base64(data, encoding = encoding)
 
-def compress(raw_data: bytes) -> bytes:
-    """ Get the compressed representation of some bytes as bytes. """
+def compress(raw_data: typing.Union[bytes, bytearray, memoryview]) -> bytes:
+    """ Get the compressed representation of some bytes (or any bytes-like object) as bytes. """
 
     return gzip.compress(raw_data)
 
@@ -54,10 +73,18 @@ def compress_path_as_base64(path: str, encoding: str = edq.util.dirent.DEFAULT_E
     return edq.util.encoding.to_base64(data, encoding = encoding)
 
 def compress_path(path: str) -> bytes:
-    """ Get the compressed contents of a file as bytes. """
+    """
+    Get the compressed contents of a file as bytes.
+    The file is streamed (DEFAULT_CHUNK_SIZE at a time), so its uncompressed contents are never all held in memory.
+    """
+
+    output = io.BytesIO()
+
+    with open(path, 'rb') as file:
+        with gzip.GzipFile(fileobj = output, mode = 'wb') as gzip_file:
+            shutil.copyfileobj(file, gzip_file, DEFAULT_CHUNK_SIZE)
 
-    data = edq.util.dirent.read_file_bytes(path)
-    return gzip.compress(data)
+    return output.getvalue()
 
 def compress_to_path(raw_data: bytes, path: str) -> None:
     """ Write the compressed representation of some bytes to a file. """
@@ -23,6 +23,11 @@ class TestGzip(edq.testing.unittest.BaseTest):
 
         self.assertFileHashEqual(base_path, direct_path)
 
+        compressed_path = edq.util.dirent.get_temp_path('edq-testing-gzip-bytes-compressed-')
+        edq.util.dirent.write_file_bytes(compressed_path, data)
+
+        self.assertEqual(text_contents.encode(), edq.util.gzip.uncompress_path(compressed_path))
+
     def test_file_base64(self) -> None:
         """ Test file-based operations using base64. """
 
@@ -39,3 +44,24 @@ class TestGzip(edq.testing.unittest.BaseTest):
         edq.util.gzip.uncompress_base64_to_path(data, direct_path)
 
         self.assertFileHashEqual(base_path, direct_path)
+
+    def test_file_chunks(self) -> None:
+        """ Test that files larger than a single chunk are streamed correctly. """
+
+        contents = bytes(range(256)) * 4
+        base_path = edq.util.dirent.get_temp_path('edq-testing-gzip-chunks-base-')
+        edq.util.dirent.write_file_bytes(base_path, contents)
+
+        original_chunk_size = edq.util.gzip.DEFAULT_CHUNK_SIZE
+        edq.util.gzip.DEFAULT_CHUNK_SIZE = 7
+
+        try:
+            data = edq.util.gzip.compress_path(base_path)
+            self.assertEqual(contents, edq.util.gzip.uncompress(data))
+
+            compressed_path = edq.util.dirent.get_temp_path('edq-testing-gzip-chunks-compressed-')
+            edq.util.dirent.write_file_bytes(compressed_path, data)
+
+            self.assertEqual(contents, edq.util.gzip.uncompress_path(compressed_path))
+        finally:
+            edq.util.gzip.DEFAULT_CHUNK_SIZE = original_chunk_size
@@ -1,12 +1,19 @@
 import hashlib
+import io
 import typing
 
 import edq.util.constants
 
 DEFAULT_CLIP_HASH_LENGTH: int = 8
 
+DEFAULT_CHUNK_SIZE: int = 2 ** 20
+""" The number of bytes/characters read at a time when hashing a stream. """
+
 def sha256_hex(payload: typing.Any, encoding: str = edq.util.constants.DEFAULT_ENCODING) -> str:
-    """ Compute and return the hex string of the SHA3-256 encoding of the payload. """
+    """
+    Compute and return the hex string of the SHA3-256 encoding of the payload.
+    The payload may be a string or any bytes-like object (e.g., a memoryview from edq.util.dirent.map_file()).
+    """
 
     if (isinstance(payload, str)):
         payload = payload.encode(encoding)
@@ -15,6 +22,44 @@ def sha256_hex(payload: typing.Any, encoding: str = edq.util.constants.DEFAULT_E
     digest.update(payload)
     return digest.hexdigest()
 
+def sha256_hex_stream(
+        source: typing.Union[typing.IO, typing.Iterable[typing.Union[bytes, str]]],
+        encoding: str = edq.util.constants.DEFAULT_ENCODING,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        ) -> str:
+    """
+    Compute the same hash as sha256_hex(), but from a stream instead of an in-memory payload.
+    The source can be a file object (binary or text) or an iterable of chunks (bytes or str).
+    File objects are read `chunk_size` at a time, so memory use is bounded.
+    Binary files will use hashlib.file_digest() when it is available.
+    """
+
+    if (hasattr(source, 'read')):
+        file_digest = getattr(hashlib, 'file_digest', None)
+        if ((file_digest is not None) and isinstance(source, (io.BufferedIOBase, io.RawIOBase))):
+            return str(file_digest(source, 'sha256').hexdigest())
+
+        source = _read_chunks(typing.cast(typing.IO, source), chunk_size)
+
+    digest = hashlib.new('sha256')
+    for chunk in typing.cast(typing.Iterable[typing.Union[bytes, str]], source):
+        if (isinstance(chunk, str)):
+            chunk = chunk.encode(encoding)
+
+        digest.update(chunk)
+
+    return digest.hexdigest()
+
+def _read_chunks(file_obj: typing.IO, chunk_size: int) -> typing.Iterator[typing.Union[bytes, str]]:
+    """ Read a file object in chunks until it is exhausted. """
+
+    while (True):
+        chunk = file_obj.read(chunk_size)
+        if (len(chunk) == 0):
+            return
+
+        yield chunk
+
 def clip_text(text: str, max_length: int, hash_length: int = DEFAULT_CLIP_HASH_LENGTH) -> str:
     """
     Return a clipped version of the input text that is no longer than the specified length.
@@ -1,4 +1,9 @@
+import io
+import os
+import typing
+
 import edq.testing.unittest
+import edq.util.dirent
 import edq.util.hash
 
 class TestHash(edq.testing.unittest.BaseTest):
@@ -21,6 +26,42 @@ class TestHash(edq.testing.unittest.BaseTest):
                 actual = edq.util.hash.sha256_hex(text)
                 self.assertEqual(expected, actual)
 
+    def test_sha256_hex_stream_base(self) -> None:
+        """ Test hashing streams, which should match hashing the full payload. """
+
+        text = 'abcdefghijklmnopqrstuvwxyz1234567890' * 10
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = 'edq_test_hash_stream_')
+        path = os.path.join(temp_dir, 'test.txt')
+        edq.util.dirent.write_file(path, text, newline = False)
+
+        # [(source factory, chunk size), ...]
+        test_cases: typing.List[typing.Tuple[typing.Callable[[], typing.Any], int]] = [
+            (lambda: io.BytesIO(text.encode()), edq.util.hash.DEFAULT_CHUNK_SIZE),
+            (lambda: io.BytesIO(text.encode()), 7),
+            (lambda: io.StringIO(text), 7),
+            (lambda: open(path, 'rb'), 7),  # pylint: disable=consider-using-with
+            (lambda: [text[0:10], text[10:].encode()], 7),
+            (lambda: iter([text]), 7),
+        ]
+
+        expected = edq.util.hash.sha256_hex(text)
+
+        for (i, test_case) in enumerate(test_cases):
+            (source_factory, chunk_size) = test_case
+
+            with self.subTest(msg = f"Case {i}:"):
+                source = source_factory()
+                actual = edq.util.hash.sha256_hex_stream(source, chunk_size = chunk_size)
+
+                if (hasattr(source, 'close')):
+                    source.close()
+
+                self.assertEqual(expected, actual)
+
+        self.assertEqual(expected, edq.util.dirent.hash_file(path))
+        self.assertEqual(edq.util.hash.sha256_hex(''), edq.util.hash.sha256_hex_stream([]))
+
     def test_clip_text_base(self) -> None:
         """ Test the base functionality of clip_text(). """
 
@@ -133,19 +133,35 @@ def dump_path(
         sort_keys: bool = True,
         gzipped: typing.Union[bool, None] = None,
         encoding: str = edq.util.dirent.DEFAULT_ENCODING,
+        atomic: bool = False,
+        fsync_dir: bool = False,
         **kwargs: typing.Any) -> None:
     """
     Dump an object as a JSON file.
 
     If `gzipped` is not set, the behavior is guessed from the extension (".gz").
+    If `atomic` is true, then the file is written atomically (see edq.util.dirent.open_atomic()).
     """
 
     if (gzipped is None):
         gzipped = (os.path.splitext(path)[-1] == '.gz')
 
-    open_func = open
-    if (gzipped):
-        open_func = gzip.open  # type: ignore[assignment]
+    if (not atomic):
+        open_func = open
+        if (gzipped):
+            open_func = gzip.open  # type: ignore[assignment]
+
+        with open_func(path, 'wt', encoding = encoding) as file:
+            dump(data, file, default = default, sort_keys = sort_keys, **kwargs)
+
+        return
+
+    if (not gzipped):
+        with edq.util.dirent.open_atomic(path, 'w', encoding = encoding, fsync_dir = fsync_dir) as atomic_file:
+            dump(data, typing.cast(typing.TextIO, atomic_file), default = default, sort_keys = sort_keys, **kwargs)
+
+        return
 
-    with open_func(path, 'wt', encoding = encoding) as file:
-        dump(data, file, default = default, sort_keys = sort_keys, **kwargs)
+    with edq.util.dirent.open_atomic(path, 'wb', fsync_dir = fsync_dir) as raw_file:
+        with gzip.open(raw_file, 'wt', encoding = encoding) as file:
+            dump(data, file, default = default, sort_keys = sort_keys, **kwargs)
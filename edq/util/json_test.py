@@ -137,8 +137,13 @@ class TestJSON(edq.testing.unittest.BaseTest):
         edq.util.json.dump_path(dict_content, path_dict)
         dict_load = edq.util.json.load_path(path_dict, strict = strict)
 
+        path_atomic = os.path.join(temp_dir, 'test-atomic.json')
+        edq.util.json.dump_path(dict_content, path_atomic, atomic = True)
+        atomic_load = edq.util.json.load_path(path_atomic, strict = strict)
+
         self.assertDictEqual(dict_content, text_load)
         self.assertDictEqual(dict_load, text_load)
+        self.assertDictEqual(atomic_load, text_load)
 
     def _subtest_load_dump_path_gzip(self, text_content: str, dict_content: typing.Dict[str, typing.Any], strict: bool) -> None:
         # Trigger error on parsing tests.
@@ -0,0 +1,442 @@
+"""
+This file provides reading and writing of MessagePack (https://msgpack.org), a compact binary serialization format.
+The functions here mirror the ones in edq.util.json.
+
+Unlike JSON, MessagePack can natively represent raw bytes,
+so binary payloads do not need to be base64 encoded.
+Only the core MessagePack types are supported (nil, bool, int, float, str, bin, array, map),
+extension types will raise an error when read.
+"""
+
+import enum
+import gzip
+import os
+import struct
+import typing
+
+import edq.util.common
+import edq.util.constants
+import edq.util.dirent
+
+MSGPACK_EXTENSION: str = '.msgpack'
+""" The extension used to identify MessagePack files. """
+
+DEPTH_LIMIT: int = 10000
+""" The maximum nesting depth that will be read or written. """
+
+_STRUCT_UINT8 = struct.Struct('>B')
+_STRUCT_UINT16 = struct.Struct('>H')
+_STRUCT_UINT32 = struct.Struct('>I')
+_STRUCT_UINT64 = struct.Struct('>Q')
+_STRUCT_INT8 = struct.Struct('>b')
+_STRUCT_INT16 = struct.Struct('>h')
+_STRUCT_INT32 = struct.Struct('>i')
+_STRUCT_INT64 = struct.Struct('>q')
+_STRUCT_FLOAT32 = struct.Struct('>f')
+_STRUCT_FLOAT64 = struct.Struct('>d')
+
+def is_msgpack_path(path: str) -> bool:
+    """
+    Check if a path looks like a MessagePack file (by extension).
+    A trailing ".gz" extension is ignored.
+    """
+
+    (base, ext) = os.path.splitext(path)
+    if (ext == '.gz'):
+        ext = os.path.splitext(base)[-1]
+
+    return (ext == MSGPACK_EXTENSION)
+
+def msgpack_serialization_handle(value: typing.Any) -> typing.Any:
+    """
+    Handle objects that cannot be packed by default,
+    e.g., calling vars() on an object.
+    This is the MessagePack sibling of edq.util.json.json_serialization_handle().
+    """
+
+    context = edq.util.common.SerializationContext(allow_bytes = True)
+
+    # If this looks like a edq.util.serial.DictSerializer.
+    if (hasattr(value, 'to_dict')):
+        return value.to_dict(context)
+
+    # If this looks like a edq.util.serial.PODSerializer.
+    if (hasattr(value, 'to_pod')):
+        return value.to_pod(context)
+
+    if (isinstance(value, enum.Enum)):
+        return str(value)
+
+    if (hasattr(value, '__dict__')):
+        return dict(vars(value))
+
+    raise ValueError(f"Could not MessagePack serial object: '{value}'.")
+
+def load(
+        file_obj: typing.BinaryIO,
+        gzipped: bool = False,
+        ) -> typing.Any:
+    """
+    Load a binary file object/handler as MessagePack.
+
+    If `gzipped` is set, the file object is treated as a gzipped bytes stream.
+    """
+
+    if (gzipped):
+        file_obj = gzip.GzipFile(fileobj = file_obj)  # type: ignore[assignment]
+
+    return loads(file_obj.read())
+
+def loads(data: typing.Union[bytes, bytearray, memoryview]) -> typing.Any:
+    """
+    Load bytes as MessagePack.
+    The bytes must contain exactly one (top-level) object.
+    """
+
+    with memoryview(data) as view:
+        (value, offset) = _unpack(view, 0, 0)
+
+        if (offset != len(view)):
+            raise ValueError(f"Found {len(view) - offset} trailing byte(s) after MessagePack data.")
+
+    return value
+
+def load_path(
+        path: str,
+        gzipped: typing.Union[bool, None] = None,
+        ) -> typing.Any:
+    """
+    Load a file path as MessagePack.
+
+    If `gzipped` is not set, the behavior is guessed from the extension (".gz").
+    """
+
+    if (not os.path.exists(path)):
+        raise FileNotFoundError(f"File does not exist: '{path}'.")
+
+    if (os.path.isdir(path)):
+        raise IsADirectoryError(f"Cannot open MessagePack file, expected a file but got a directory at '{path}'.")
+
+    if (gzipped is None):
+        gzipped = (os.path.splitext(path)[-1] == '.gz')
+
+    data = edq.util.dirent.read_file_bytes(path)
+
+    try:
+        if (gzipped):
+            data = gzip.decompress(data)
+
+        return loads(data)
+    except Exception as ex:
+        raise ValueError(f"Failed to read MessagePack file '{path}'.") from ex
+
+def dump(
+        data: typing.Any,
+        file_obj: typing.BinaryIO,
+        default: typing.Union[typing.Callable, None] = msgpack_serialization_handle,
+        sort_keys: bool = True,
+        ) -> None:
+    """ Dump an object as a MessagePack file object. """
+
+    file_obj.write(dumps(data, default = default, sort_keys = sort_keys))
+
+def dumps(
+        data: typing.Any,
+        default: typing.Union[typing.Callable, None] = msgpack_serialization_handle,
+        sort_keys: bool = True,
+        ) -> bytes:
+    """
+    Dump an object as MessagePack bytes.
+    When sorting keys, maps whose keys cannot be compared to each other keep their insertion order.
+    """
+
+    out = bytearray()
+    _pack(data, out, default, sort_keys, 0)
+    return bytes(out)
+
+def dump_path(
+        data: typing.Any,
+        path: str,
+        default: typing.Union[typing.Callable, None] = msgpack_serialization_handle,
+        sort_keys: bool = True,
+        gzipped: typing.Union[bool, None] = None,
+        atomic: bool = False,
+        fsync_dir: bool = False,
+        ) -> None:
+    """
+    Dump an object as a MessagePack file.
+
+    If `gzipped` is not set, the behavior is guessed from the extension (".gz").
+    If `atomic` is true, then the file is written atomically (see edq.util.dirent.open_atomic()).
+    """
+
+    if (gzipped is None):
+        gzipped = (os.path.splitext(path)[-1] == '.gz')
+
+    payload = dumps(data, default = default, sort_keys = sort_keys)
+
+    if (gzipped):
+        payload = gzip.compress(payload)
+
+    edq.util.dirent.write_file_bytes(path, payload, atomic = atomic, fsync_dir = fsync_dir)
+
+def _pack(
+        value: typing.Any,
+        out: bytearray,
+        default: typing.Union[typing.Callable, None],
+        sort_keys: bool,
+        level: int,
+        ) -> None:
+    """ Recursively pack a value onto the end of the output buffer. """
+
+    if (level > DEPTH_LIMIT):
+        raise ValueError("Depth limit reached.")
+
+    if (value is None):
+        out.append(0xc0)
+    elif (value is True):
+        out.append(0xc3)
+    elif (value is False):
+        out.append(0xc2)
+    elif (isinstance(value, int)):
+        _pack_int(int(value), out)
+    elif (isinstance(value, float)):
+        out.append(0xcb)
+        out += _STRUCT_FLOAT64.pack(value)
+    elif (isinstance(value, str)):
+        encoded = value.encode(edq.util.constants.DEFAULT_ENCODING)
+        _pack_header(len(encoded), out, 0xa0, 32, 0xd9, 0xda, 0xdb)
+        out += encoded
+    elif (isinstance(value, (bytes, bytearray, memoryview))):
+        value = bytes(value)
+        _pack_header(len(value), out, None, 0, 0xc4, 0xc5, 0xc6)
+        out += value
+    elif (isinstance(value, (list, tuple))):
+        _pack_header(len(value), out, 0x90, 16, None, 0xdc, 0xdd)
+        for item in value:
+            _pack(item, out, default, sort_keys, level + 1)
+    elif (isinstance(value, dict)):
+        _pack_header(len(value), out, 0x80, 16, None, 0xde, 0xdf)
+
+        keys = value.keys()
+        if (sort_keys):
+            try:
+                keys = sorted(keys)  # type: ignore[assignment]
+            except TypeError:
+                # Mixed key types (e.g., ints and strs) cannot be ordered, keep insertion order.
+                pass
+
+        for key in keys:
+            _pack(key, out, default, sort_keys, level + 1)
+            _pack(value[key], out, default, sort_keys, level + 1)
+    elif (default is not None):
+        new_value = default(value)
+        if (new_value is value):
+            raise ValueError(f"Could not MessagePack serial object: '{value}'.")
+
+        _pack(new_value, out, default, sort_keys, level + 1)
+    else:
+        raise ValueError(f"Could not MessagePack serial object: '{value}' (type: '{type(value)}').")
+
+def _pack_int(value: int, out: bytearray) -> None:
+    """ Pack an integer using the smallest representation. """
+
+    if (0 <= value < 0x80):
+        out.append(value)
+    elif (-0x20 <= value < 0):
+        out.append(value & 0xff)
+    elif (value >= 0):
+        if (value <= 0xff):
+            out.append(0xcc)
+            out += _STRUCT_UINT8.pack(value)
+        elif (value <= 0xffff):
+            out.append(0xcd)
+            out += _STRUCT_UINT16.pack(value)
+        elif (value <= 0xffffffff):
+            out.append(0xce)
+            out += _STRUCT_UINT32.pack(value)
+        elif (value <= 0xffffffffffffffff):
+            out.append(0xcf)
+            out += _STRUCT_UINT64.pack(value)
+        else:
+            raise ValueError(f"Integer is too large for MessagePack: {value}.")
+    else:
+        if (value >= -0x80):
+            out.append(0xd0)
+            out += _STRUCT_INT8.pack(value)
+        elif (value >= -0x8000):
+            out.append(0xd1)
+            out += _STRUCT_INT16.pack(value)
+        elif (value >= -0x80000000):
+            out.append(0xd2)
+            out += _STRUCT_INT32.pack(value)
+        elif (value >= -0x8000000000000000):
+            out.append(0xd3)
+            out += _STRUCT_INT64.pack(value)
+        else:
+            raise ValueError(f"Integer is too small for MessagePack: {value}.")
+
+def _pack_header(
+        length: int,
+        out: bytearray,
+        fix_prefix: typing.Union[int, None],
+        fix_limit: int,
+        prefix_8: typing.Union[int, None],
+        prefix_16: int,
+        prefix_32: int,
+        ) -> None:
+    """ Pack the header (type and length) for a sized type (str, bin, array, map). """
+
+    if ((fix_prefix is not None) and (length < fix_limit)):
+        out.append(fix_prefix | length)
+    elif ((prefix_8 is not None) and (length <= 0xff)):
+        out.append(prefix_8)
+        out += _STRUCT_UINT8.pack(length)
+    elif (length <= 0xffff):
+        out.append(prefix_16)
+        out += _STRUCT_UINT16.pack(length)
+    elif (length <= 0xffffffff):
+        out.append(prefix_32)
+        out += _STRUCT_UINT32.pack(length)
+    else:
+        raise ValueError(f"Object is too large for MessagePack, found length: {length}.")
+
+def _unpack(data: memoryview, offset: int, level: int) -> typing.Tuple[typing.Any, int]:
+    """
+    Recursively unpack a single value starting at the given offset.
+    Returns the value and the offset just past it.
+    """
+
+    if (level > DEPTH_LIMIT):
+        raise ValueError("Depth limit reached.")
+
+    if (offset >= len(data)):
+        raise ValueError("Unexpected end of MessagePack data.")
+
+    code = data[offset]
+    offset += 1
+
+    # Fixed-size types.
+
+    if (code <= 0x7f):
+        return code, offset
+
+    if (code >= 0xe0):
+        return code - 0x100, offset
+
+    if (0xa0 <= code <= 0xbf):
+        return _unpack_str(data, offset, code & 0x1f)
+
+    if (0x90 <= code <= 0x9f):
+        return _unpack_array(data, offset, code & 0x0f, level)
+
+    if (0x80 <= code <= 0x8f):
+        return _unpack_map(data, offset, code & 0x0f, level)
+
+    if (code == 0xc0):
+        return None, offset
+
+    if (code == 0xc2):
+        return False, offset
+
+    if (code == 0xc3):
+        return True, offset
+
+    # Numbers.
+
+    if (code in _NUMBER_STRUCTS):
+        number_struct = _NUMBER_STRUCTS[code]
+        _check_length(data, offset, number_struct.size)
+        return number_struct.unpack_from(data, offset)[0], offset + number_struct.size
+
+    # Sized types.
+
+    if (code in _SIZED_TYPES):
+        (length_struct, kind) = _SIZED_TYPES[code]
+        _check_length(data, offset, length_struct.size)
+        length = length_struct.unpack_from(data, offset)[0]
+        offset += length_struct.size
+
+        if (kind == 'bin'):
+            return _unpack_bin(data, offset, length)
+
+        if (kind == 'str'):
+            return _unpack_str(data, offset, length)
+
+        if (kind == 'array'):
+            return _unpack_array(data, offset, length, level)
+
+        return _unpack_map(data, offset, length, level)
+
+    raise ValueError(f"Unsupported MessagePack type code: 0x{code:02x}.")
+
+def _check_length(data: memoryview, offset: int, length: int) -> None:
+    """ Ensure that there are enough bytes left to read. """
+
+    if ((offset + length) > len(data)):
+        raise ValueError("Unexpected end of MessagePack data.")
+
+def _unpack_str(data: memoryview, offset: int, length: int) -> typing.Tuple[str, int]:
+    """ Unpack a string of a known length. """
+
+    _check_length(data, offset, length)
+    return str(data[offset:(offset + length)], edq.util.constants.DEFAULT_ENCODING), offset + length
+
+def _unpack_bin(data: memoryview, offset: int, length: int) -> typing.Tuple[bytes, int]:
+    """ Unpack bytes of a known length. """
+
+    _check_length(data, offset, length)
+    return bytes(data[offset:(offset + length)]), offset + length
+
+def _unpack_array(data: memoryview, offset: int, length: int, level: int) -> typing.Tuple[typing.List[typing.Any], int]:
+    """ Unpack an array of a known length. """
+
+    items = []
+    for _ in range(length):
+        (item, offset) = _unpack(data, offset, level + 1)
+        items.append(item)
+
+    return items, offset
+
+def _unpack_map(data: memoryview, offset: int, length: int, level: int) -> typing.Tuple[typing.Dict[typing.Any, typing.Any], int]:
+    """ Unpack a map of a known length. """
+
+    items = {}
+    for _ in range(length):
+        (key, offset) = _unpack(data, offset, level + 1)
+        (value, offset) = _unpack(data, offset, level + 1)
+
+        try:
+            items[key] = value
+        except TypeError as ex:
+            raise ValueError(f"MessagePack map keys must be hashable, found: '{type(key).__name__}'.") from ex
+
+    return items, offset
+
+_NUMBER_STRUCTS: typing.Dict[int, struct.Struct] = {
+    0xca: _STRUCT_FLOAT32,
+    0xcb: _STRUCT_FLOAT64,
+    0xcc: _STRUCT_UINT8,
+    0xcd: _STRUCT_UINT16,
+    0xce: _STRUCT_UINT32,
+    0xcf: _STRUCT_UINT64,
+    0xd0: _STRUCT_INT8,
+    0xd1: _STRUCT_INT16,
+    0xd2: _STRUCT_INT32,
+    0xd3: _STRUCT_INT64,
+}
+""" Number type codes and the struct to read them with. """
+
+_SIZED_TYPES: typing.Dict[int, typing.Tuple[struct.Struct, str]] = {
+    0xc4: (_STRUCT_UINT8, 'bin'),
+    0xc5: (_STRUCT_UINT16, 'bin'),
+    0xc6: (_STRUCT_UINT32, 'bin'),
+    0xd9: (_STRUCT_UINT8, 'str'),
+    0xda: (_STRUCT_UINT16, 'str'),
+    0xdb: (_STRUCT_UINT32, 'str'),
+    0xdc: (_STRUCT_UINT16, 'array'),
+    0xdd: (_STRUCT_UINT32, 'array'),
+    0xde: (_STRUCT_UINT16, 'map'),
+    0xdf: (_STRUCT_UINT32, 'map'),
+}
+""" Sized type codes, the struct to read their length, and the kind of contents that follows. """
@@ -0,0 +1,150 @@
+import os
+import typing
+
+import edq.net.exchange
+import edq.testing.unittest
+import edq.util.dirent
+import edq.util.msgpack
+
+class TestMessagePack(edq.testing.unittest.BaseTest):
+    """ Test MessagePack utils. """
+
+    def test_loads_dumps_base(self) -> None:
+        """
+        Test round-tripping values through MessagePack,
+        and check the encoding against known bytes (from the MessagePack spec).
+        """
+
+        # [(value, expected bytes (or None to skip the check)), ...]
+        test_cases: typing.List[typing.Tuple[typing.Any, typing.Union[bytes, None]]] = [
+            # Simple Types
+            (None, b'\xc0'),
+            (True, b'\xc3'),
+            (False, b'\xc2'),
+            (1.5, b'\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00'),
+
+            # Ints
+            (0, b'\x00'),
+            (127, b'\x7f'),
+            (128, b'\xcc\x80'),
+            (256, b'\xcd\x01\x00'),
+            (2**16, b'\xce\x00\x01\x00\x00'),
+            (2**32, b'\xcf\x00\x00\x00\x01\x00\x00\x00\x00'),
+            (-1, b'\xff'),
+            (-32, b'\xe0'),
+            (-33, b'\xd0\xdf'),
+            (-129, b'\xd1\xff\x7f'),
+            (-(2**31), b'\xd2\x80\x00\x00\x00'),
+            (-(2**63), b'\xd3\x80\x00\x00\x00\x00\x00\x00\x00'),
+
+            # Strings
+            ('', b'\xa0'),
+            ('abc', b'\xa3abc'),
+            ('a' * 32, b'\xd9\x20' + (b'a' * 32)),
+            ('a' * 256, b'\xda\x01\x00' + (b'a' * 256)),
+            ('é', b'\xa2\xc3\xa9'),
+
+            # Bytes
+            (b'', b'\xc4\x00'),
+            (b'\x00\x01', b'\xc4\x02\x00\x01'),
+            (b'z' * 256, b'\xc5\x01\x00' + (b'z' * 256)),
+
+            # Arrays
+            ([], b'\x90'),
+            ([1, 'a', None], b'\x93\x01\xa1a\xc0'),
+            (list(range(16)), b'\xdc\x00\x10' + bytes(range(16))),
+
+            # Maps (keys are sorted)
+            ({}, b'\x80'),
+            ({'b': 2, 'a': 1}, b'\x82\xa1a\x01\xa1b\x02'),
+            ({str(i): i for i in range(16)}, None),
+
+            # Maps (mixed key types keep insertion order)
+            ({1: 'a', 'b': 2}, b'\x82\x01\xa1a\xa1b\x02'),
+            ({'b': 2, 1: 'a'}, b'\x82\xa1b\x02\x01\xa1a'),
+
+            # Nested
+            ({'a': [1, {'b': b'\x00'}], 'c': {'d': [None, True, -1.5]}}, None),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (value, expected_bytes) = test_case
+
+            with self.subTest(msg = f"Case {i} ('{value}'):"):
+                actual_bytes = edq.util.msgpack.dumps(value)
+                if (expected_bytes is not None):
+                    self.assertEqual(expected_bytes, actual_bytes)
+
+                self.assertEqual(value, edq.util.msgpack.loads(actual_bytes))
+
+    def test_loads_errors(self) -> None:
+        """ Test reading bad MessagePack data. """
+
+        # [(bytes, error substring), ...]
+        test_cases = [
+            (b'', 'Unexpected end of MessagePack data'),
+            (b'\xa3ab', 'Unexpected end of MessagePack data'),
+            (b'\x92\x01', 'Unexpected end of MessagePack data'),
+            (b'\xcd\x01', 'Unexpected end of MessagePack data'),
+            (b'\x01\x02', 'trailing byte(s)'),
+            (b'\xc1', 'Unsupported MessagePack type code: 0xc1'),
+            (b'\xd4\x01\x00', 'Unsupported MessagePack type code: 0xd4'),
+            (b'\x81\x91\x01\x01', "map keys must be hashable, found: 'list'"),
+            (b'\x81\x81\x01\x01\x01', "map keys must be hashable, found: 'dict'"),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (data, error_substring) = test_case
+
+            with self.subTest(msg = f"Case {i} ('{data!r}'):"):
+                try:
+                    edq.util.msgpack.loads(data)
+                except ValueError as ex:
+                    self.assertIn(error_substring, self.format_error_string(ex), 'Error is not as expected.')
+                    continue
+
+                self.fail(f"Did not get expected error: '{error_substring}'.")
+
+    def test_load_dump_path(self) -> None:
+        """ Test reading and writing MessagePack files (gzipped and not). """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = 'edq_test_msgpack_path_')
+
+        data = {'a': [1, 2, 3], 'b': b'\x00\xff', 'c': 'abc'}
+
+        for filename in ['test.msgpack', 'test.msgpack.gz']:
+            with self.subTest(msg = f"Path '{filename}':"):
+                path = os.path.join(temp_dir, filename)
+
+                self.assertTrue(edq.util.msgpack.is_msgpack_path(path))
+
+                edq.util.msgpack.dump_path(data, path)
+                self.assertEqual(data, edq.util.msgpack.load_path(path))
+
+        self.assertFalse(edq.util.msgpack.is_msgpack_path(os.path.join(temp_dir, 'test.json')))
+        self.assertFalse(edq.util.msgpack.is_msgpack_path(os.path.join(temp_dir, 'test.json.gz')))
+
+    def test_exchange_binary_path(self) -> None:
+        """ Test that binary file content in an exchange survives a MessagePack round trip without base64 encoding. """
+
+        temp_dir = edq.util.dirent.get_temp_dir(prefix = 'edq_test_msgpack_exchange_')
+        path = os.path.join(temp_dir, 'test' + edq.net.exchange.BINARY_HTTP_EXCHANGE_EXTENSION)
+
+        content = bytes(range(256))
+        exchange = edq.net.exchange.HTTPExchange(
+            method = 'POST',
+            url_path = 'upload',
+            files = [edq.net.exchange.FileInfo(name = 'a.bin', content = content)],
+            response_body = {'ok': True},
+        )
+
+        exchange.to_path(path)
+
+        raw_data = edq.util.msgpack.load_path(path)
+        self.assertEqual(content, raw_data['files'][0]['content'])
+        self.assertFalse(raw_data['files'][0]['b64_encoded'])
+
+        new_exchange = edq.net.exchange.HTTPExchange.from_path(path)
+        self.assertEqual(content, new_exchange.files[0].content)
+        self.assertEqual(exchange.response_body, new_exchange.response_body)
+        self.assertEqual(path, new_exchange.source_path)
@@ -1,4 +1,6 @@
 import collections
+import concurrent.futures
+import copy
 import enum
 import os
 import types
@@ -9,6 +11,7 @@ import edq.core.errors
 import edq.util.common
 import edq.util.enum
 import edq.util.json
+import edq.util.msgpack
 
 PODType = typing.Union[bool, float, int, str, typing.List['PODType'], typing.Dict[str, 'PODType'], None]  # pylint: disable=invalid-name
 """ A "Plain Old Data" type that can be easily represented (e.g., in JSON). """
@@ -31,6 +34,15 @@ _UNION_TYPES: typing.Set[typing.Any] = {typing.Union}
 if (hasattr(types, 'UnionType')):
     _UNION_TYPES.add(getattr(types, 'UnionType'))
 
+DEFAULT_BULK_CHUNK_SIZE: int = 1000
+""" The default number of records each worker process handles at a time in from_pods(). """
+
+_CACHED_HASH_FIELD: str = '_serialization_cached_hash'
+"""
+The field immutable objects cache their hash in (see SerializationBase.serialization_immutable).
+This field is never serialized or compared.
+"""
+
 class SerializationBase:
     """
     A base class for the serialization classes.
@@ -39,9 +51,10 @@ class SerializationBase:
     but since this class only provides simple functionality not overwritten by any branch child,
     there should be no issues.
 
-    General (but inefficient) implementations of several core Python equality, comparison, and representation methods are provided.
+    Field-wise implementations of the core Python equality, comparison, and hashing methods are provided.
+    These methods work directly on an object's fields (see vars()), skipping any fields in `serialization_skip_fields`.
     A default hash implementation is provided, but it is up to child classes themselves to ensure they are immutable
-    if they want to be used as set elements or dict keys.
+    if they want to be used as set elements or dict keys (see `serialization_immutable`).
     """
 
     serialization_omit_empty: bool = False
@@ -64,6 +77,12 @@ class SerializationBase:
     serialization_error_class: typing.Type[Exception] = ValueError
     """ The class to use when raising errors. """
 
+    serialization_immutable: bool = False
+    """
+    Declare that instances of this class are never modified after construction.
+    Immutable objects will have their hash cached (on the object) after it is first computed.
+    """
+
     @classmethod
     def skip_field(cls, name: str, value: typing.Any) -> bool:
         """ Check if a field should be skipped. """
@@ -71,6 +90,9 @@ class SerializationBase:
         if ((cls.serialization_skip_fields is not None) and (name in cls.serialization_skip_fields)):
             return True
 
+        if (name == _CACHED_HASH_FIELD):
+            return True
+
         if (cls.serialization_omit_none and (value is None)):
             return True
 
@@ -82,11 +104,37 @@ class SerializationBase:
 
         return False
 
+    def __eq__(self, other: object) -> bool:
+        """
+        Check for equality.
+
+        Objects are equal if they are the exact same type and all their (non-skipped) fields are equal.
+        Objects of different types (including subclasses) defer to the other object (and are not equal by default).
+        """
+
+        if (self is other):
+            return True
+
+        if (type(self) is not type(other)):
+            return NotImplemented
+
+        return _comparison_fields(self) == _comparison_fields(other)
+
     def __lt__(self, other: 'SerializationBase') -> bool:
-        return repr(self) < repr(other)
+        return _order_key(self) < _order_key(other)
 
     def __hash__(self) -> int:
-        return hash(repr(self))
+        if (not self.serialization_immutable):
+            return _fields_hash(self)
+
+        fields = vars(self)
+
+        value = fields.get(_CACHED_HASH_FIELD, None)
+        if (value is None):
+            value = _fields_hash(self)
+            fields[_CACHED_HASH_FIELD] = value
+
+        return int(value)
 
     def __str__(self) -> str:
         return repr(self)
@@ -94,21 +142,6 @@ class SerializationBase:
     def __repr__(self) -> str:
         return edq.util.json.dumps(self)
 
-    def _eq(self,
-            other: object,
-            self_serializer: typing.Callable,
-            other_serializer: typing.Callable,
-            context: typing.Union[SerializationContext, None] = None,
-            ) -> bool:
-        """
-        Check for equality using the given func..
-        """
-
-        if (not isinstance(other, type(self))):
-            return False
-
-        return bool(self_serializer(context) == other_serializer(context))
-
     @classmethod
     def _from_path(cls: typing.Type[SerializationBaseClass],
             path: str,
@@ -117,6 +150,8 @@ class SerializationBase:
             ) -> SerializationBaseClass:
         """
         The internal helper for from_path().
+        Paths with a MessagePack extension (see edq.util.msgpack.is_msgpack_path()) will be read as MessagePack,
+        all other paths will be read as JSON.
         """
 
         path = os.path.abspath(path)
@@ -129,7 +164,11 @@ class SerializationBase:
         context.base_dir = os.path.dirname(path)
         context.source_path = path
 
-        data = edq.util.json.load_path(path, **context.json_options)
+        if (edq.util.msgpack.is_msgpack_path(path)):
+            context.allow_bytes = True
+            data = edq.util.msgpack.load_path(path)
+        else:
+            data = edq.util.json.load_path(path, **context.json_options)
 
         return deserializer(data, context)  # type: ignore[no-any-return]
 
@@ -138,7 +177,11 @@ class SerializationBase:
             serializer: typing.Callable,
             context: typing.Union[SerializationContext, None] = None,
             ) -> None:
-        """ Write this object to the given path as JSON. """
+        """
+        Write this object to the given path.
+        Paths with a MessagePack extension (see edq.util.msgpack.is_msgpack_path()) will be written as MessagePack,
+        all other paths will be written as JSON.
+        """
 
         if (context is None):
             context = SerializationContext()
@@ -151,6 +194,12 @@ class SerializationBase:
         context.source_path = os.path.abspath(path)
         context.base_dir = os.path.dirname(context.source_path)
 
+        if (edq.util.msgpack.is_msgpack_path(context.source_path)):
+            context.allow_bytes = True
+            data = generic_to_pod(serializer(context), context, self.serialization_error_class)
+            edq.util.msgpack.dump_path(data, context.source_path)
+            return
+
         data = serializer(context)
         edq.util.json.dump_path(data, context.source_path, **context.json_options)
 
@@ -186,20 +235,10 @@ class PODSerializer(SerializationBase):
             path: str,
             context: typing.Union[SerializationContext, None] = None,
             ) -> None:
-        """ Write this object to the given path as JSON. """
+        """ Write this object to the given path (see _to_path()). """
 
         self._to_path(path, self.to_pod, context)
 
-    def __eq__(self, other: object) -> bool:
-        """
-        Check for equality.
-
-        This check uses to_pod() and compares the results.
-        This may not be complete or efficient depending on the child class.
-        """
-
-        return self._eq(other, self.to_pod, getattr(other, 'to_pod', None))  # type: ignore[arg-type]
-
 class PODDeserializer(SerializationBase):
     """
     A class that can construct itself from a POD type.
@@ -225,7 +264,7 @@ class PODDeserializer(SerializationBase):
             context = SerializationContext()
 
         new_data = {}
-        constructor_types = typing.get_type_hints(cls.__init__)
+        constructor_types = _get_plan(cls).get_init_type_hints()
 
         for (key, value) in data.items():
             if (cls.skip_field(key, value)):
@@ -267,7 +306,7 @@ class PODDeserializer(SerializationBase):
             context: typing.Union[SerializationContext, None] = None,
             ) -> PODDeserializerClass:
         """
-        Read the path (as JSON) and call from_pod().
+        Read the path (as JSON or MessagePack, see _from_path()) and call from_pod().
 
         If a serialization context is passed in to this function,
         a copy will be made with the new base dir and source path.
@@ -278,21 +317,33 @@ class PODDeserializer(SerializationBase):
 class PODConverter(PODSerializer, PODDeserializer):
     """ A PODSerializer and PODDeserializer. """
 
-    def copy(self,
+    def copy(self: PODConverterClass,
             context: typing.Union[SerializationContext, None] = None,
-            ) -> 'PODConverter':
+            ) -> PODConverterClass:
         """
         Make a deep copy of this object.
-        The default implementation will use to_pod() and from_pod() to make a copy.
 
-        Callers should be cautious of fileds that are skipped in serialization,
-        e.g., via `SerializationBase.serialization_skip_fields`.
+        The default implementation will copy this object's fields directly (without serializing).
+        Immutable values (e.g., strings, numbers, enums, and objects marked with `serialization_immutable`) are shared,
+        while mutable containers and nested serialization objects are copied.
+        Immutable objects will just return themselves.
+
+        Fields that are skipped in serialization (e.g., via `SerializationBase.serialization_skip_fields`)
+        are not part of an object's serialized state, so they are shared with the new object instead of copied.
+
+        Objects without a __dict__ (e.g., those using __slots__) will fall back to using to_pod() and from_pod().
         """
 
-        if (context is None):
-            context = SerializationContext()
+        if (self.serialization_immutable):
+            return self
+
+        if (not hasattr(self, '__dict__')):
+            if (context is None):
+                context = SerializationContext()
+
+            return self.from_pod(self.to_pod(context), context)
 
-        return self.from_pod(self.to_pod(context), context)
+        return _copy_fields(self)
 
 class DictSerializer(PODSerializer):
     """
@@ -320,20 +371,10 @@ class DictSerializer(PODSerializer):
             path: str,
             context: typing.Union[SerializationContext, None] = None,
             ) -> None:
-        """ Write this object to the given path as JSON. """
+        """ Write this object to the given path (see _to_path()). """
 
         self._to_path(path, self.to_dict, context)
 
-    def __eq__(self, other: object) -> bool:
-        """
-        Check for equality.
-
-        This check uses to_pod() and compares the results.
-        This may not be complete or efficient depending on the child class.
-        """
-
-        return self._eq(other, self.to_dict, getattr(other, 'to_dict', None))  # type: ignore[arg-type]
-
 class DictDeserializer(PODDeserializer):
     """
     A base class for class that can reconstruct (deserialize) themselves from a dict.
@@ -369,7 +410,7 @@ class DictDeserializer(PODDeserializer):
             context: typing.Union[SerializationContext, None] = None,
             ) -> DictDeserializerClass:
         """
-        Read the path (as JSON) and call from_dict().
+        Read the path (as JSON or MessagePack, see _from_path()) and call from_dict().
 
         If a serialization context is passed in to this function,
         a copy will be made with the new base dir and source path.
@@ -380,6 +421,330 @@ class DictDeserializer(PODDeserializer):
 class DictConverter(PODConverter, DictSerializer, DictDeserializer):
     """ A DictSerializer and DictDeserializer. """
 
+class _SerializationPlan:
+    """
+    Information about a serialization class that only needs to be computed once.
+    Plans are computed on first use, so class-level serialization options should not be changed after a class is used.
+    """
+
+    def __init__(self, cls: typing.Type[SerializationBase]) -> None:
+        skip_fields: typing.Set[str] = {_CACHED_HASH_FIELD}
+        if (cls.serialization_skip_fields is not None):
+            skip_fields |= set(cls.serialization_skip_fields)
+
+        self.skip_fields: typing.FrozenSet[str] = frozenset(skip_fields)
+        """ Fields that are never serialized or compared. """
+
+        self.default_deserialization: bool = (
+            issubclass(cls, PODDeserializer)
+            and (getattr(cls.prep_init_data, '__func__', None) is getattr(PODDeserializer.prep_init_data, '__func__', None))
+            and (getattr(cls.from_pod, '__func__', None) is getattr(PODDeserializer.from_pod, '__func__', None))
+            and ((not issubclass(cls, DictDeserializer))
+                or (getattr(cls.from_dict, '__func__', None) is getattr(DictDeserializer.from_dict, '__func__', None)))
+        )
+        """
+        Whether this class uses the default deserialization methods (from_pod(), from_dict(), and prep_init_data()).
+        If so, then its fields can be deserialized directly (see from_pods()).
+        """
+
+        self._cls: typing.Type[SerializationBase] = cls
+        self._init_type_hints: typing.Union[typing.Dict[str, typing.Any], None] = None
+
+    def get_init_type_hints(self) -> typing.Dict[str, typing.Any]:
+        """ Get (and cache) the type hints for this class' constructor. """
+
+        if (self._init_type_hints is None):
+            self._init_type_hints = typing.get_type_hints(self._cls.__init__)
+
+        return self._init_type_hints
+
+_serialization_plans: typing.Dict[type, _SerializationPlan] = {}
+""" The cached plan for each class (see _get_plan()). """
+
+def _get_plan(cls: typing.Type[SerializationBase]) -> _SerializationPlan:
+    """ Get (or create) the serialization plan for a class. """
+
+    plan = _serialization_plans.get(cls, None)
+    if (plan is None):
+        plan = _SerializationPlan(cls)
+        _serialization_plans[cls] = plan
+
+    return plan
+
+def _comparison_fields(value: SerializationBase) -> typing.Dict[str, typing.Any]:
+    """ Get the fields of an object that are used in comparisons. """
+
+    fields = vars(value)
+
+    skip_fields = _get_plan(type(value)).skip_fields
+    if (fields.keys().isdisjoint(skip_fields)):
+        return fields
+
+    return {name: field for (name, field) in vars(value).items() if (name not in skip_fields)}
+
+def _fields_hash(value: SerializationBase) -> int:
+    """ Compute a hash from an object's comparison fields. """
+
+    return hash(frozenset((name, _hash_key(field)) for (name, field) in _comparison_fields(value).items()))
+
+def _hash_key(value: typing.Any) -> typing.Any:
+    """
+    Get a hashable version of a value.
+    Values that are equal will have equal keys.
+    """
+
+    if (isinstance(value, (list, tuple))):
+        return tuple(_hash_key(item) for item in value)
+
+    if (isinstance(value, (set, frozenset))):
+        return frozenset(_hash_key(item) for item in value)
+
+    if (isinstance(value, dict)):
+        return frozenset((key, _hash_key(item)) for (key, item) in value.items())
+
+    if (isinstance(value, SerializationBase) and (type(value).__hash__ is None)):
+        return _fields_hash(value)
+
+    try:
+        hash(value)
+    except TypeError:
+        # Unhashable values can only contribute their type.
+        return type(value).__qualname__
+
+    return value
+
+def _order_key(value: typing.Any) -> typing.Tuple[typing.Any, ...]:
+    """
+    Get a key that can be used to order arbitrary (possibly heterogeneous) values.
+    Values are first grouped by a rough type, and then ordered within that type.
+    """
+
+    if (value is None):
+        return (0,)
+
+    if (isinstance(value, enum.Enum)):
+        return _order_key(value.value)
+
+    if (isinstance(value, (bool, int, float))):
+        return (1, value)
+
+    if (isinstance(value, str)):
+        return (2, value)
+
+    if (isinstance(value, (bytes, bytearray))):
+        return (3, bytes(value))
+
+    if (isinstance(value, (list, tuple))):
+        return (4, tuple(_order_key(item) for item in value))
+
+    if (isinstance(value, (set, frozenset))):
+        return (4, tuple(sorted(_order_key(item) for item in value)))
+
+    if (isinstance(value, dict)):
+        return (5, tuple(sorted((_order_key(key), _order_key(item)) for (key, item) in value.items())))
+
+    if (isinstance(value, SerializationBase) and hasattr(value, '__dict__')):
+        return (6, type(value).__qualname__, _order_key(_comparison_fields(value)))
+
+    return (7, repr(value))
+
+class DeserializationErrorRecord(DictConverter):
+    """ Information about a single error encountered during bulk deserialization (see from_pods()). """
+
+    def __init__(self,
+            index: int = 0,
+            field: typing.Union[str, None] = None,
+            message: str = '',
+            **kwargs: typing.Any) -> None:
+        self.index: int = index
+        """ The index of the record that had this error. """
+
+        self.field: typing.Union[str, None] = field
+        """ The field that had this error, or None if the error was not for a specific field. """
+
+        self.message: str = message
+        """ A message describing this error (including any causes). """
+
+def from_pods(
+        records: typing.Iterable[PODType],
+        cls: typing.Type[PODDeserializerClass],
+        context: typing.Union[SerializationContext, None] = None,
+        num_processes: int = 1,
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        ) -> typing.Tuple[typing.List[typing.Union[PODDeserializerClass, None]], typing.List[DeserializationErrorRecord]]:
+    """
+    Deserialize many records into instances of the given class.
+
+    Instead of raising on the first bad field, all errors (for all fields of all records) are collected and returned.
+    The returned values will line up with the input records, with None in place of any record that had an error.
+
+    Classes that use the default deserialization methods will have their fields deserialized directly
+    (using a cached plan for the class).
+    Other classes will just have their from_pod() called for each record.
+
+    If more than one process is requested, records will be split into chunks and deserialized in a process pool.
+    In this case, the class, context, records, and results must all be picklable.
+    """
+
+    if (context is None):
+        context = SerializationContext()
+
+    records = list(records)
+
+    if (chunk_size < 1):
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}.")
+
+    if ((num_processes <= 1) or (len(records) <= chunk_size)):
+        return _from_pods_chunk(records, cls, context, 0)
+
+    values: typing.List[typing.Union[PODDeserializerClass, None]] = []
+    errors: typing.List[DeserializationErrorRecord] = []
+
+    offsets = list(range(0, len(records), chunk_size))
+    chunks = [records[offset:(offset + chunk_size)] for offset in offsets]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers = num_processes) as executor:
+        results = executor.map(_from_pods_chunk, chunks, [cls] * len(chunks), [context] * len(chunks), offsets)
+        for (chunk_values, chunk_errors) in results:
+            values += chunk_values
+            errors += chunk_errors
+
+    return values, errors
+
+def _from_pods_chunk(
+        records: typing.List[PODType],
+        cls: typing.Type[PODDeserializerClass],
+        context: SerializationContext,
+        offset: int,
+        ) -> typing.Tuple[typing.List[typing.Union[PODDeserializerClass, None]], typing.List[DeserializationErrorRecord]]:
+    """ Deserialize a chunk of records (see from_pods()). """
+
+    plan = _get_plan(cls)
+
+    values: typing.List[typing.Union[PODDeserializerClass, None]] = []
+    errors: typing.List[DeserializationErrorRecord] = []
+
+    for (i, record) in enumerate(records):
+        values.append(_from_pod_collect_errors(offset + i, record, cls, plan, context, errors))
+
+    return values, errors
+
+def _from_pod_collect_errors(
+        index: int,
+        record: PODType,
+        cls: typing.Type[PODDeserializerClass],
+        plan: _SerializationPlan,
+        context: SerializationContext,
+        errors: typing.List[DeserializationErrorRecord],
+        ) -> typing.Union[PODDeserializerClass, None]:
+    """
+    Deserialize a single record, adding any errors to the passed in list.
+    Returns None if there were any errors.
+    """
+
+    if ((not isinstance(record, dict)) or (not plan.default_deserialization)):
+        try:
+            return cls.from_pod(record, context)
+        except Exception as ex:
+            errors.append(DeserializationErrorRecord(index, None, _format_error_chain(ex)))
+            return None
+
+    type_hints = plan.get_init_type_hints()
+
+    new_data = {}
+    has_error = False
+
+    for (key, value) in record.items():
+        if (cls.skip_field(key, value)):
+            continue
+
+        try:
+            new_data[key] = _from_pod(f"field {key}", type_hints.get(key, None), value, context, cls.serialization_error_class)
+        except Exception as ex:
+            errors.append(DeserializationErrorRecord(index, key, _format_error_chain(ex)))
+            has_error = True
+
+    if (has_error):
+        return None
+
+    if (cls.serialization_include_init_context):
+        new_data['context'] = context
+
+    try:
+        return cls(**new_data)
+    except Exception as ex:
+        errors.append(DeserializationErrorRecord(index, None, _format_error_chain(ex)))
+        return None
+
+def _format_error_chain(ex: typing.Union[BaseException, None]) -> str:
+    """ Join together the messages of an exception and all its causes. """
+
+    messages = []
+    while (ex is not None):
+        messages.append(str(ex))
+        ex = ex.__cause__
+
+    return '; '.join(messages)
+
+_SHARED_COPY_TYPES: typing.Tuple[typing.Type, ...] = (type(None), bool, int, float, complex, str, bytes, enum.Enum, type)
+""" Types (which are all immutable) that can be shared (instead of copied) in PODConverter.copy(). """
+
+def _copy_fields(value: SerializationBaseClass) -> SerializationBaseClass:
+    """ Make a new object of the same type with a copy of each field (see PODConverter.copy()). """
+
+    value_type = type(value)
+    skip_fields = _get_plan(value_type).skip_fields
+
+    new_value = value_type.__new__(value_type)
+    new_fields = vars(new_value)
+
+    for (name, field) in vars(value).items():
+        if (name in skip_fields):
+            new_fields[name] = field
+        else:
+            new_fields[name] = _copy_value(field)
+
+    return new_value
+
+def _copy_value(value: typing.Any) -> typing.Any:
+    """
+    Copy a value (see PODConverter.copy()).
+    Immutable values are shared, common containers and serialization objects are copied structurally,
+    and anything else is deep copied.
+    """
+
+    if (isinstance(value, _SHARED_COPY_TYPES)):
+        return value
+
+    value_type = type(value)
+
+    if (value_type is list):
+        return [_copy_value(item) for item in value]
+
+    if (value_type is dict):
+        return {key: _copy_value(item) for (key, item) in value.items()}
+
+    if (value_type is tuple):
+        return tuple(_copy_value(item) for item in value)
+
+    if (value_type is set):
+        return {_copy_value(item) for item in value}
+
+    if (value_type is frozenset):
+        return value
+
+    if (isinstance(value, PODConverter)):
+        return value.copy()
+
+    if (isinstance(value, SerializationBase)):
+        if (value.serialization_immutable):
+            return value
+
+        if (hasattr(value, '__dict__')):
+            return _copy_fields(value)
+
+    return copy.deepcopy(value)
+
 def _check_issubclass(allowed_type: typing.Any, target: typing.Type) -> bool:
     """
     Call issubclass(), but squash and type errors.
@@ -408,6 +773,7 @@ def generic_to_pod(
         - enum.Enum
         - (list, tuple, set)
         - dict
+        - bytes (only when `context.allow_bytes` is set)
     """
 
     if (raw_value is None):
@@ -417,6 +783,10 @@ def generic_to_pod(
     if (isinstance(raw_value, (bool, float, int, str))):
         return raw_value
 
+    # Some formats can natively handle bytes.
+    if (context.allow_bytes and isinstance(raw_value, (bytes, bytearray, memoryview))):
+        return bytes(raw_value)  # type: ignore[return-value]
+
     if (isinstance(raw_value, DictSerializer)):
         return raw_value.to_dict(context)
 
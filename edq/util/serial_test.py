@@ -1,8 +1,10 @@
 import enum
 import typing
 
+import edq.net.exchange
 import edq.testing.unittest
 import edq.util.serial
+import edq.util.time
 
 # Ideally this would be enum.StrEnum, but that was introduced in Python 3.11.
 class _TestEnumStr(enum.Enum):
@@ -113,6 +115,29 @@ class _TestDictConverter(edq.util.serial.DictConverter):
 
         return True
 
+class _TestComparable(edq.util.serial.DictConverter):
+    """ A simple class for testing equality, ordering, and hashing. """
+
+    serialization_skip_fields = {'note'}
+
+    def __init__(self,
+            name: str = '',
+            values: typing.Union[typing.List[int], None] = None,
+            note: str = '',
+            extra: typing.Any = None,
+            **kwargs: typing.Any) -> None:
+        super().__init__(**kwargs)
+
+        self.name: str = name
+        self.values: typing.Union[typing.List[int], None] = values
+        self.note: str = note
+        self.extra: typing.Any = extra
+
+class _TestImmutableComparable(_TestComparable):
+    """ A comparable class that declares itself immutable. """
+
+    serialization_immutable = True
+
 class TestSerialization(edq.testing.unittest.BaseTest):
     """ Test basic serialization. """
 
@@ -586,3 +611,224 @@ class TestSerialization(edq.testing.unittest.BaseTest):
                     continue
 
                 self.fail(f"Did not get expected error: '{error_substring}'.")
+
+    def test_comparison_base(self) -> None:
+        """
+        Test field-wise equality, ordering, and hashing.
+        """
+
+        # [(a, b, expected equal, expected a < b), ...]
+        test_cases: typing.List[typing.Tuple[typing.Any, typing.Any, bool, bool]] = [
+            (_TestComparable('a'), _TestComparable('a'), True, False),
+            (_TestComparable('a'), _TestComparable('b'), False, True),
+            (_TestComparable('b'), _TestComparable('a'), False, False),
+            (_TestComparable('a', [1, 2]), _TestComparable('a', [1, 2]), True, False),
+            (_TestComparable('a', [1, 2]), _TestComparable('a', [1, 3]), False, True),
+            (_TestComparable('a', None), _TestComparable('a', [1]), False, True),
+
+            # Skipped fields are ignored.
+            (_TestComparable('a', note = 'x'), _TestComparable('a', note = 'y'), True, False),
+
+            # Different types.
+            (_TestComparable('a'), 'a', False, False),
+            (_TestComparable('a'), _TestDictConverter(value_str = 'a'), False, True),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (a, b, expected_equal, expected_less) = test_case
+
+            with self.subTest(msg = f"Case {i}:"):
+                self.assertEqual(expected_equal, (a == b))
+                self.assertEqual(expected_equal, (b == a))
+
+                if (isinstance(b, edq.util.serial.SerializationBase)):
+                    self.assertEqual(expected_less, (a < b))
+
+                if (expected_equal):
+                    self.assertEqual(hash(a), hash(b))
+
+    def test_comparison_collections(self) -> None:
+        """
+        Test that serialization objects can be sorted and used as set elements and dict keys.
+        """
+
+        values = [
+            _TestComparable('c'),
+            _TestComparable('a', [2]),
+            _TestComparable('a', [1]),
+            _TestComparable('b', note = 'x'),
+            _TestComparable('b', note = 'y'),
+        ]
+
+        expected_order = [('a', [1]), ('a', [2]), ('b', None), ('b', None), ('c', None)]
+        actual_order = [(value.name, value.values) for value in sorted(values)]
+        self.assertEqual(expected_order, actual_order)
+
+        self.assertEqual(4, len(set(values)))
+        self.assertEqual(4, len({value: True for value in values}))
+
+        exchanges = [
+            edq.net.exchange.HTTPExchange(method = 'GET', url_path = 'a', response_body = {'b': [1]}),
+            edq.net.exchange.HTTPExchange(method = 'GET', url_path = 'a', response_body = {'b': [1]}),
+        ]
+        self.assertEqual(1, len(set(exchanges)))
+
+    def test_comparison_immutable_hash(self) -> None:
+        """
+        Test that immutable objects cache their hash.
+        """
+
+        value = _TestImmutableComparable('a', [1])
+        original_hash = hash(value)
+
+        # Modifying an immutable object (which should not be done) will not change its hash.
+        assert value.values is not None
+        value.values.append(2)
+        self.assertEqual(original_hash, hash(value))
+
+        # Mutable objects always recompute their hash.
+        mutable = _TestComparable('a', [1])
+        self.assertEqual(original_hash, hash(mutable))
+
+        assert mutable.values is not None
+        mutable.values.append(2)
+        self.assertNotEqual(original_hash, hash(mutable))
+
+        # The cached hash is not part of the object's fields.
+        self.assertNotIn('_serialization_cached_hash', value.to_dict())
+        self.assertEqual(value, value.copy())
+
+    def test_comparison_subclass(self) -> None:
+        """
+        Test that equality is symmetric between a class and its subclass.
+        """
+
+        base = _TestComparable('a', [1])
+        child = _TestImmutableComparable('a', [1])
+
+        self.assertFalse(base == child)
+        self.assertFalse(child == base)
+        self.assertTrue(base != child)
+        self.assertTrue(child != base)
+
+    def test_from_pods_base(self) -> None:
+        """
+        Test bulk deserialization and error collection.
+        """
+
+        records: typing.List[typing.Any] = [
+            {'value_str': 'abc'},
+            {'enum_str': 'ZZZ', 'list_int': ['1', 'ZZZ']},
+            {'nested': {'enum_int': 2}},
+            {'value_int': 1, 'unknown': 'abc'},
+            {'dict_int': {'1': '2'}},
+        ]
+
+        expected_values = [
+            _TestDictConverter(value_str = 'abc'),
+            None,
+            _TestDictConverter(nested = _TestDictConverter(enum_int = _TestEnumInt.SECOND)),
+            None,
+            _TestDictConverter(dict_int = {1: 2}),
+        ]
+
+        # [(index, field, message substring), ...]
+        expected_errors = [
+            (1, 'enum_str', "Failed to deserialize field enum_str.; 'ZZZ' is not a valid _TestEnumStr"),
+            (1, 'list_int', 'Failed to deserialize field list_int.; Failed to deserialize field list_int[1].'),
+            (3, None, 'takes exactly one argument'),
+        ]
+
+        # [(num processes, chunk size), ...]
+        test_cases = [
+            (1, edq.util.serial.DEFAULT_BULK_CHUNK_SIZE),
+            (2, 2),
+        ]
+
+        for (i, test_case) in enumerate(test_cases):
+            (num_processes, chunk_size) = test_case
+
+            with self.subTest(msg = f"Case {i} ({num_processes} processes, chunk size {chunk_size}):"):
+                values, errors = edq.util.serial.from_pods(records, _TestDictConverter,
+                        num_processes = num_processes, chunk_size = chunk_size)
+
+                self.assertEqual(expected_values, values)
+
+                self.assertEqual(len(expected_errors), len(errors))
+                for (expected_error, error) in zip(expected_errors, errors):
+                    (expected_index, expected_field, expected_message) = expected_error
+
+                    self.assertEqual(expected_index, error.index)
+                    self.assertEqual(expected_field, error.field)
+                    self.assertIn(expected_message, error.message)
+
+    def test_from_pods_custom_deserialization(self) -> None:
+        """
+        Test bulk deserialization for classes that override the default deserialization.
+        """
+
+        records: typing.List[edq.util.serial.PODType] = [
+            {'method': 'GET', 'url_path': 'a'},
+            {'method': 'ZZZ', 'url_path': 'a'},
+        ]
+
+        values, errors = edq.util.serial.from_pods(records, edq.net.exchange.HTTPExchange)
+
+        self.assertEqual(edq.net.exchange.HTTPExchange(method = 'GET', url_path = 'a'), values[0])
+        self.assertIsNone(values[1])
+
+        self.assertEqual(1, len(errors))
+        self.assertEqual(1, errors[0].index)
+        self.assertIsNone(errors[0].field)
+        self.assertIn("Got unknown/disallowed method: 'ZZZ'.", errors[0].message)
+
+    def test_copy_base(self) -> None:
+        """
+        Test that copies are equal, but do not share mutable state.
+        """
+
+        timestamp = edq.util.time.Timestamp(123)
+
+        value = _TestComparable('a', [1, 2], note = 'x',
+                extra = {'timestamp': timestamp, 'nested': [_TestComparable('b', [3])]})
+
+        new_value = value.copy()
+
+        self.assertIsNot(value, new_value)
+        self.assertIs(type(value), type(new_value))
+        self.assertEqual(value, new_value)
+        self.assertEqual(vars(value), vars(new_value))
+
+        # Mutable containers are copied.
+        self.assertIsNot(value.values, new_value.values)
+        self.assertIsNot(value.extra['nested'][0], new_value.extra['nested'][0])
+
+        # Immutable values are shared.
+        self.assertIs(timestamp, new_value.extra['timestamp'])
+        self.assertIs(timestamp, timestamp.copy())
+        self.assertIs(value.note, new_value.note)
+
+        assert new_value.values is not None
+        new_value.values.append(3)
+        self.assertEqual([1, 2], value.values)
+
+    def test_copy_exchange(self) -> None:
+        """
+        Test copying an exchange.
+        """
+
+        exchange = edq.net.exchange.HTTPExchange(
+            method = 'POST',
+            url_path = 'a',
+            parameters = {'b': ['c']},
+            files = [edq.net.exchange.FileInfo(name = 'd.txt', content = 'e')],
+            response_body = {'f': [1, 2]},
+        )
+
+        new_exchange = exchange.copy()
+
+        self.assertEqual(exchange, new_exchange)
+        self.assertEqual(exchange.to_dict(), new_exchange.to_dict())
+
+        self.assertIsNot(exchange.files[0], new_exchange.files[0])
+        self.assertIsNot(exchange.parameters, new_exchange.parameters)
@@ -65,6 +65,8 @@ class Timestamp(int, edq.util.serial.PODConverter):  # type: ignore[misc]
     so they respond to all normal int functionality.
     """
 
+    serialization_immutable = True
+
     def sub(self, other: 'Timestamp') -> Duration:
         """ Return a new duration that is the difference of this and the given duration. """
 